@@ -4,3 +4,5 @@ from .file_format import FileFormat
 from .parser import Parser
 from .field import Field
 from .data import Data
+from .prefetch import PrefetchReader
+from .cache import ParseCache
@@ -0,0 +1,65 @@
+"""
+Streaming aggregates of field values.
+"""
+from __future__ import annotations
+from typing import Union, Any
+from dataclasses import dataclass
+
+
+@dataclass
+class Summary():
+    """
+    Running aggregates of the values of a field.
+
+    Properties:
+    + **count:** Number of values.
+    + **sum:** Sum of the values.
+    + **min:** Minimum value, or `None` if there are no values.
+    + **max:** Maximum value, or `None` if there are no values.
+    """
+    count: int = 0
+    sum: Any = 0
+    min: Any = None
+    max: Any = None
+
+    def add(self, value: Any):
+        """
+        Add a value to the aggregates.
+
+        :param value: Value to add.
+        """
+        self.count += 1
+        self.sum += value
+        if (self.min is None) or (value < self.min):
+            self.min = value
+
+        if (self.max is None) or (value > self.max):
+            self.max = value
+
+    def merge(self, other: Summary):
+        """
+        Add the aggregates of other values to these.
+
+        :param other: Aggregates to add.
+        """
+        if other.count == 0:
+            return
+
+        self.count += other.count
+        self.sum += other.sum
+        if (self.min is None) or (other.min < self.min):
+            self.min = other.min
+
+        if (self.max is None) or (other.max > self.max):
+            self.max = other.max
+
+    @property
+    def mean(self) -> Union[float, None]:
+        """
+        :returns float | None: Mean of the values,
+            or `None` if there are no values.
+        """
+        if self.count == 0:
+            return None
+
+        return self.sum / self.count
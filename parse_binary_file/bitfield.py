@@ -0,0 +1,94 @@
+"""
+Bit fields packed into integer fields.
+"""
+from __future__ import annotations
+from typing import Any, Dict, Sequence
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class BitField():
+    """
+    Describes a value packed into the bits of an integer field.
+    Masks and shifts are computed when created.
+
+    Properties:
+    + **name:** Name of the bit field.
+    + **offset:** Offset of the least significant bit,
+        counting from the least significant bit of the integer.
+    + **width:** Number of bits. [Default: 1]
+    + **signed:** If the bits are a two's complement signed integer.
+        [Default: False]
+    """
+    name: str
+    offset: int
+    width: int = 1
+    signed: bool = False
+    _mask: int = field(init=False, repr=False, compare=False)
+    _sign: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.offset < 0:
+            raise ValueError(f'Bit field offset must not be negative. {self}')
+
+        if self.width < 1:
+            raise ValueError(f'Bit field width must be positive. {self}')
+
+        object.__setattr__(self, '_mask', (1 << self.width) - 1)
+        object.__setattr__(self, '_sign', (1 << (self.width - 1)) if self.signed else 0)
+
+    @property
+    def mask(self) -> int:
+        """
+        :returns int: Mask of the bits, after shifting by `offset`.
+        """
+        return self._mask
+
+    def extract(self, value: int) -> int:
+        """
+        :param value: Value of the integer field.
+        :returns int: Value of the bit field.
+        """
+        bits = (value >> self.offset) & self._mask
+        if self._sign:
+            return (bits ^ self._sign) - self._sign
+
+        return bits
+
+    def insert(self, value: int, bits: int) -> int:
+        """
+        :param value: Value of the integer field, as an unsigned integer.
+        :param bits: New value of the bit field.
+        :returns int: Value of the integer field with the bit field replaced.
+        :raises ValueError: If the new value does not fit in the bit field.
+        """
+        if not (-self._sign <= bits <= self._mask - self._sign):
+            raise ValueError(f'Value {bits} does not fit in {self}')
+
+        return (value & ~(self._mask << self.offset)) | ((bits & self._mask) << self.offset)
+
+    def extract_array(self, values: Any) -> Any:
+        """
+        Extract the bit field from each value of a NumPy array in bulk.
+
+        :param values: NumPy array of values of the integer field.
+        :returns numpy.ndarray: Values of the bit field.
+        """
+        import numpy as np
+
+        # unsigned to shift in zeros, wide enough for sign extension
+        bits = (values.astype(np.uint64, copy=False) >> np.uint64(self.offset)) & np.uint64(self._mask)
+        if self._sign:
+            bits = bits.astype(np.int64)
+            return (bits ^ self._sign) - self._sign
+
+        return bits
+
+
+def extract_bits(bits: Sequence[BitField], value: int) -> Dict[str, int]:
+    """
+    :param bits: Bit fields of an integer field.
+    :param value: Value of the integer field.
+    :returns dict[str, int]: Dictionary of {bit field name: value}.
+    """
+    return {b.name: b.extract(value) for b in bits}
@@ -0,0 +1,202 @@
+"""
+On-disk cache of parsed files.
+"""
+from __future__ import annotations
+import os
+import mmap
+import pickle
+import hashlib
+import tempfile
+from enum import Enum
+from typing import Union, Tuple, Any
+
+from ._version import __version__
+from .file_format import FileFormat
+from .field import Field
+from .data import Data
+
+
+CACHE_SUFFIX = '.pbfcache'
+HASH_CHUNK_SIZE = 2**20
+
+
+class CacheKey(Enum):
+    """
+    How files are identified in the cache.
+    """
+    CONTENT = 'content'  # hash of the file's content
+    STAT = 'stat'  # path, size, and modification time
+
+
+def _compact(data: Data) -> Tuple[Tuple[Any, Any, Any], ...]:
+    """
+    :returns tuple: Compact representation of data as
+        (value, original data, subfields) for each field.
+    """
+    return tuple((f.value, f.data, f.fields) for f in data.fields)
+
+
+def _expand(compact: Tuple[Tuple[Any, Any, Any], ...], format: FileFormat) -> Data:
+    """
+    :returns Data: Data from its compact representation.
+    """
+    fields = []
+    for fd, (value, raw, children) in zip(format.fields, compact):
+        f = Field(fd, children, None, raw)
+        f.value = value
+        fields.append(f)
+
+    return Data(tuple(fields))
+
+
+class ParseCache():
+    """
+    Size bounded cache of parsed files, stored on disk.
+    Entries are keyed on the file, the format's fingerprint,
+    and the library version.
+    The least recently used entries are evicted when the cache
+    exceeds its maximum size.
+
+    :param directory: Directory to store the cache in.
+        Created if it does not exist.
+    :param max_size: Maximum size of the cache in bytes. [Default: 1 GiB]
+    :param key: How files are identified. Values are from `CacheKey`.
+        [Default: 'content']
+    """
+    def __init__(
+        self,
+        directory: Union[str, os.PathLike],
+        max_size: int = 1 << 30,
+        key: Union[CacheKey, str] = CacheKey.CONTENT
+    ):
+        self.directory = os.fspath(directory)
+        self.max_size = max_size
+        self.key = CacheKey(key)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _file_key(self, path: Union[str, os.PathLike]) -> str:
+        """
+        :returns str: Key identifying the file.
+        """
+        if self.key is CacheKey.STAT:
+            stat = os.stat(path)
+            return f'{os.path.realpath(path)}:{stat.st_size}:{stat.st_mtime_ns}'
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def _entry_path(
+        self,
+        path: Union[str, os.PathLike],
+        format: FileFormat,
+        tag: str = ''
+    ) -> str:
+        """
+        :returns str: Path of the cache entry.
+        """
+        key = f'{self._file_key(path)}:{format.fingerprint()}:{tag}:{__version__}'
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{name}{CACHE_SUFFIX}')
+
+    def get(
+        self,
+        path: Union[str, os.PathLike],
+        format: FileFormat,
+        tag: str = ''
+    ) -> Union[Data, None]:
+        """
+        Get the cached data of a file.
+
+        :param path: Path to the parsed file.
+        :param format: Format the file was parsed with.
+        :param tag: Additional key for parsing options that change the data.
+        :returns Data | None: Cached data, or `None` if not cached.
+        """
+        entry = self._entry_path(path, format, tag)
+        try:
+            with open(entry, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    compact = pickle.loads(buffer)
+
+        except (FileNotFoundError, ValueError, pickle.UnpicklingError, EOFError):
+            # missing, empty, or corrupt entry
+            return None
+
+        # mark as recently used
+        try:
+            os.utime(entry)
+
+        except FileNotFoundError:
+            pass
+
+        return _expand(compact, format)
+
+    def put(
+        self,
+        path: Union[str, os.PathLike],
+        format: FileFormat,
+        data: Data,
+        tag: str = ''
+    ):
+        """
+        Cache the data of a file, evicting old entries if needed.
+
+        :param path: Path to the parsed file.
+        :param format: Format the file was parsed with.
+        :param data: Parsed data.
+        :param tag: Additional key for parsing options that change the data.
+        """
+        entry = self._entry_path(path, format, tag)
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(_compact(data), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(tmp, entry)
+
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+        self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache
+        does not exceed its maximum size.
+        """
+        entries = []
+        for e in os.scandir(self.directory):
+            if e.name.endswith(CACHE_SUFFIX):
+                try:
+                    stat = e.stat()
+
+                except FileNotFoundError:
+                    continue
+
+                entries.append((stat.st_mtime_ns, stat.st_size, e.path))
+
+        size = sum(e[1] for e in entries)
+        for _, e_size, e_path in sorted(entries):
+            if size <= self.max_size:
+                break
+
+            try:
+                os.unlink(e_path)
+
+            except FileNotFoundError:
+                pass
+
+            size -= e_size
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        for e in os.scandir(self.directory):
+            if e.name.endswith(CACHE_SUFFIX):
+                os.unlink(e.path)
@@ -0,0 +1,68 @@
+"""
+Checksums verified while parsing.
+"""
+from __future__ import annotations
+import zlib
+from typing import Union, Tuple, Dict, Callable, Any
+from dataclasses import dataclass
+
+
+# algorithm: (function, initial value)
+CHECKSUM_ALGORITHMS: Dict[str, Tuple[Callable[[Any, int], int], int]] = {
+    'crc32': (zlib.crc32, 0),
+    'adler32': (zlib.adler32, 1),
+}
+
+
+@dataclass(frozen=True)
+class Checksum():
+    """
+    Describes the checksum a field contains.
+
+    Properties:
+    + **algorithm:** Checksum algorithm.
+        Valid values: ['crc32', 'adler32']
+    + **start:** Name or index of the first field covered.
+        [Default: First field]
+    + **end:** Name or index of the last field covered.
+        [Default: Field preceding the checksum]
+    """
+    algorithm: str
+    start: Union[str, int, None] = None
+    end: Union[str, int, None] = None
+
+    def __post_init__(self):
+        if self.algorithm not in CHECKSUM_ALGORITHMS:
+            raise ValueError(f'Unknown checksum algorithm `{self.algorithm}`')
+
+    @property
+    def function(self) -> Callable[[Any, int], int]:
+        """
+        :returns Callable: Function with signature `(data, value)`
+            that updates a running checksum.
+        """
+        return CHECKSUM_ALGORITHMS[self.algorithm][0]
+
+    @property
+    def initial(self) -> int:
+        """
+        :returns int: Initial value of the running checksum.
+        """
+        return CHECKSUM_ALGORITHMS[self.algorithm][1]
+
+
+@dataclass(frozen=True)
+class ResolvedChecksum():
+    """
+    Checksum with its covered fields resolved to indices in a `FileFormat`.
+
+    Properties:
+    + **index:** Index of the checksum field.
+    + **start:** Index of the first field covered.
+    + **end:** Index of the last field covered.
+    + **checksum:** Description of the checksum.
+    """
+    index: int
+    start: int
+    end: int
+    checksum: Checksum
@@ -0,0 +1,400 @@
+"""
+Split record files into chunks to be parsed in parallel.
+"""
+from __future__ import annotations
+import os
+import mmap
+import struct
+import multiprocessing
+from multiprocessing import resource_tracker
+from typing import Union, Tuple, List, Dict, Sequence, Callable, Iterator, Any, TYPE_CHECKING
+from dataclasses import dataclass
+
+from .metrics import ParseMetrics
+from .columns import ColumnsDescriptor, Columns, export_columns
+
+if TYPE_CHECKING:
+    from .parser import Parser, ErrorPolicy
+    from .data import Data
+    from .file_format import FileFormat
+
+
+INDEX_FORMAT = struct.Struct('<Q')  # format of offsets in index files
+
+Chunk = Tuple[int, int]
+
+# state of worker processes
+_worker_parser: Union[Parser, None] = None
+_worker_buffer: Union[mmap.mmap, None] = None
+_worker_options: dict = {}
+
+
+def read_index(path: Union[str, os.PathLike]) -> Tuple[int, ...]:
+    """
+    Read a sidecar index file.
+    Index files contain the offset of each record
+    as a little endian unsigned long long.
+
+    :param path: Path to the index file.
+    :returns tuple[int, ...]: Offsets of the records.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if len(data) % INDEX_FORMAT.size:
+        raise ValueError('Invalid index file size')
+
+    return tuple(o for o, in INDEX_FORMAT.iter_unpack(data))
+
+
+def write_index(path: Union[str, os.PathLike], offsets: Sequence[int]):
+    """
+    Write a sidecar index file.
+
+    :param path: Path to the index file.
+    :param offsets: Offsets of the records.
+    """
+    with open(path, 'wb') as f:
+        f.write(b''.join(INDEX_FORMAT.pack(o) for o in offsets))
+
+
+def _split(items: Sequence[int], chunks: int) -> List[Sequence[int]]:
+    """
+    Split items into at most `chunks` groups of nearly equal length.
+    """
+    n = len(items)
+    chunks = max(1, min(chunks, n))
+    bounds = [(n * i) // chunks for i in range(chunks + 1)]
+    return [items[bounds[i]:bounds[i + 1]] for i in range(chunks)]
+
+
+def chunk_boundaries(
+    buffer: Union[bytes, mmap.mmap],
+    chunks: int,
+    record_size: Union[int, None] = None,
+    sync: Union[bytes, None] = None,
+    index: Union[Sequence[int], None] = None,
+    start: int = 0,
+    end: Union[int, None] = None
+) -> List[Chunk]:
+    """
+    Split a buffer into chunks that begin and end on record boundaries.
+    Boundaries are resolved using, in order of precedence,
+    `index`, `record_size`, or `sync`.
+
+    :param buffer: Buffer to split.
+    :param chunks: Maximum number of chunks.
+    :param record_size: Size of each record in bytes.
+    :param sync: Marker that each record begins with.
+    :param index: Offsets of each record.
+    :param start: Offset of the first record. [Default: 0]
+    :param end: Offset to stop at. [Default: End of buffer]
+    :returns list[tuple[int, int]]: List of (start, end) offsets.
+    :raises ValueError: If no method to resolve boundaries is provided.
+    """
+    if end is None:
+        end = len(buffer)
+
+    if end <= start:
+        return []
+
+    if index is not None:
+        offsets = sorted(o for o in index if start <= o < end)
+        if len(offsets) == 0:
+            return []
+
+        groups = _split(offsets, chunks)
+        cuts = [g[0] for g in groups]
+
+    elif record_size is not None:
+        if record_size <= 0:
+            raise ValueError('`record_size` must be positive')
+
+        n_records = (end - start) // record_size
+        groups = _split(range(n_records), chunks)
+        cuts = [start + g[0] * record_size for g in groups]
+        if len(cuts) == 0:
+            cuts = [start]
+
+    elif sync is not None:
+        step = (end - start) // max(1, chunks)
+        cuts = [start]
+        for i in range(1, chunks):
+            cut = buffer.find(sync, max(start + i * step, cuts[-1] + 1), end)
+            if cut < 0:
+                break
+
+            if cut > cuts[-1]:
+                cuts.append(cut)
+
+    else:
+        raise ValueError(
+            'Can not determine record boundaries. Provide one of `index`, `record_size`, or `sync`.'
+        )
+
+    cuts.append(end)
+    return [(cuts[i], cuts[i + 1]) for i in range(len(cuts) - 1)]
+
+
+def _init_worker(
+    parser: Parser,
+    path: Union[str, os.PathLike],
+    options: dict
+):
+    """
+    Open the shared memory map of the file in a worker process.
+    """
+    global _worker_parser, _worker_buffer, _worker_options
+
+    _worker_parser = parser
+    _worker_options = options
+    with open(path, 'rb') as f:
+        _worker_buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+@dataclass(frozen=True)
+class _PackedRecord():
+    """
+    Picklable form of a record, as generated record classes can not be pickled.
+
+    Properties:
+    + **layout:** Index of the record's format in `_layouts`.
+    + **values:** Packed values of the record.
+    """
+    layout: int
+    values: Tuple[Any, ...]
+
+
+def _layouts(format: FileFormat) -> List[FileFormat]:
+    """
+    :param format: Format of the records.
+    :returns list[FileFormat]: The format, followed by the layouts
+        of its switch fields, recursively, in a stable order.
+    """
+    layouts = [format]
+    for f in format.fields:
+        if f.switch is not None:
+            for case in [*f.switch.cases.values(), f.switch.default]:
+                if case is not None:
+                    layouts.extend(_layouts(case))
+
+    return layouts
+
+
+def _pack(value: Any, types: Dict[type, int]) -> Any:
+    """
+    :param value: Record, or value of a field.
+    :param types: Dictionary of {record class: index of its format in `_layouts`}.
+    :returns Any: Value with records, including nested ones, packed.
+    """
+    layout = types.get(type(value))
+    if layout is not None:
+        return _PackedRecord(layout, tuple(_pack(v, types) for v in value))
+
+    if type(value) is tuple:
+        # values of fields sharing a name
+        return tuple(_pack(v, types) for v in value)
+
+    return value
+
+
+def _unpack(value: Any, layouts: List[FileFormat]) -> Any:
+    """
+    :param value: Packed value. See `_pack`.
+    :param layouts: Formats of the records. See `_layouts`.
+    :returns Any: Value with records rebuilt.
+    """
+    if isinstance(value, _PackedRecord):
+        make = layouts[value.layout].record_type._make
+        return make(_unpack(v, layouts) for v in value.values)
+
+    if type(value) is tuple:
+        return tuple(_unpack(v, layouts) for v in value)
+
+    return value
+
+
+def _parse_chunk(chunk: Chunk) -> Tuple[List[Data], ParseMetrics]:
+    """
+    Parse the records of a chunk in a worker process.
+    """
+    start, end = chunk
+    metrics = ParseMetrics()
+    records = _worker_parser._iter_buffer(
+        _worker_buffer,
+        start,
+        end,
+        metrics=metrics,
+        **_worker_options
+    )
+
+    if _worker_options.get('as_records'):
+        # generated record classes can not be pickled
+        types = {f.record_type: i for i, f in enumerate(_layouts(_worker_parser.format))}
+        return ([_pack(r, types) for r in records], metrics)
+
+    return (list(records), metrics)
+
+
+def _export_chunk(chunk: Chunk) -> Tuple[ColumnsDescriptor, ParseMetrics]:
+    """
+    Parse the records of a chunk in a worker process,
+    and write their columns to shared memory.
+    """
+    records, metrics = _parse_chunk(chunk)
+    return (export_columns(records, _worker_parser.format), metrics)
+
+
+def _map_chunks(
+    worker: Callable[[Chunk], Tuple[Any, ParseMetrics]],
+    parser: Parser,
+    path: Union[str, os.PathLike],
+    processes: int,
+    record_size: Union[int, None] = None,
+    sync: Union[bytes, None] = None,
+    index: Union[str, os.PathLike, Sequence[int], None] = None,
+    errors: Union[ErrorPolicy, str] = 'raise',
+    metrics: Union[ParseMetrics, None] = None,
+    as_records: bool = False
+) -> Iterator[Any]:
+    """
+    Split a file into chunks and run a worker function on each,
+    in worker processes.
+
+    :returns Iterator: Results of the worker function, in order.
+    """
+    from .parser import ErrorPolicy
+
+    errors = ErrorPolicy(errors)
+    options = {'errors': errors, 'sync': sync}
+    if as_records:
+        options['as_records'] = True
+
+    if errors is ErrorPolicy.RESYNC:
+        options['sync'] = parser._sync_marker(sync)
+
+    if isinstance(index, (str, os.PathLike)):
+        index = read_index(index)
+
+    if (index is None) and (record_size is None) and (sync is None):
+        record_size = parser.format.size
+
+    if os.path.getsize(path) == 0:
+        return
+
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            # oversplit to balance load between workers
+            chunks = chunk_boundaries(
+                buffer,
+                processes * 4,
+                record_size=record_size,
+                sync=sync,
+                index=index
+            )
+
+    ctx = multiprocessing.get_context()
+    with ctx.Pool(
+        processes,
+        initializer=_init_worker,
+        initargs=(parser, path, options)
+    ) as pool:
+        for result, chunk_metrics in pool.imap(worker, chunks):
+            if metrics is not None:
+                metrics.merge(chunk_metrics)
+
+            yield result
+
+
+def parse_file_chunks(
+    parser: Parser,
+    path: Union[str, os.PathLike],
+    processes: int,
+    record_size: Union[int, None] = None,
+    sync: Union[bytes, None] = None,
+    index: Union[str, os.PathLike, Sequence[int], None] = None,
+    errors: Union[ErrorPolicy, str] = 'raise',
+    metrics: Union[ParseMetrics, None] = None,
+    as_records: bool = False
+) -> List[Data]:
+    """
+    Parse the records of a file in parallel.
+    If none of `index`, `record_size`, or `sync` are provided
+    the static size of the parser's format is used as the record size.
+
+    :param parser: Parser to use.
+    :param path: Path to the file.
+    :param processes: Number of worker processes.
+    :param record_size: Size of each record in bytes.
+    :param sync: Marker that each record begins with.
+    :param index: Offsets of records, or path to a sidecar index file.
+    :param errors: How to handle invalid records. See `Parser.iter_records`.
+    :param metrics: Metrics to update.
+    :param as_records: Return records of the format's `record_type`.
+        [Default: False]
+    :returns list[Data]: Records in order.
+    """
+    records = []
+    for chunk_records in _map_chunks(
+        _parse_chunk,
+        parser,
+        path,
+        processes,
+        record_size=record_size,
+        sync=sync,
+        index=index,
+        errors=errors,
+        metrics=metrics,
+        as_records=as_records
+    ):
+        records.extend(chunk_records)
+
+    if as_records:
+        layouts = _layouts(parser.format)
+        return [_unpack(r, layouts) for r in records]
+
+    return records
+
+
+def export_file_chunks(
+    parser: Parser,
+    path: Union[str, os.PathLike],
+    processes: int,
+    record_size: Union[int, None] = None,
+    sync: Union[bytes, None] = None,
+    index: Union[str, os.PathLike, Sequence[int], None] = None,
+    errors: Union[ErrorPolicy, str] = 'raise',
+    metrics: Union[ParseMetrics, None] = None
+) -> Columns:
+    """
+    Parse the records of a file in parallel into columns.
+    Workers return numeric columns through shared memory
+    instead of pickling records.
+    See `parse_file_chunks` for parameters.
+
+    :returns Columns: Columns of the records.
+    """
+    # workers must share the resource tracker of this process, otherwise
+    # their shared memory is unlinked when they exit
+    resource_tracker.ensure_running()
+    descriptors = []
+    try:
+        for desc in _map_chunks(
+            _export_chunk,
+            parser,
+            path,
+            processes,
+            record_size=record_size,
+            sync=sync,
+            index=index,
+            errors=errors,
+            metrics=metrics
+        ):
+            descriptors.append(desc)
+
+    except BaseException:
+        # free shared memory of completed chunks
+        Columns.from_descriptors(descriptors, parser.format).close()
+        raise
+
+    return Columns.from_descriptors(descriptors, parser.format)
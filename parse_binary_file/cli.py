@@ -0,0 +1,401 @@
+"""
+Command line interface for parsing many files.
+
+Only the standard library is imported at start up,
+optional dependencies are imported when used.
+"""
+from __future__ import annotations
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from typing import Union, Tuple, List, Dict, Iterator, Sequence, Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .file_format import FileFormat
+    from .parser import Parser
+
+
+# values of a record, {field name: value}
+Row = Dict[str, Any]
+
+# state of worker processes
+_worker_parser: Union[Parser, None] = None
+_worker_options: dict = {}
+
+
+def load_description(path: Union[str, os.PathLike]) -> FileFormat:
+    """
+    Load a file format from a description file.
+    JSON files are loaded with the standard library,
+    other files are loaded as YAML, requiring `pyyaml`.
+
+    :param path: Path to the description file.
+    :returns FileFormat: File format described.
+    :raises ValueError: If the description is invalid.
+    """
+    from .file_format import FileFormat
+
+    with open(path, 'r') as f:
+        if str(path).lower().endswith('.json'):
+            desc = json.load(f)
+
+        else:
+            try:
+                import yaml
+
+            except ImportError as err:
+                raise ValueError(
+                    'Loading YAML descriptions requires `pyyaml`. Use a `.json` description, or install `pyyaml`.'
+                ) from err
+
+            desc = yaml.safe_load(f)
+
+    if isinstance(desc, list):
+        return FileFormat.from_dicts(desc)
+
+    if isinstance(desc, dict) and ('fields' in desc):
+        return FileFormat.from_dicts(
+            desc['fields'],
+            info=desc.get('info'),
+            defaults=desc.get('default_options')
+        )
+
+    raise ValueError('Description must be a list of fields or contain `fields`')
+
+
+def expand_paths(patterns: Sequence[str]) -> List[str]:
+    """
+    Expand globs and directories into file paths.
+    Directories are searched recursively.
+
+    :param patterns: Paths, globs, or directories.
+    :returns list[str]: Sorted paths of files, without duplicates.
+    :raises FileNotFoundError: If a pattern matches nothing.
+    """
+    paths = []
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True)
+        if len(matches) == 0:
+            raise FileNotFoundError(f'No files match `{pattern}`')
+
+        for match in matches:
+            if os.path.isdir(match):
+                for root, _, files in os.walk(match):
+                    paths.extend(os.path.join(root, f) for f in files)
+
+            else:
+                paths.append(match)
+
+    return sorted(set(paths))
+
+
+def project(values: Dict[str, Any], fields: Union[Sequence[str], None]) -> Row:
+    """
+    :param values: Dictionary of {field name: value}.
+    :param fields: Names of fields to keep, or `None` to keep all.
+    :returns dict[str, Any]: Projected values.
+    """
+    if fields is None:
+        return dict(values)
+
+    return {name: values[name] for name in fields}
+
+
+def _init_worker(parser: Parser, options: dict):
+    """
+    Set the parser of a worker process.
+    """
+    global _worker_parser, _worker_options
+
+    _worker_parser = parser
+    _worker_options = options
+
+
+def _parse_path(path: str) -> Tuple[str, int, List[Row], Union[str, None]]:
+    """
+    Parse a file.
+
+    :param path: Path to the file.
+    :returns tuple[str, int, list[dict[str, Any]], str | None]: Tuple of
+        (path, size in bytes, rows, error message).
+    """
+    fields = _worker_options['fields']
+    try:
+        size = os.path.getsize(path)
+        if _worker_options['records']:
+            records = _worker_parser.iter_records(path, errors=_worker_options['errors'])
+            rows = [project(r.named_field_values, fields) for r in records]
+
+        else:
+            data = _worker_parser.parse_file(path)
+            rows = [project(data.named_field_values, fields)]
+
+    except Exception as err:
+        return (path, 0, [], f'{type(err).__name__}: {err}')
+
+    return (path, size, rows, None)
+
+
+def parse_paths(
+    parser: Parser,
+    paths: Sequence[str],
+    processes: int = 1,
+    fields: Union[Sequence[str], None] = None,
+    records: bool = False,
+    errors: str = 'raise'
+) -> Iterator[Tuple[str, int, List[Row], Union[str, None]]]:
+    """
+    Parse files, in worker processes if `processes` is greater than 1.
+
+    :param parser: Parser to use.
+    :param paths: Paths of the files.
+    :param processes: Number of worker processes. [Default: 1]
+    :param fields: Names of fields to output. [Default: All named fields]
+    :param records: Parse each file as consecutive records. [Default: False]
+    :param errors: How to handle invalid records. See `Parser.iter_records`.
+    :returns Iterator[tuple[str, int, list[dict[str, Any]], str | None]]:
+        Iterator of (path, size in bytes, rows, error message), in order.
+    """
+    options = {'fields': fields, 'records': records, 'errors': errors}
+    if processes <= 1:
+        _init_worker(parser, options)
+        yield from map(_parse_path, paths)
+        return
+
+    import multiprocessing
+
+    # batch small files to reduce communication overhead
+    chunksize = max(1, min(64, len(paths) // (processes * 4)))
+    ctx = multiprocessing.get_context()
+    with ctx.Pool(
+        processes,
+        initializer=_init_worker,
+        initargs=(parser, options)
+    ) as pool:
+        yield from pool.imap(_parse_path, paths, chunksize=chunksize)
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Convert values JSON does not support.
+    `Data`, such as the layout of a switch field, is converted to its
+    named field values, which are converted in turn.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+
+    from .data import Data
+
+    if isinstance(value, Data):
+        return value.named_field_values
+
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+class JsonLinesWriter():
+    """
+    Writes each row as a line of JSON.
+
+    :param stream: Text stream to write to.
+    """
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, row: Row):
+        self.stream.write(json.dumps(row, default=_json_default))
+        self.stream.write('\n')
+
+    def close(self):
+        self.stream.flush()
+
+
+class NpzWriter():
+    """
+    Collects rows into columns, saved as a NumPy `.npz` archive when closed.
+    Requires `numpy`.
+
+    :param path: Path of the archive.
+    """
+    def __init__(self, path: Union[str, os.PathLike]):
+        import numpy  # fail before parsing if not installed
+
+        self.path = path
+        self.columns: Dict[str, list] = {}
+        self.rows = 0
+
+    def write(self, row: Row):
+        for name, value in row.items():
+            if name not in self.columns:
+                self.columns[name] = [None] * self.rows
+
+            self.columns[name].append(value)
+
+        self.rows += 1
+        for values in self.columns.values():
+            if len(values) < self.rows:
+                values.append(None)
+
+    def close(self):
+        import zipfile
+        import numpy as np
+
+        # written as by `numpy.savez`, which reserves the column name `file`
+        with zipfile.ZipFile(self.path, 'w') as archive:
+            for name, values in self.columns.items():
+                with archive.open(f'{name}.npy', 'w', force_zip64=True) as f:
+                    np.lib.format.write_array(f, np.asarray(values))
+
+
+def arg_parser() -> argparse.ArgumentParser:
+    """
+    :returns argparse.ArgumentParser: Parser of the command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog='parse-binary-file',
+        description='Parse binary files using a description of their format.'
+    )
+
+    parser.add_argument('description', help='Description file of the format, JSON or YAML.')
+    parser.add_argument('paths', nargs='+', help='Files, globs, or directories to parse.')
+    parser.add_argument(
+        '-p', '--processes',
+        type=int,
+        default=1,
+        help='Number of worker processes. [Default: 1]'
+    )
+    parser.add_argument(
+        '-f', '--format',
+        choices=['jsonl', 'npz'],
+        default='jsonl',
+        help='Output format. [Default: jsonl]'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help='Output file. [Default: Standard output, for jsonl]'
+    )
+    parser.add_argument(
+        '--fields',
+        help='Comma separated names of fields to output. [Default: All named fields]'
+    )
+    parser.add_argument(
+        '--records',
+        action='store_true',
+        help='Parse each file as consecutive records.'
+    )
+    parser.add_argument(
+        '--errors',
+        choices=['raise', 'skip', 'resync'],
+        default='raise',
+        help='How to handle invalid records, with --records. [Default: raise]'
+    )
+    parser.add_argument(
+        '-q', '--quiet',
+        action='store_true',
+        help='Do not print statistics.'
+    )
+
+    return parser
+
+
+def main(argv: Union[Sequence[str], None] = None) -> int:
+    """
+    Run the command line interface.
+
+    :param argv: Command line arguments. [Default: `sys.argv`]
+    :returns int: Exit status.
+        0 on success, 1 if any file failed to parse, 2 on invalid arguments.
+    """
+    args = arg_parser().parse_args(argv)
+    if (args.format == 'npz') and (args.output is None):
+        print('npz output requires --output', file=sys.stderr)
+        return 2
+
+    try:
+        file_format = load_description(args.description)
+        paths = expand_paths(args.paths)
+
+    except (OSError, ValueError) as err:
+        print(err, file=sys.stderr)
+        return 2
+
+    fields = None
+    names = [fd.name for fd in file_format.fields if fd.name is not None]
+    if args.fields is not None:
+        fields = [name.strip() for name in args.fields.split(',')]
+        unknown = [name for name in fields if name not in names]
+        if unknown:
+            print(f'Unknown fields: {", ".join(unknown)}', file=sys.stderr)
+            return 2
+
+    # output columns added to each row
+    reserved = ('file', 'record') if args.records else ('file',)
+    colliding = [name for name in (names if fields is None else fields) if name in reserved]
+    if colliding:
+        print(f'Fields conflict with output columns: {", ".join(colliding)}', file=sys.stderr)
+        return 2
+
+    from .parser import Parser
+
+    # raw bytes are not output
+    parser = Parser(file_format, retain_raw='never')
+    if args.format == 'npz':
+        try:
+            writer = NpzWriter(args.output)
+
+        except ImportError:
+            print('npz output requires `numpy`', file=sys.stderr)
+            return 2
+
+        out = None
+
+    else:
+        out = sys.stdout if (args.output is None) else open(args.output, 'w')
+        writer = JsonLinesWriter(out)
+
+    n_files = 0
+    n_records = 0
+    n_bytes = 0
+    failed = 0
+    start = time.perf_counter()
+    try:
+        for path, size, rows, error in parse_paths(
+            parser,
+            paths,
+            processes=args.processes,
+            fields=fields,
+            records=args.records,
+            errors=args.errors
+        ):
+            if error is not None:
+                failed += 1
+                print(f'{path}: {error}', file=sys.stderr)
+                continue
+
+            n_files += 1
+            n_bytes += size
+            for i, row in enumerate(rows):
+                row = {'file': path, 'record': i, **row} if args.records else {'file': path, **row}
+                writer.write(row)
+
+            n_records += len(rows)
+
+        writer.close()
+
+    finally:
+        if (out is not None) and (out is not sys.stdout):
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        rate = max(elapsed, 1e-9)
+        print(
+            f'{n_files} files, {n_records} records, {n_bytes} bytes in {elapsed:.3f} s '
+            f'({n_bytes / rate / 1e6:.1f} MB/s, {n_records / rate:.0f} records/s), '
+            f'{failed} failed',
+            file=sys.stderr
+        )
+
+    return 1 if failed else 0
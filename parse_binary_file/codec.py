@@ -0,0 +1,235 @@
+"""
+Registry of codecs for data types that are not described by a
+`struct` format, such as variable length integers.
+"""
+from __future__ import annotations
+from typing import Union, Any, List, Dict, Callable
+from dataclasses import dataclass
+
+
+SizeFunction = Callable[[Any, int], int]
+DecodeFunction = Callable[[Any, int], Any]
+DecodeArrayFunction = Callable[[Any, int, int], List[Any]]
+
+
+@dataclass(frozen=True)
+class Codec():
+    """
+    Describes how to read a data type from a buffer.
+
+    Properties:
+    + **name:** Name of the data type, used as a field's `type`.
+    + **size:** Function with signature `(buffer, offset)` returning the
+        size in bytes of the value starting at `offset`.
+        Must raise an `IndexError` if the buffer ends before the value does.
+    + **decode:** Function with signature `(buffer, offset)` returning
+        the value starting at `offset`.
+    + **decode_array:** Function with signature `(buffer, offset, end)`
+        returning a list of the consecutive values between `offset` and `end`.
+        If not provided, `size` and `decode` are called for each value.
+    + **peek_size:** Function with signature `(buffer, offset)` returning the
+        size in bytes of the value starting at `offset`, needing only the bytes
+        up to where the size is known, e.g. a length prefix.
+        Must raise an `IndexError` if the buffer ends before the size is known.
+        Used to read the rest of the value from a stream in one call.
+        If not provided, `size` is used.
+    """
+    name: str
+    size: SizeFunction
+    decode: DecodeFunction
+    decode_array: Union[DecodeArrayFunction, None] = None
+    peek_size: Union[SizeFunction, None] = None
+
+    def decode_all(self, buffer: Any, offset: int, end: int) -> List[Any]:
+        """
+        Decode consecutive values.
+
+        :param buffer: Buffer to decode.
+        :param offset: Offset of the first value.
+        :param end: Offset the values end at.
+        :returns list: Decoded values.
+        :raises ValueError: If the last value does not end at `end`.
+        """
+        if self.decode_array is not None:
+            return self.decode_array(buffer, offset, end)
+
+        values = []
+        while offset < end:
+            values.append(self.decode(buffer, offset))
+            offset += self.size(buffer, offset)
+
+        if offset != end:
+            raise ValueError('Values do not end at the end of the data')
+
+        return values
+
+
+_registry: Dict[str, Codec] = {}
+
+
+def register_codec(codec: Codec, replace: bool = False):
+    """
+    Register a codec so its name can be used as a field type.
+
+    :param codec: Codec to register.
+    :param replace: Replace a codec already registered with the same name.
+        [Default: False]
+    :raises ValueError: If a codec with the same name is already registered
+        and `replace` is `False`.
+    """
+    if (not replace) and (codec.name in _registry):
+        raise ValueError(f'Codec `{codec.name}` is already registered')
+
+    _registry[codec.name] = codec
+
+
+def get_codec(name: str) -> Union[Codec, None]:
+    """
+    :param name: Name of the data type.
+        Array types, enclosed in brackets (`[]`), return their element's codec.
+    :returns Codec | None: Registered codec, or `None` if not registered.
+    """
+    if (len(name) > 2) and (name[0] == '[') and (name[-1] == ']'):
+        name = name[1:-1]
+
+    return _registry.get(name)
+
+
+# ---------------------
+# --- varint/LEB128 ---
+# ---------------------
+
+def varint_size(buffer: Any, offset: int) -> int:
+    """
+    :returns int: Size of the unsigned LEB128 varint at `offset`.
+    :raises IndexError: If the varint is not terminated.
+    """
+    i = offset
+    while buffer[i] & 0x80:
+        i += 1
+
+    return i - offset + 1
+
+
+def varint_decode(buffer: Any, offset: int) -> int:
+    """
+    :returns int: Value of the unsigned LEB128 varint at `offset`.
+    """
+    b = buffer[offset]
+    if b < 0x80:
+        # single byte fast path
+        return b
+
+    value = 0
+    shift = 0
+    while b & 0x80:
+        value |= (b & 0x7f) << shift
+        shift += 7
+        offset += 1
+        b = buffer[offset]
+
+    return value | (b << shift)
+
+
+def varint_decode_array(buffer: Any, offset: int, end: int) -> List[int]:
+    """
+    :returns list[int]: Values of consecutive unsigned LEB128 varints.
+    :raises ValueError: If the last varint does not end at `end`.
+    """
+    values = []
+    append = values.append
+    value = 0
+    shift = 0
+    for b in buffer[offset:end]:
+        if b & 0x80:
+            value |= (b & 0x7f) << shift
+            shift += 7
+
+        else:
+            append(value | (b << shift))
+            value = 0
+            shift = 0
+
+    if shift:
+        raise ValueError('Last varint is not terminated')
+
+    return values
+
+
+def zigzag(n: int) -> int:
+    """
+    :returns int: Signed value of a zigzag encoded integer.
+    """
+    return (n >> 1) ^ -(n & 1)
+
+
+def zigzag_decode(buffer: Any, offset: int) -> int:
+    """
+    :returns int: Value of the zigzag encoded varint at `offset`.
+    """
+    return zigzag(varint_decode(buffer, offset))
+
+
+def zigzag_decode_array(buffer: Any, offset: int, end: int) -> List[int]:
+    """
+    :returns list[int]: Values of consecutive zigzag encoded varints.
+    """
+    return [(n >> 1) ^ -(n & 1) for n in varint_decode_array(buffer, offset, end)]
+
+
+# -------------------------------
+# --- length prefixed strings ---
+# -------------------------------
+
+def length_prefixed_size(buffer: Any, offset: int) -> int:
+    """
+    :returns int: Size of the varint length prefixed value at `offset`,
+        including the prefix.
+    :raises IndexError: If the buffer ends before the value.
+    """
+    size = length_prefixed_peek_size(buffer, offset)
+    if offset + size > len(buffer):
+        raise IndexError('Buffer ended before value')
+
+    return size
+
+
+def length_prefixed_peek_size(buffer: Any, offset: int) -> int:
+    """
+    :returns int: Size of the varint length prefixed value at `offset`,
+        including the prefix, needing only the prefix.
+    :raises IndexError: If the buffer ends before the prefix.
+    """
+    return varint_size(buffer, offset) + varint_decode(buffer, offset)
+
+
+def length_prefixed_bytes_decode(buffer: Any, offset: int) -> bytes:
+    """
+    :returns bytes: Value of the varint length prefixed bytes at `offset`.
+    """
+    start = offset + varint_size(buffer, offset)
+    return bytes(buffer[start:start + varint_decode(buffer, offset)])
+
+
+def length_prefixed_str_decode(buffer: Any, offset: int) -> str:
+    """
+    :returns str: Value of the varint length prefixed UTF-8 string at `offset`.
+    """
+    start = offset + varint_size(buffer, offset)
+    return str(buffer[start:start + varint_decode(buffer, offset)], 'utf-8')
+
+
+register_codec(Codec('varint', varint_size, varint_decode, varint_decode_array))
+register_codec(Codec('zigzag', varint_size, zigzag_decode, zigzag_decode_array))
+register_codec(Codec(
+    'lp_bytes',
+    length_prefixed_size,
+    length_prefixed_bytes_decode,
+    peek_size=length_prefixed_peek_size
+))
+register_codec(Codec(
+    'lp_str',
+    length_prefixed_size,
+    length_prefixed_str_decode,
+    peek_size=length_prefixed_peek_size
+))
@@ -0,0 +1,560 @@
+"""
+Columnar results, shared between processes without pickling.
+"""
+from __future__ import annotations
+import array
+from typing import Union, Tuple, List, Dict, Iterable, Iterator, Any, TYPE_CHECKING
+from dataclasses import dataclass, field
+
+from .field_description import FieldDescription
+from .file_format import FileFormat
+from .data import Data
+from .bitfield import BitField
+
+if TYPE_CHECKING:
+    from multiprocessing import shared_memory
+
+
+# `struct` format characters with fixed sizes to `array` type codes
+TYPECODES = {
+    '?': 'B',
+    'h': 'h',
+    'H': 'H',
+    'i': 'i',
+    'I': 'I',
+    'l': 'i',  # `struct` standard size is 4 bytes
+    'L': 'I',
+    'q': 'q',
+    'Q': 'Q',
+    'f': 'f',
+    'd': 'd',
+}
+
+CODEC_TYPECODES = {
+    'varint': 'Q',
+    'zigzag': 'q',
+}
+
+# type code of the offsets of array columns
+OFFSET_TYPECODE = 'q'
+
+
+def column_names(format: FileFormat) -> Tuple[Tuple[int, str], ...]:
+    """
+    Names of the columns of a format.
+    Only named fields have columns.
+    Repeated names are suffixed with their occurrence, e.g. `name[1]`.
+
+    :param format: File format.
+    :returns tuple[tuple[int, str], ...]: Tuple of (field index, column name).
+    """
+    counts: Dict[str, int] = {}
+    names = []
+    for i, fd in enumerate(format.fields):
+        if fd.name is None:
+            continue
+
+        n = counts.get(fd.name, 0)
+        counts[fd.name] = n + 1
+        names.append((i, fd.name if n == 0 else f'{fd.name}[{n}]'))
+
+    return tuple(names)
+
+
+def column_typecode(fd: FieldDescription) -> Union[str, None]:
+    """
+    :param fd: Description of the field.
+    :returns str | None: `array` type code of the field's values,
+        or `None` if values are not numeric scalars.
+    """
+    if fd.codec is not None:
+        return None if fd.is_array else CODEC_TYPECODES.get(fd.type)
+
+    if (fd.format is None) or (fd.offset_from is not None):
+        return None
+
+    return TYPECODES.get(fd.format[-1])
+
+
+def element_typecode(fd: FieldDescription) -> Union[str, None]:
+    """
+    :param fd: Description of the field.
+    :returns str | None: `array` type code of the elements of the field's values,
+        or `None` if values are not arrays of numbers.
+    """
+    if (not fd.is_array) or (fd.offset_from is not None):
+        return None
+
+    if fd.codec is not None:
+        return CODEC_TYPECODES.get(fd.codec.name)
+
+    if fd.format is None:
+        return None
+
+    return TYPECODES.get(fd.format[-1])
+
+
+def bit_column_names(format: FileFormat) -> Tuple[Tuple[str, str, BitField], ...]:
+    """
+    Names of the columns of bit fields, named `field.bit_field`.
+
+    :param format: File format.
+    :returns tuple[tuple[str, str, BitField], ...]: Tuple of
+        (column name of the integer field, column name, bit field).
+    """
+    names = dict(column_names(format))
+    return tuple(
+        (names[i], f'{names[i]}.{b.name}', b)
+        for i, b in format.bit_fields
+        if i in names
+    )
+
+
+def _add_bit_columns(chunk: Dict[str, Any], format: FileFormat) -> Dict[str, Any]:
+    """
+    Extract the bit fields of integer columns in bulk.
+
+    :param chunk: Columns of a chunk.
+    :param format: Format of the records.
+    :returns dict[str, Any]: Columns of the chunk, including bit fields.
+    """
+    for source, name, b in bit_column_names(format):
+        values = chunk[source]
+        if hasattr(values, 'dtype'):
+            # numpy array
+            chunk[name] = b.extract_array(values)
+
+        else:
+            chunk[name] = _numeric([b.extract(v) for v in values], 'q')
+
+    return chunk
+
+
+def to_columns(records: Iterable[Data], format: FileFormat) -> Dict[str, list]:
+    """
+    :param records: Parsed records.
+    :param format: Format of the records.
+    :returns dict[str, list]: Dictionary of {column name: values}.
+    """
+    names = column_names(format)
+    columns: Dict[str, list] = {name: [] for _, name in names}
+    for record in records:
+        for i, name in names:
+            columns[name].append(record.fields[i].value)
+
+    return columns
+
+
+def _numeric(values: list, typecode: Union[str, None]) -> Union[array.array, list]:
+    """
+    :returns array.array | list: Values as an array, if possible.
+    """
+    if typecode is None:
+        return values
+
+    try:
+        return array.array(typecode, values)
+
+    except (OverflowError, TypeError):
+        return values
+
+
+class ArrayColumn():
+    """
+    Column of numeric arrays, one for each record, stored as the values
+    of all records one after the other, and the offset of each record's values.
+    The values of record `i` are `values[offsets[i]:offsets[i + 1]]`.
+
+    :param values: Values of all records.
+    :param offsets: Offset of the values of each record,
+        followed by the number of values.
+    """
+    def __init__(self, values: Any, offsets: Any):
+        self.values = values
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> Any:
+        """
+        :returns Any: Values of the record, without copying.
+        :raises IndexError: If the record does not exist.
+        """
+        if not (-len(self) <= index < len(self)):
+            raise IndexError(f'No record with index `{index}`')
+
+        index %= len(self)
+        return self.values[self.offsets[index]:self.offsets[index + 1]]
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def tolist(self) -> List[list]:
+        """
+        :returns list[list]: Values of each record, as lists.
+        """
+        return [values.tolist() for values in self]
+
+    @staticmethod
+    def from_lists(values: List[list], typecode: str) -> Union[ArrayColumn, List[list]]:
+        """
+        :param values: Values of each record.
+        :param typecode: `array` type code of the values.
+        :returns ArrayColumn | list[list]: Column of the values,
+            or the values if they do not fit the type code.
+        """
+        flat = _numeric([v for vs in values for v in vs], typecode)
+        if not isinstance(flat, array.array):
+            return values
+
+        offsets = array.array(OFFSET_TYPECODE, [0])
+        n = 0
+        for vs in values:
+            n += len(vs)
+            offsets.append(n)
+
+        return ArrayColumn(flat, offsets)
+
+    @staticmethod
+    def concatenate(parts: List[ArrayColumn]) -> ArrayColumn:
+        """
+        :param parts: Columns to concatenate.
+        :returns ArrayColumn: Copy of the columns, one after the other.
+        """
+        offsets = array.array(OFFSET_TYPECODE, [0])
+        for p in parts:
+            base = offsets[-1] - int(p.offsets[0])
+            offsets.extend(base + int(o) for o in p.offsets[1:])
+
+        values = _concatenate([p.values for p in parts])
+        return ArrayColumn(values, _view(offsets))
+
+
+def _concatenate(parts: List[Any]) -> Any:
+    """
+    :param parts: Numeric arrays, NumPy arrays, or memoryviews of the same type.
+    :returns Any: Copy of the values, one after the other.
+    """
+    if hasattr(parts[0], 'dtype'):
+        # numpy arrays
+        import numpy as np
+        return np.concatenate(parts)
+
+    typecode = (
+        parts[0].typecode
+        if isinstance(parts[0], array.array) else
+        parts[0].format
+    )
+    values = array.array(typecode)
+    for p in parts:
+        with memoryview(p) as view, view.cast('B') as data:
+            values.frombytes(data)
+
+    return values
+
+
+# shared memory with views still in use when closed
+_unreleased: List[shared_memory.SharedMemory] = []
+
+
+def _release():
+    """
+    Close shared memory whose views are no longer in use.
+    """
+    in_use = []
+    for shm in _unreleased:
+        try:
+            shm.close()
+
+        except BufferError:
+            in_use.append(shm)
+
+    _unreleased[:] = in_use
+
+
+@dataclass(frozen=True)
+class SharedColumn():
+    """
+    Describes a column stored in shared memory.
+
+    Properties:
+    + **name:** Name of the shared memory block.
+    + **typecode:** `array` type code of the values.
+    + **length:** Number of values.
+    """
+    name: str
+    typecode: str
+    length: int
+
+
+@dataclass(frozen=True)
+class SharedArrayColumn():
+    """
+    Describes a column of numeric arrays stored in shared memory.
+    See `ArrayColumn`.
+
+    Properties:
+    + **values:** Values of all records.
+    + **offsets:** Offset of the values of each record,
+        followed by the number of values.
+    """
+    values: SharedColumn
+    offsets: SharedColumn
+
+
+@dataclass(frozen=True)
+class ColumnsDescriptor():
+    """
+    Describes columns sent between processes.
+    Numeric columns, and columns of numeric arrays, are stored in shared memory,
+    other columns are included directly.
+
+    Properties:
+    + **length:** Number of records.
+    + **shared:** Dictionary of {column name: SharedColumn}.
+    + **objects:** Dictionary of {column name: values}.
+    + **arrays:** Dictionary of {column name: SharedArrayColumn}.
+    """
+    length: int
+    shared: Dict[str, SharedColumn]
+    objects: Dict[str, list]
+    arrays: Dict[str, SharedArrayColumn] = field(default_factory=dict)
+
+
+def _share(values: array.array) -> SharedColumn:
+    """
+    Copy values to a new shared memory block.
+
+    :param values: Values to share.
+    :returns SharedColumn: Shared column.
+    """
+    from multiprocessing import shared_memory
+
+    data = memoryview(values).cast('B')
+    if len(data) == 0:
+        # empty blocks can not be created
+        return SharedColumn('', values.typecode, 0)
+
+    shm = shared_memory.SharedMemory(create=True, size=len(data))
+    shm.buf[:len(data)] = data
+    shm.close()
+    return SharedColumn(shm.name, values.typecode, len(values))
+
+
+def _attach(col: SharedColumn, blocks: List[shared_memory.SharedMemory]) -> Any:
+    """
+    Attach to a shared column, unlinking its shared memory block.
+
+    :param col: Shared column.
+    :param blocks: List to append the attached block to.
+    :returns Any: View of the values. See `_view`.
+    """
+    from multiprocessing import shared_memory
+
+    if not col.name:
+        return _view(array.array(col.typecode))
+
+    shm = shared_memory.SharedMemory(name=col.name)
+    shm.unlink()
+    blocks.append(shm)
+
+    size = col.length * array.array(col.typecode).itemsize
+    return _view(shm.buf[:size].cast(col.typecode))
+
+
+def export_columns(records: List[Data], format: FileFormat) -> ColumnsDescriptor:
+    """
+    Write the numeric columns, and columns of numeric arrays,
+    of records to shared memory.
+    The shared memory blocks must be unlinked by the receiver,
+    see `Columns.from_descriptors`.
+
+    :param records: Parsed records.
+    :param format: Format of the records.
+    :returns ColumnsDescriptor: Descriptor of the columns.
+    """
+    columns = to_columns(records, format)
+    typecodes = {name: column_typecode(format.fields[i]) for i, name in column_names(format)}
+    elements = {name: element_typecode(format.fields[i]) for i, name in column_names(format)}
+    shared = {}
+    objects = {}
+    arrays = {}
+    for name, values in columns.items():
+        if elements[name] is not None:
+            values = ArrayColumn.from_lists(values, elements[name])
+            if isinstance(values, ArrayColumn):
+                arrays[name] = SharedArrayColumn(_share(values.values), _share(values.offsets))
+
+            else:
+                objects[name] = values
+
+            continue
+
+        values = _numeric(values, typecodes[name])
+        if (not isinstance(values, array.array)) or (len(values) == 0):
+            objects[name] = list(values)
+            continue
+
+        shared[name] = _share(values)
+
+    return ColumnsDescriptor(len(records), shared, objects, arrays)
+
+
+def _view(values: Any) -> Any:
+    """
+    :returns numpy.ndarray | Any: NumPy view of the values if
+        NumPy is installed and the values are numeric, otherwise the values.
+        Array columns are returned with views of their values and offsets.
+    """
+    if isinstance(values, list):
+        return values
+
+    if isinstance(values, ArrayColumn):
+        return ArrayColumn(_view(values.values), _view(values.offsets))
+
+    try:
+        import numpy as np
+
+    except ImportError:
+        return values
+
+    typecode = values.typecode if isinstance(values, array.array) else values.format
+    return np.frombuffer(values, dtype=typecode)
+
+
+class Columns():
+    """
+    Columns of parsed records, possibly split into chunks.
+    Numeric columns are NumPy arrays, if NumPy is installed,
+    otherwise arrays or memoryviews.
+    Columns of numeric arrays are `ArrayColumn`s of such values.
+    Other columns are lists.
+
+    Columns received from other processes are views of shared memory.
+    Views are valid until the columns are closed.
+    """
+    def __init__(self, chunks: List[Dict[str, Any]], names: Tuple[str, ...]):
+        self._chunks = chunks
+        self._names = names
+        self._shared: List[shared_memory.SharedMemory] = []
+
+    def __enter__(self) -> Columns:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        if not self._names:
+            return 0
+
+        return sum(len(c[self._names[0]]) for c in self._chunks)
+
+    def __getitem__(self, name: str) -> Any:
+        """
+        Get a column.
+        Columns of multiple chunks are concatenated.
+
+        :raises KeyError: If the column does not exist.
+        """
+        if name not in self._names:
+            raise KeyError(f'No column with name `{name}`')
+
+        parts = [c[name] for c in self._chunks]
+        if len(parts) == 1:
+            return parts[0]
+
+        if any(isinstance(p, list) for p in parts):
+            return [
+                v for p in parts
+                for v in (p.tolist() if isinstance(p, ArrayColumn) else p)
+            ]
+
+        if isinstance(parts[0], ArrayColumn):
+            return ArrayColumn.concatenate(parts)
+
+        return _concatenate(parts)
+
+    def keys(self) -> Tuple[str, ...]:
+        """
+        :returns tuple[str, ...]: Names of the columns.
+        """
+        return self._names
+
+    @property
+    def chunks(self) -> List[Dict[str, Any]]:
+        """
+        :returns list[dict[str, Any]]: Columns of each chunk, without copying.
+        """
+        return self._chunks
+
+    def close(self):
+        """
+        Release shared memory.
+        Views of the columns must not be used afterwards.
+        """
+        self._chunks = [{name: [] for name in self._names}]
+        _unreleased.extend(self._shared)
+        self._shared = []
+        _release()
+
+    @staticmethod
+    def from_records(records: Iterable[Data], format: FileFormat) -> Columns:
+        """
+        :param records: Parsed records.
+        :param format: Format of the records.
+        :returns Columns: Columns of the records.
+        """
+        columns = to_columns(records, format)
+        typecodes = {name: column_typecode(format.fields[i]) for i, name in column_names(format)}
+        elements = {name: element_typecode(format.fields[i]) for i, name in column_names(format)}
+        chunk = {
+            name: _view(
+                _numeric(values, typecodes[name])
+                if elements[name] is None else
+                ArrayColumn.from_lists(values, elements[name])
+            )
+            for name, values in columns.items()
+        }
+
+        _add_bit_columns(chunk, format)
+        return Columns([chunk], tuple(chunk))
+
+    @staticmethod
+    def from_descriptors(
+        descriptors: List[ColumnsDescriptor],
+        format: FileFormat
+    ) -> Columns:
+        """
+        Attach to columns in shared memory.
+        The shared memory blocks are unlinked, so they are freed
+        once the columns are closed.
+
+        :param descriptors: Descriptors of each chunk, in order.
+        :param format: Format of the records.
+        :returns Columns: Columns of the records.
+        """
+        names = (
+            *(name for _, name in column_names(format)),
+            *(name for _, name, _ in bit_column_names(format))
+        )
+        columns = Columns([], names)
+        for desc in descriptors:
+            chunk = dict(desc.objects)
+            for name, col in desc.shared.items():
+                chunk[name] = _attach(col, columns._shared)
+
+            for name, col in desc.arrays.items():
+                chunk[name] = ArrayColumn(
+                    _attach(col.values, columns._shared),
+                    _attach(col.offsets, columns._shared)
+                )
+
+            columns._chunks.append(_add_bit_columns(chunk, format))
+
+        if len(columns._chunks) == 0:
+            columns._chunks.append({name: [] for name in names})
+
+        return columns
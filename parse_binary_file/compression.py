@@ -0,0 +1,70 @@
+"""
+Detect and decompress compressed files.
+"""
+import io
+import os
+from typing import Union
+
+
+MAGIC_NUMBERS = {
+    b'\x1f\x8b': 'gzip',
+    b'BZh': 'bz2',
+    b'\xfd7zXZ\x00': 'xz',
+}
+
+MAGIC_SIZE = max(map(len, MAGIC_NUMBERS))
+COMPRESSIONS = tuple(MAGIC_NUMBERS.values())
+
+
+def detect_compression(head: bytes) -> Union[str, None]:
+    """
+    Detect the compression of data from its magic number.
+
+    :param head: First bytes of the data.
+    :returns str | None: Compression, one of ['gzip', 'bz2', 'xz'],
+        or `None` if not compressed.
+    """
+    for magic, compression in MAGIC_NUMBERS.items():
+        if head.startswith(magic):
+            return compression
+
+    return None
+
+
+def file_compression(path: Union[str, os.PathLike]) -> Union[str, None]:
+    """
+    :param path: Path to the file.
+    :returns str | None: Compression of the file. See `detect_compression`.
+    """
+    with open(path, 'rb') as f:
+        return detect_compression(f.read(MAGIC_SIZE))
+
+
+def open_decompressed(
+    path: Union[str, os.PathLike],
+    compression: str
+) -> io.BufferedIOBase:
+    """
+    Open a compressed file as a stream of its decompressed data.
+    Data is decompressed as it is read.
+
+    :param path: Path to the file.
+    :param compression: Compression of the file.
+        See `detect_compression`.
+    :returns io.BufferedIOBase: Decompressed stream.
+    :raises ValueError: If the compression is unknown.
+    """
+    # import as needed
+    if compression == 'gzip':
+        import gzip
+        return gzip.open(path, 'rb')
+
+    if compression == 'bz2':
+        import bz2
+        return bz2.open(path, 'rb')
+
+    if compression == 'xz':
+        import lzma
+        return lzma.open(path, 'rb')
+
+    raise ValueError(f'Unknown compression `{compression}`')
@@ -1,3 +1,4 @@
+import sys
 from typing import Union, Iterable, Dict, Tuple, Any
 from dataclasses import dataclass, field
 
@@ -6,6 +7,74 @@ from .file_format import FileFormat
 from .field import Field
 
 
+def _sizeof(obj: Any) -> int:
+    """
+    :returns int: Size of an object in bytes, including the items of
+        lists and tuples.
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple)):
+        size += sum(map(_sizeof, obj))
+
+    return size
+
+
+@dataclass(frozen=True)
+class MemoryUsage():
+    """
+    Memory used by a field, in bytes.
+
+    Properties:
+    + **name:** Name of the field.
+    + **value:** Memory used by the parsed value.
+    + **data:** Memory used by the original data.
+        Data shared with the value is not counted.
+    + **overhead:** Memory used by the `Field` object.
+    + **total:** Total memory used.
+    """
+    name: Union[str, None]
+    value: int
+    data: int
+    overhead: int
+
+    @property
+    def total(self) -> int:
+        return self.value + self.data + self.overhead
+
+
+@dataclass(frozen=True)
+class OffsetMap():
+    """
+    Where the fields of a record were parsed from in a buffer.
+
+    Properties:
+    + **spans:** Tuple of (start, stop) offsets of the data of each field,
+        or `None` for pointer fields.
+    + **size:** Size of the data parsed.
+    """
+    spans: Tuple[Union[Tuple[int, int], None], ...]
+    size: int
+
+
+def _field_memory_usage(f: Field) -> MemoryUsage:
+    """
+    :returns MemoryUsage: Memory used by the field, including its subfields.
+    """
+    value = _sizeof(f.value)
+    data = (
+        0
+        if (f.data is None) or (f.data is f.value) else
+        sys.getsizeof(f.data)
+    )
+    overhead = sys.getsizeof(f) + sys.getsizeof(f.__dict__)
+    if f.fields is not None:
+        for child in map(_field_memory_usage, f.fields):
+            data += child.data
+            overhead += child.overhead
+
+    return MemoryUsage(f.name, value, data, overhead)
+
+
 @dataclass
 class Data():
     """
@@ -14,6 +83,7 @@ class Data():
     _fields: Tuple[Field]
     _value: Any = field(default=None, init=False)
     _is_loaded: bool = False
+    _offset_map: Union[OffsetMap, None] = field(default=None, init=False, repr=False, compare=False)
 
     def __init__(
         self,
@@ -68,6 +138,14 @@ class Data():
         """
         return self._fields
 
+    @property
+    def offset_map(self) -> Union[OffsetMap, None]:
+        """
+        :returns OffsetMap | None: Where the fields were parsed from,
+            if parsed from a buffer with `Parser.parse`.
+        """
+        return self._offset_map
+
     @property
     def value(self) -> Tuple[Any]:
         """
@@ -85,19 +163,18 @@ class Data():
             If multiple fields with the same name exist
             the value is a tuple with their values, in order.
         """
-        vals = {}
+        vals: Dict[str, list] = {}
         for f in self.fields:
-            if f.name is None:
-                continue
+            if f.name is not None:
+                vals.setdefault(f.name, []).append(f.value)
 
-            if f.name in vals:
-                if isinstance(vals[f.name], tuple):
-                    vals[f.name] = (*vals[f.name], f.value)
+        return {
+            name: (v[0] if len(v) == 1 else tuple(v))
+            for name, v in vals.items()
+        }
 
-                else:
-                    vals[f.name] = (vals[f.name], f.value)
-
-            else:
-                vals[f.name] = f.value
-
-        return vals
\ No newline at end of file
+    def memory_usage(self) -> Tuple[MemoryUsage, ...]:
+        """
+        :returns tuple[MemoryUsage, ...]: Memory used by each field, in order.
+        """
+        return tuple(map(_field_memory_usage, self.fields))
@@ -0,0 +1,266 @@
+"""
+Edit fields of files in place.
+"""
+from __future__ import annotations
+import os
+import sys
+import mmap
+import struct
+from typing import Union, Tuple, Any, TYPE_CHECKING
+
+from .lazy_data import LazyData
+
+if TYPE_CHECKING:
+    from .parser import Parser
+    from .field_description import FieldDescription
+
+
+def _byte_order(fd: FieldDescription) -> str:
+    """
+    :returns str: Byte order of an integer field, as used by `int.from_bytes`.
+    """
+    if fd.format[0] == '<':
+        return 'little'
+
+    if fd.format[0] in '>!':
+        return 'big'
+
+    return sys.byteorder
+
+
+def encode_value(fd: FieldDescription, value: Any) -> bytes:
+    """
+    Encode the value of a field.
+
+    :param fd: Description of the field.
+    :param value: Value of the field.
+    :returns bytes: Data of the field.
+    :raises ValueError: If the value can not be encoded as the field's type.
+    """
+    if fd.type == 'bytes':
+        if not isinstance(value, (bytes, bytearray)):
+            raise ValueError(f'Value of a `bytes` field must be bytes. {fd}')
+
+        return bytes(value)
+
+    if fd.type == 'str':
+        data = value.encode(fd.format)
+        if fd.terminator is not None:
+            if fd.terminator in data:
+                raise ValueError(f'Value of a `str` field can not contain its terminator. {fd}')
+
+            data += fd.terminator
+
+        return data
+
+    if fd.is_array or (fd.codec is not None) or (fd.format is None):
+        raise ValueError(f'Values of `{fd.type}` fields can not be encoded')
+
+    try:
+        return struct.pack(fd.format, value)
+
+    except struct.error as err:
+        raise ValueError(f'Can not encode `{value!r}` for {fd}. {err}')
+
+
+class Editor():
+    """
+    Edits fields of a file in place through a writable memory map.
+    Only the bytes of edited fields, and checksums covering them, are written,
+    so edits do not depend on the size of the file.
+    New values must have the same size as the current data,
+    so the offsets of other fields do not change.
+
+    Fields of the first record are located as by `LazyData`.
+    Fields of later records require a format with a fixed size.
+
+    :param parser: Parser of the file's format.
+    :param path: Path to the file.
+    :raises ValueError: If the file is compressed or empty.
+    """
+    def __init__(self, parser: Parser, path: Union[str, os.PathLike]):
+        if parser._compression(path) is not None:
+            raise ValueError('Compressed files can not be edited in place')
+
+        self._parser = parser
+        self._file = open(path, 'r+b')
+        try:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE)
+
+        except BaseException:
+            self._file.close()
+            raise
+
+        self._first = LazyData(parser, self._buffer)
+
+    def __enter__(self) -> Editor:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def flush(self):
+        """
+        Write edits to the file.
+        """
+        self._buffer.flush()
+
+    def close(self):
+        """
+        Write edits to the file and close it.
+        """
+        if not self._buffer.closed:
+            self._buffer.flush()
+            self._buffer.close()
+
+        self._file.close()
+
+    def __len__(self) -> int:
+        """
+        :returns int: Number of records, if the format has a fixed size,
+            otherwise 1.
+        """
+        size = self._parser.format.size
+        if not size:
+            return 1
+
+        return len(self._buffer) // size
+
+    def _span(self, index: int, record: int) -> Tuple[int, int]:
+        """
+        :param index: Index of a non-pointer field.
+        :param record: Index of the record.
+        :returns tuple[int, int]: Tuple of (start, stop) offsets of the field.
+        :raises ValueError: If the record can not be located.
+        :raises IndexError: If the record is outside of the file.
+        """
+        fmt = self._parser.format
+        if (record != 0) and (not fmt.size):
+            raise ValueError('Records after the first can only be edited in formats with a fixed size')
+
+        if not (0 <= record < len(self)):
+            raise IndexError(f'Record {record} is outside of the file')
+
+        if record == 0:
+            start, stop = self._first._span(index)
+
+        else:
+            start = record * fmt.size + fmt.offsets[index]
+            stop = start + fmt.fields[index].size
+
+        fd = fmt.fields[index]
+        if (fd.size is not None) and (fd.size > 0) and (stop - start != fd.size):
+            raise IndexError(f'Record {record} is outside of the file')
+
+        return (start, stop)
+
+    def _resolve(self, name: Union[str, int]) -> Tuple[int, Any]:
+        """
+        :param name: Name or index of a field, or `field.bit` for a bit field.
+        :returns tuple[int, BitField | None]: Tuple of (field index, bit field).
+        :raises KeyError: If the field does not exist.
+        """
+        fmt = self._parser.format
+        try:
+            return (fmt._field_index(name), None)
+
+        except KeyError as err:
+            if (not isinstance(name, str)) or ('.' not in name):
+                raise err
+
+        f_name, b_name = name.rsplit('.', 1)
+        index = fmt._field_index(f_name)
+        for b in (fmt.fields[index].bits or ()):
+            if b.name == b_name:
+                return (index, b)
+
+        raise KeyError(f'No bit field `{b_name}` of `{f_name}`')
+
+    def _editable(self, index: int) -> FieldDescription:
+        """
+        :returns FieldDescription: Description of the field.
+        :raises ValueError: If the field can not be edited in place.
+        """
+        fmt = self._parser.format
+        fd = fmt.fields[index]
+        if fd.offset_from is not None:
+            raise ValueError(f'Pointer fields can not be edited in place. {fd}')
+
+        if fd.switch is not None:
+            raise ValueError(f'Switch fields can not be edited in place. {fd}')
+
+        if index in fmt.switch_sources:
+            raise ValueError(f'Fields selecting the layout of a switch field can not be edited. {fd}')
+
+        return fd
+
+    def get(self, name: Union[str, int], record: int = 0) -> Any:
+        """
+        :param name: Name or index of the field, or `field.bit` for a bit field.
+        :param record: Index of the record. [Default: 0]
+        :returns Any: Current value of the field.
+        :raises IndexError: If the record is outside of the file.
+        """
+        index, bit = self._resolve(name)
+        fd = self._parser.format.fields[index]
+        start, stop = self._span(index, record)
+        value = self._parser._field(self._buffer[start:stop], fd).value
+        return value if (bit is None) else bit.extract(value)
+
+    def set(self, name: Union[str, int], value: Any, record: int = 0):
+        """
+        Set the value of a field, packing it in place.
+        Checksums covering the field are updated.
+
+        :param name: Name or index of the field, or `field.bit` for a bit field.
+        :param value: New value of the field.
+        :param record: Index of the record. [Default: 0]
+        :raises ValueError: If the new data does not have the same size
+            as the current data, does not match the field's expected value,
+            or the field can not be edited in place.
+        :raises IndexError: If the record is outside of the file.
+        """
+        index, bit = self._resolve(name)
+        fd = self._editable(index)
+        start, stop = self._span(index, record)
+        if bit is None:
+            data = encode_value(fd, value)
+
+        else:
+            order = _byte_order(fd)
+            current = int.from_bytes(self._buffer[start:stop], order)
+            data = bit.insert(current, value).to_bytes(stop - start, order)
+
+        if len(data) != stop - start:
+            raise ValueError(
+                f'Size of the new data ({len(data)} bytes) does not match the field ({stop - start} bytes). {fd}'
+            )
+
+        if (fd.value is not None) and (data != fd.value):
+            raise ValueError(f'Value does not match the expected value of {fd}')
+
+        self._buffer[start:stop] = data
+        self._first._parsed.clear()
+        self._update_checksums(index, record)
+
+    def _update_checksums(self, index: int, record: int):
+        """
+        Recompute the checksums covering a field, and those covering them.
+
+        :param index: Index of the edited field.
+        :param record: Index of the record.
+        :raises ValueError: If a checksum covers a pointer field.
+        """
+        fmt = self._parser.format
+        for c in fmt.checksum_cover[index]:
+            value = c.checksum.initial
+            for i in range(c.start, c.end + 1):
+                if fmt.pointer_sources[i] is not None:
+                    raise ValueError('Checksums covering pointer fields can not be updated in place')
+
+                start, stop = self._span(i, record)
+                value = c.checksum.function(self._buffer[start:stop], value)
+
+            start, stop = self._span(c.index, record)
+            self._buffer[start:stop] = encode_value(fmt.fields[c.index], value)
+            self._update_checksums(c.index, record)
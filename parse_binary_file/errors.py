@@ -19,4 +19,28 @@ class IncompatibleProperties(ValueError):
 class ValuesDoNotMatch(ValueError):
     """
     Raised when the given field value and the expected value do not match.
+
+    :param msg: Message to display.
+    :param field: Field whose value did not match.
+    """
+    def __init__(self, msg=None, field=None):
+        super().__init__(msg)
+        self.field = field
+
+
+class ChecksumMismatch(ValuesDoNotMatch):
+    """
+    Raised when a checksum field does not match the computed checksum.
     """
+
+
+class IncompleteRecord(ValueError):
+    """
+    Raised when the data ends before all fields of a record terminated.
+
+    :param msg: Message to display.
+    :param offset: Offset at which the incomplete record started.
+    """
+    def __init__(self, msg=None, offset=None):
+        super().__init__(msg)
+        self.offset = offset
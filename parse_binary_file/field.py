@@ -13,6 +13,7 @@ from .data_types import (
 )
 from .errors import ValuesDoNotMatch
 from .field_description import FieldDescription
+from .bitfield import extract_bits
 
 
 @dataclass
@@ -30,6 +31,10 @@ class Field():
         """
         Attempts to retrieve properties from field description.
         """
+        if (name == 'desc') or name.startswith('__'):
+            # `desc` not yet set, e.g. while unpickling
+            raise AttributeError(name)
+
         return getattr(self.desc, name)
 
     @property
@@ -43,6 +48,17 @@ class Field():
         """
         return self._data
 
+    @property
+    def bit_values(self) -> typing.Dict[str, int] | None:
+        """
+        :returns dict[str, int] | None: Dictionary of {name: value} of the
+            bit fields packed into the field, or `None` if it has none.
+        """
+        if self.desc.bits is None:
+            return None
+
+        return extract_bits(self.desc.bits, self.value)
+
     @property
     def expected_value(self):
         return self.desc.value
@@ -146,6 +162,13 @@ class Field():
                 err.reason = f'{err.reason} for {self}'
                 raise err
 
+        elif self.codec is not None:
+            if self.is_array:
+                self.value = self.codec.decode_all(val, 0, len(val))
+
+            else:
+                self.value = self.codec.decode(val, 0)
+
         else:
             fmt_byte_order = EndianFormat.LITTLE
 
@@ -175,7 +198,11 @@ class Field():
                 except KeyError:
                     raise ValueError(f'Unknown format type `{self.type}')
 
-                fmt = f'{fmt_byte_order.value}{fmt_dtype}'
+                fmt = (
+                    self.format
+                    if self.format is not None else
+                    f'{fmt_byte_order.value}{fmt_dtype}'
+                )
                 self.value = struct.unpack(fmt, val)[0]
 
         # @todo: validate value
@@ -189,6 +216,135 @@ class Field():
                 exp_val = exp_val.decode(self.format)
 
             if self.value != exp_val:
-                raise ValueError(
-                    f'Parsed value did not match expected for {self}'
-                )
\ No newline at end of file
+                raise ValuesDoNotMatch(
+                    f'Parsed value did not match expected for {self}',
+                    self
+                )
+
+
+def value_decoder(desc: FieldDescription) -> typing.Callable[[bytes], typing.Any]:
+    """
+    Create a function that decodes the value of a field from its data
+    without creating a `Field`.
+    Equivalent to `Field.from_data(data, desc).value`, including the errors raised.
+
+    :param desc: Description of the field.
+    :returns Callable[[bytes], Any]: Function decoding the value from data.
+    """
+    def slow(data: bytes) -> typing.Any:
+        # raises the same errors as `Field`
+        return Field.from_data(data, desc).value
+
+    codec = desc.codec
+    if desc.type == 'bytes':
+        def decode(data: bytes) -> typing.Any:
+            return data
+
+    elif desc.type == 'str':
+        encoding = desc.format
+        term = desc.terminator
+        if (term is not None) and (not isinstance(term, bytes)):
+            term = term.encode(encoding)
+
+        if term is None:
+            def decode(data: bytes) -> typing.Any:
+                return data.decode(encoding)
+
+        else:
+            n_term = len(desc.terminator)
+
+            def decode(data: bytes) -> typing.Any:
+                if data[-n_term:] != term:
+                    raise ValueError('Invalid terminator')
+
+                return data[:-n_term].decode(encoding)
+
+    elif codec is not None:
+        if desc.is_array:
+            def decode(data: bytes) -> typing.Any:
+                return codec.decode_all(data, 0, len(data))
+
+        else:
+            def decode(data: bytes) -> typing.Any:
+                return codec.decode(data, 0)
+
+    elif (desc.format is not None) and (desc.data_type is not None) and (desc.type[0] != '['):
+        unpack = struct.Struct(desc.format).unpack
+
+        def decode(data: bytes) -> typing.Any:
+            return unpack(data)[0]
+
+    else:
+        return slow
+
+    expected = desc.value
+    if expected is None:
+        def decoder(data: bytes) -> typing.Any:
+            try:
+                return decode(data)
+
+            except (ValueError, struct.error):
+                return slow(data)
+
+    else:
+        if isinstance(expected, bytes) and (desc.type == 'str'):
+            expected = expected.decode(desc.format)
+
+        def decoder(data: bytes) -> typing.Any:
+            try:
+                value = decode(data)
+
+            except (ValueError, struct.error):
+                return slow(data)
+
+            if value != expected:
+                return slow(data)
+
+            return value
+
+    return decoder
+
+
+def struct_code(desc: FieldDescription) -> typing.Tuple[typing.Union[str, None], str]:
+    """
+    Code of a field in a `struct` format decoding a whole record,
+    giving the same value as `value_decoder`.
+
+    :param desc: Description of the field.
+    :returns tuple[str | None, str]: Tuple of (byte order, code).
+        The byte order is `None` if the code does not depend on it.
+    :raises ValueError: With the reason if the field can not be
+        decoded as part of a record.
+    """
+    if desc.switch is not None:
+        raise ValueError('layout depends on a previous field')
+
+    if desc.offset_from is not None:
+        raise ValueError('pointer field')
+
+    if desc.value is not None:
+        raise ValueError('expected value is validated')
+
+    if (desc.size is None) or (desc.size < 0) or desc.is_self_terminated:
+        raise ValueError('size is not static')
+
+    if desc.type == 'bytes':
+        return (None, f'{desc.size}s')
+
+    if desc.type == 'str':
+        raise ValueError('strings are decoded')
+
+    if desc.is_array or (desc.data_type is None) or (desc.format is None):
+        raise ValueError('array or codec type')
+
+    order = desc.format[0] if desc.format[0] in '@=<>!' else '@'
+    try:
+        size = struct.calcsize(desc.format)
+
+    except struct.error:
+        raise ValueError(f'invalid format `{desc.format}`')
+
+    if size != desc.size:
+        raise ValueError(f'format `{desc.format}` does not match size')
+
+    return (order, desc.format.lstrip('@=<>!'))
@@ -11,10 +11,22 @@ from .data_types import (
     is_numeric
 )
 from .errors import IncompatibleProperties
+from .codec import Codec, get_codec
+from .checksum import Checksum
+from .bitfield import BitField
+from .switch import Switch
 
 
 PossibleException = Union[Exception, None]
 
+# types that may contain bit fields
+INTEGER_TYPES = [
+    'short', 'u_short', 'int', 'u_int', 'long', 'u_long', 'long_long', 'u_long_long'
+]
+
+# keys of execution hooks
+HOOKS = ('pre', 'post')
+
 
 @dataclass
 class FieldDescription():
@@ -30,9 +42,18 @@ class FieldDescription():
     + **is_null:** Indicates all bytes should be null.
     + **description:** Description of the field.
     + **fields:** Subfields.
-    + **exec:** Pre and post execution hooks.
+    + **exec:** Pre and post execution hooks, as callables or their source.
+        See `FileFormat.hooks`.
+    + **checksum:** Checksum of previous fields the field contains.
+    + **offset_from:** Name or index of a previous field whose value is the
+        offset of the field's data from the start of the record.
+    + **bits:** Bit fields packed into the field. Integer types only.
+    + **switch:** Layouts of the field, selected by the value of a previous field.
+    + **align:** Alignment of the field's offset from the start of the record.
+    + **padding:** Number of bytes skipped before the field.
     """
-    _data_type: DataType = field(init=False)
+    _data_type: Union[DataType, None] = field(init=False)
+    _codec: Union[Codec, None] = field(init=False, default=None)
     _type: Union[str, None] = field(init=False, default=None)
     _value: Any = field(init=False, default=None)
     _size: Union[int, None] = field(init=False, default=None)
@@ -40,7 +61,13 @@ class FieldDescription():
     _terminator: Any = field(init=False, default=None)
     _is_null: bool = field(init=False, default=False)
     _fields: Union[Iterable[FieldDescription], None] = field(init=False, default=None)
-    _exec: Union[Dict[str, Callable], None] = field(init=False, default=None)
+    _exec: Union[Dict[str, Union[Callable, str]], None] = field(init=False, default=None)
+    _checksum: Union[Checksum, None] = field(init=False, default=None)
+    _offset_from: Union[str, int, None] = field(init=False, default=None)
+    _bits: Union[Tuple[BitField, ...], None] = field(init=False, default=None)
+    _switch: Union[Switch, None] = field(init=False, default=None)
+    _align: Union[int, None] = field(init=False, default=None)
+    _padding: int = field(init=False, default=0)
 
     name: Union[str, None] = None
     description: Union[str, None] = None
@@ -54,9 +81,15 @@ class FieldDescription():
         terminator: Any = None,
         is_null: bool = False,
         fields: Union[Iterable[FieldDescription], None] = None,
-        exec: Union[Dict[str, Callable], None] = None,
+        exec: Union[Dict[str, Union[Callable, str]], None] = None,
         name: Union[str, None] = None,
-        description: Union[str, None] = None
+        description: Union[str, None] = None,
+        checksum: Union[Checksum, Dict[str, Any], None] = None,
+        offset_from: Union[str, int, None] = None,
+        bits: Union[Iterable[Union[BitField, Dict[str, Any]]], None] = None,
+        switch: Union[Switch, Dict[str, Any], None] = None,
+        align: Union[int, None] = None,
+        padding: int = 0
     ):
         """
 
@@ -67,8 +100,26 @@ class FieldDescription():
         self._format = format
         self._terminator = terminator
         self._is_null = is_null
-        self._fields = fields
-        self._exec = exec
+        self._fields = None if fields is None else tuple(fields)
+        self._exec = None if exec is None else dict(exec)
+        self._checksum = (
+            Checksum(**checksum)
+            if isinstance(checksum, dict) else
+            checksum
+        )
+        self._offset_from = offset_from
+        self._bits = (
+            None
+            if bits is None else
+            tuple(BitField(**b) if isinstance(b, dict) else b for b in bits)
+        )
+        self._switch = (
+            Switch(**switch)
+            if isinstance(switch, dict) else
+            switch
+        )
+        self._align = align
+        self._padding = padding
         self.name = name
         self.description = description
 
@@ -81,6 +132,49 @@ class FieldDescription():
         if self.size == 0:
             raise ValueError('`size` can not be 0')
 
+        if self.checksum is not None:
+            if self.type is None:
+                self._type = 'u_int'
+
+            if self.type not in ['u_short', 'u_int', 'u_long', 'u_long_long']:
+                raise IncompatibleProperties(
+                    'Checksums must have an unsigned integer type',
+                    'type', 'checksum'
+                )
+
+        if (self.align is not None) and (self.align < 1):
+            raise ValueError('`align` must be positive')
+
+        if self.padding < 0:
+            raise ValueError('`padding` can not be negative')
+
+        if (self.offset_from is not None) and ((self.align is not None) or (self.padding > 0)):
+            raise IncompatibleProperties(
+                'Pointer fields are not part of the record layout',
+                'offset_from', 'align'
+            )
+
+        if self.exec is not None:
+            unknown = set(self.exec) - set(HOOKS)
+            if unknown:
+                raise ValueError(f'Unknown execution hooks {sorted(unknown)}, must be one of {HOOKS}')
+
+            if self.is_hook_sized and ((self.switch is not None) or (self.offset_from is not None)):
+                raise IncompatibleProperties(
+                    '`pre` hooks can not set the size of switch or pointer fields',
+                    'exec', 'switch' if self.switch is not None else 'offset_from'
+                )
+
+        if self.switch is not None:
+            if self.type not in [None, 'bytes']:
+                raise IncompatibleProperties(
+                    'Switch fields take their type from their layout',
+                    'type', 'switch'
+                )
+
+            if any(t is not None for t in [self.size, self.terminator, self.value]):
+                raise ValueError('Switch fields are terminated by their layout')
+
         if self.type is None:
             # default to `bytes`
             self._type = 'bytes'
@@ -99,13 +193,17 @@ class FieldDescription():
             self._data_type = DataType(self.type)
 
         except ValueError:
-            raise ValueError(f'Invalid data type {self.type}')
+            # check for registered codec
+            self._data_type = None
+            self._codec = get_codec(self.type)
+            if self.codec is None:
+                raise ValueError(f'Invalid data type {self.type}')
 
         # get size of type if known
         try:
             dsize = DataSize[self.data_type.name].value
 
-        except KeyError:
+        except (KeyError, AttributeError):
             # type does not have known size
             # check value and size are compatible
             if (self.value is not None) and (self.size is not None):
@@ -134,7 +232,12 @@ class FieldDescription():
             if t is not None
         ])
 
-        if nbr_terms == 0:
+        if (
+            (nbr_terms == 0)
+            and (not self.is_self_terminated)
+            and (self.switch is None)
+            and (not self.is_hook_sized)
+        ):
             raise ValueError(
                 'Termination condition is under specified. Must provide one of `size`, `terminator`, or `value`'
             )
@@ -149,14 +252,17 @@ class FieldDescription():
             (self.size is None)
             and (self.terminator is None)
             and (self.fields is None)
+            and (not self.is_self_terminated)
+            and (self.switch is None)
         ):
-            if self.value is None:
+            if self.value is not None:
+                # infer size from value
+                self._size = len(self.value)
+
+            elif not self.is_hook_sized:
                 # no way to determine termination of field
                 raise ValueError(f'Can not determine field termination for {self}')
 
-            # infer size from value
-            self._size = len(self.value)
-
         # set type specific options, if not declared
         if self.type == 'str':
             if (
@@ -171,6 +277,9 @@ class FieldDescription():
         # attempt to get data format
         if self.format is None:
             try:
+                if self.data_type is None:
+                    raise KeyError(self.type)
+
                 format = DataFormat[self.data_type.name]  # format for unpacking bytes [For more info see: https://docs.python.org/3/library/struct.html#format-strings]
 
             except KeyError:
@@ -181,6 +290,21 @@ class FieldDescription():
                 if self.format is None:
                     self._format = format.value
 
+        if self.bits is not None:
+            if self.type not in INTEGER_TYPES:
+                raise IncompatibleProperties(
+                    'Bit fields must be packed into an integer type',
+                    'type', 'bits'
+                )
+
+            for b in self.bits:
+                if b.offset + b.width > self.size * 8:
+                    raise ValueError(f'Bit field {b} does not fit in {self.size} bytes')
+
+            names = [b.name for b in self.bits]
+            if len(set(names)) != len(names):
+                raise ValueError('Bit field names must be unique')
+
         # if is_null, set missing values
         if self.is_null and (self.value is None):
             if self.size is None:
@@ -189,9 +313,34 @@ class FieldDescription():
             self._value = b'\x00' * self.size
 
     @property
-    def data_type(self) -> DataType:
+    def data_type(self) -> Union[DataType, None]:
+        """
+        :returns DataType | None: Data type, or `None` for codec types.
+        """
         return self._data_type
 
+    @property
+    def codec(self) -> Union[Codec, None]:
+        """
+        :returns Codec | None: Registered codec of the type, if any.
+        """
+        return self._codec
+
+    @property
+    def is_array(self) -> bool:
+        """
+        :returns bool: If the type is an array type.
+        """
+        return (self.type[0] == '[') and (self.type[-1] == ']')
+
+    @property
+    def is_self_terminated(self) -> bool:
+        """
+        :returns bool: If the size of the field is determined by its data.
+            i.e. The field is not an array of a codec type.
+        """
+        return (self.codec is not None) and (not self.is_array)
+
     @property
     def type(self) -> Union[str, None]:
         return self._type
@@ -227,3 +376,45 @@ class FieldDescription():
     @property
     def exec(self) -> Union[Dict[str, Callable], None]:
         return self._exec
+
+    @property
+    def is_hook_sized(self) -> bool:
+        """
+        :returns bool: If the size of the field may be set by its `pre` hook.
+        """
+        return (self.exec is not None) and (self.exec.get('pre') is not None)
+
+    @property
+    def checksum(self) -> Union[Checksum, None]:
+        return self._checksum
+
+    @property
+    def offset_from(self) -> Union[str, int, None]:
+        return self._offset_from
+
+    @property
+    def bits(self) -> Union[Tuple[BitField, ...], None]:
+        return self._bits
+
+    @property
+    def switch(self) -> Union[Switch, None]:
+        return self._switch
+
+    @property
+    def align(self) -> Union[int, None]:
+        return self._align
+
+    @property
+    def padding(self) -> int:
+        return self._padding
+
+    @property
+    def natural_align(self) -> int:
+        """
+        :returns int: Alignment of the type in a C struct.
+            The size of scalar numeric types, otherwise 1.
+        """
+        if self.type not in [*INTEGER_TYPES, 'float', 'double']:
+            return 1
+
+        return self.size
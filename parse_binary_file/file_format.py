@@ -1,29 +1,162 @@
 from __future__ import annotations
 import struct
-from typing import Union, Tuple, List, Dict, Any
-from dataclasses import dataclass
+import types
+import hashlib
+import operator
+import dataclasses
+from collections import namedtuple
+from typing import Union, Tuple, List, Dict, Iterable, Sequence, Callable, Any
+from dataclasses import dataclass, field
 
 from parse_binary_file.data_types import (
     DataFormat, DataType, EndianType, EndianFormat
 )
 
-from .field_description import FieldDescription
+from .field_description import FieldDescription, INTEGER_TYPES, HOOKS
+from .switch import Switch
+from .codec import get_codec
+from .checksum import ResolvedChecksum
+from .bitfield import BitField
+from .field import struct_code
+from .plan import ParsePlan, explain_format
+
+
+def _code_repr(code: types.CodeType) -> str:
+    """
+    :returns str: Representation of the bytecode, constants,
+        including nested code, and names used by a code object.
+    """
+    consts = (
+        _code_repr(c) if isinstance(c, types.CodeType) else repr(c)
+        for c in code.co_consts
+    )
+    return f'{code.co_code.hex()}({", ".join(consts)})[{", ".join(code.co_names)}]'
+
+
+def _function_repr(func: types.FunctionType) -> str:
+    """
+    :returns str: Representation of a function by its code,
+        default arguments, and the values of its closure.
+        Values of global names are not included.
+    """
+    cells = []
+    for cell in func.__closure__ or ():
+        try:
+            cells.append(_stable_repr(cell.cell_contents))
+
+        except ValueError:
+            # empty cell
+            cells.append('')
+
+    return (
+        f'{func.__module__}.{func.__qualname__}'
+        f'<{_code_repr(func.__code__)}>'
+        f'({_stable_repr(func.__defaults__)}, {_stable_repr(func.__kwdefaults__)}, [{", ".join(cells)}])'
+    )
+
+
+def _stable_repr(obj: Any) -> str:
+    """
+    :returns str: Representation of an object that is stable across processes.
+        Functions are represented by their code, see `_function_repr`.
+        Other callables are represented by their qualified name.
+    """
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        items = (
+            f'{f.name}={_stable_repr(getattr(obj, f.name))}'
+            for f in dataclasses.fields(obj)
+        )
+        return f'{type(obj).__name__}({", ".join(items)})'
+
+    if isinstance(obj, dict):
+        items = sorted(f'{_stable_repr(k)}: {_stable_repr(v)}' for k, v in obj.items())
+        return f'{{{", ".join(items)}}}'
+
+    if isinstance(obj, (list, tuple)):
+        return f'[{", ".join(map(_stable_repr, obj))}]'
+
+    if isinstance(obj, types.FunctionType):
+        return _function_repr(obj)
+
+    if callable(obj):
+        return f'{getattr(obj, "__module__", "")}.{getattr(obj, "__qualname__", "")}'
+
+    return repr(obj)
+
+
+def _compile_hook(
+    fd: FieldDescription,
+    kind: str,
+    hook: Union[Callable, str, None]
+) -> Union[Callable, None]:
+    """
+    :param fd: Description of the field.
+    :param kind: Kind of the hook, `'pre'` or `'post'`.
+    :param hook: Hook, or the source of an expression evaluating to it.
+    :returns Callable | None: Compiled hook.
+    :raises ValueError: If the hook is not callable.
+    """
+    if isinstance(hook, str):
+        code = compile(hook, f'<{kind} hook of {fd.name}>', 'eval')
+        hook = eval(code, {})
+
+    if (hook is not None) and (not callable(hook)):
+        raise ValueError(f'`{kind}` hook of {fd} is not callable')
+
+    return hook
 
 
 @dataclass
 class FileFormat():
     """
     Describes the format of a file.
+    Formats are not modified after they are created,
+    so they can be shared between threads.
     """
-    fields: List[FieldDescription]
+    fields: Sequence[FieldDescription]
     info: Union[Dict, None] = None
+    _checksums: Tuple[ResolvedChecksum, ...] = field(init=False, default=())
+    _checksum_cover: Tuple[Tuple[ResolvedChecksum, ...], ...] = field(
+        init=False,
+        default=()
+    )
+    _pointer_sources: Tuple[Union[int, None], ...] = field(
+        init=False,
+        default=()
+    )
+    _record_slots: Tuple[Tuple[str, Tuple[int, ...]], ...] = field(
+        init=False,
+        default=()
+    )
+    _bit_fields: Tuple[Tuple[int, BitField], ...] = field(init=False, default=())
+    _switch_sources: Tuple[Union[int, None], ...] = field(init=False, default=())
+    _gaps: Tuple[Tuple[int, int], ...] = field(init=False, default=())
+    _has_gaps: bool = field(init=False, default=False)
+    # compiled hooks can not be pickled, compiled again when unpickled
+    _hooks: Tuple[Tuple[Union[Callable, None], Union[Callable, None]], ...] = field(
+        init=False,
+        default=(),
+        repr=False,
+        compare=False
+    )
+    _has_hooks: bool = field(init=False, default=False, repr=False, compare=False)
+    # generated classes can not be pickled, created again when unpickled
+    _record_type: Any = field(init=False, default=None, repr=False, compare=False)
+    _record_values: Union[Callable[[Tuple], Tuple], None] = field(
+        init=False,
+        default=None,
+        repr=False,
+        compare=False
+    )
 
     def __post_init__(self):
+        self.fields = tuple(self.fields)
+
         # @todo: Allow use of -1 size for subfields if parent has known termination.
         # ensure only last field has size -1
         invalid_sizes = tuple(map(
             lambda f: (f.size is not None) and (f.size < 0),
-            self.fields
+            [f for f in self.fields if f.offset_from is None]
         ))
 
         if any(invalid_sizes[:-1]):
@@ -31,6 +164,464 @@ class FileFormat():
                 'A field other than the last has size less than 0, indicating to read until the end of the data stream'
             )
 
+        self._resolve_checksums()
+        self._resolve_pointers()
+        self._resolve_switches()
+        self._resolve_hooks()
+        self._resolve_layout()
+        self._resolve_records()
+        self._bit_fields = tuple(
+            (i, b)
+            for i, f in enumerate(self.fields) if f.bits is not None
+            for b in f.bits
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        state['_record_type'] = None
+        state['_record_values'] = None
+        state['_hooks'] = ()
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._resolve_hooks()
+        self._resolve_records()
+
+    def _field_index(self, name: Union[str, int]) -> int:
+        """
+        :returns int: Index of the field with the given name or index.
+        :raises KeyError: If the field does not exist or the name is ambiguous.
+        """
+        if isinstance(name, int):
+            if not (-len(self.fields) <= name < len(self.fields)):
+                raise KeyError(f'No field with index `{name}`')
+
+            return name % len(self.fields)
+
+        indices = [i for i, f in enumerate(self.fields) if f.name == name]
+        if len(indices) != 1:
+            raise KeyError(f'No unique field with name `{name}`')
+
+        return indices[0]
+
+    def _resolve_checksums(self):
+        """
+        Resolve the fields covered by checksums to their indices.
+
+        :raises ValueError: If a checksum covers itself or a later field.
+        """
+        checksums = []
+        for i, f in enumerate(self.fields):
+            if f.checksum is None:
+                continue
+
+            start = 0 if f.checksum.start is None else self._field_index(f.checksum.start)
+            end = i - 1 if f.checksum.end is None else self._field_index(f.checksum.end)
+            if not (0 <= start <= end < i):
+                raise ValueError(
+                    f'Checksum field must follow the fields it covers. {f}'
+                )
+
+            checksums.append(ResolvedChecksum(i, start, end, f.checksum))
+
+        self._checksums = tuple(checksums)
+        self._checksum_cover = tuple(
+            tuple(c for c in self._checksums if c.start <= i <= c.end)
+            for i in range(len(self.fields))
+        )
+
+    def _resolve_pointers(self):
+        """
+        Resolve the fields pointer fields take their offset from
+        to their indices.
+
+        :raises ValueError: If a pointer field does not follow its offset field.
+        """
+        sources = []
+        for i, f in enumerate(self.fields):
+            if f.offset_from is None:
+                sources.append(None)
+                continue
+
+            source = self._field_index(f.offset_from)
+            if source >= i:
+                raise ValueError(
+                    f'Pointer field must follow the field it takes its offset from. {f}'
+                )
+
+            sources.append(source)
+
+        self._pointer_sources = tuple(sources)
+
+    def _resolve_switches(self):
+        """
+        Resolve the fields switch fields switch on to their indices.
+
+        :raises ValueError: If a switch field does not follow the field
+            it switches on.
+        """
+        sources = []
+        for i, f in enumerate(self.fields):
+            if f.switch is None:
+                sources.append(None)
+                continue
+
+            source = self._field_index(f.switch.on)
+            if source >= i:
+                raise ValueError(
+                    f'Switch field must follow the field it switches on. {f}'
+                )
+
+            sources.append(source)
+
+        self._switch_sources = tuple(sources)
+
+    def _resolve_hooks(self):
+        """
+        Resolve the execution hooks of each field.
+        Hooks given as source are compiled once, here.
+        """
+        hooks = []
+        for f in self.fields:
+            exec = f.exec or {}
+            hooks.append(tuple(_compile_hook(f, kind, exec.get(kind)) for kind in HOOKS))
+
+        nested = any(
+            c.has_hooks
+            for f in self.fields if f.switch is not None
+            for c in [*f.switch.cases.values(), f.switch.default] if c is not None
+        )
+
+        self._hooks = tuple(hooks)
+        self._has_hooks = nested or any(h != (None, None) for h in hooks)
+
+    def _resolve_layout(self):
+        """
+        Resolve alignment and padding to the gap before each field,
+        and after the last field.
+        Gaps at static offsets are resolved to a number of bytes,
+        others are aligned while parsing.
+
+        Fields are aligned to their `align`, or if `align` is set in `info`
+        to the smaller of their natural alignment and `info['align']`.
+        Records are padded to the largest alignment of their fields,
+        as C structs are.
+        """
+        max_align = None if self.info is None else self.info.get('align')
+        if (max_align is not None) and (max_align < 1):
+            raise ValueError('`align` must be positive')
+
+        def gap(offset: Union[int, None], padding: int, align: int) -> Tuple[int, int]:
+            if offset is None:
+                return (padding, align)
+
+            return (padding + (-(offset + padding) % align), 1)
+
+        gaps = []
+        record_align = 1
+        offset = 0
+        for f in self.fields:
+            if f.offset_from is not None:
+                gaps.append((0, 1))
+                continue
+
+            align = f.align
+            if align is None:
+                align = 1 if max_align is None else min(f.natural_align, max_align)
+
+            record_align = max(record_align, align)
+            gaps.append(gap(offset, f.padding, align))
+            if offset is not None:
+                offset += gaps[-1][0]
+                if (f.size is None) or (f.size < 0) or f.is_self_terminated or f.is_hook_sized:
+                    offset = None
+
+                else:
+                    offset += f.size
+
+        gaps.append(gap(offset, 0, record_align))
+        self._gaps = tuple(gaps)
+        self._has_gaps = any(g != (0, 1) for g in gaps)
+
+    def _resolve_records(self):
+        """
+        Resolve the attributes of records to the indices of their fields,
+        and create the record class.
+        Fields with the same name share an attribute.
+        """
+        slots: Dict[str, List[int]] = {}
+        for i, f in enumerate(self.fields):
+            if f.name is not None:
+                slots.setdefault(f.name, []).append(i)
+
+        self._record_slots = tuple((name, tuple(indices)) for name, indices in slots.items())
+        self._record_type = namedtuple('Record', list(slots), rename=True)
+        self._record_values = self._values_getter()
+
+    @property
+    def record_type(self) -> type:
+        """
+        Record class, a `namedtuple` with an attribute for each named field,
+        in order of first occurrence.
+        Fields with the same name share an attribute whose value is a tuple
+        of their values.
+        Names that are not valid attributes are renamed by position,
+        e.g. `_0`.
+
+        :returns type: Record class.
+        """
+        return self._record_type
+
+    def _values_getter(self) -> Callable[[Tuple], Tuple]:
+        """
+        :returns Callable[[tuple], tuple]: Function returning the values of
+            the attributes of a record from the values of all fields.
+        """
+        if self._record_values is not None:
+            return self._record_values
+
+        indices = [ind for _, ind in self._record_slots]
+        if any(len(ind) > 1 for ind in indices):
+            def getter(values: Tuple) -> Tuple:
+                return tuple(
+                    values[ind[0]] if len(ind) == 1 else tuple(values[i] for i in ind)
+                    for ind in indices
+                )
+
+        elif len(indices) == 0:
+            def getter(values: Tuple) -> Tuple:
+                return ()
+
+        elif len(indices) == 1:
+            index = indices[0][0]
+
+            def getter(values: Tuple) -> Tuple:
+                return (values[index],)
+
+        else:
+            getter = operator.itemgetter(*(ind[0] for ind in indices))
+
+        return getter
+
+    def to_record(self, values: Any) -> Any:
+        """
+        :param values: Parsed `Data`, or tuple of the values of all fields.
+        :returns record_type: Record of the values.
+        """
+        if not isinstance(values, tuple):
+            values = values.value
+
+        return self.record_type._make(self._values_getter()(values))
+
+    def to_records(self, batch: Iterable[Any]) -> List[Any]:
+        """
+        :param batch: Parsed `Data`, or records.
+        :returns list[record_type]: Records.
+        """
+        record_type = self.record_type
+        make = record_type._make
+        getter = self._values_getter()
+        return [
+            item if isinstance(item, record_type) else make(getter(item.value))
+            for item in batch
+        ]
+
+    def to_tuples(self, batch: Iterable[Any]) -> List[Tuple]:
+        """
+        :param batch: Parsed `Data`, or records.
+        :returns list[tuple]: Values of the named fields of each item,
+            ordered as the attributes of `record_type`.
+        """
+        record_type = self.record_type
+        getter = self._values_getter()
+        return [
+            tuple(item) if isinstance(item, record_type) else getter(item.value)
+            for item in batch
+        ]
+
+    def to_dicts(self, batch: Iterable[Any]) -> List[Dict[str, Any]]:
+        """
+        :param batch: Parsed `Data`, or records.
+        :returns list[dict[str, Any]]: Dictionary of {name: value} for the
+            named fields of each item, as `Data.named_field_values`.
+        """
+        names = tuple(name for name, _ in self._record_slots)
+        return [dict(zip(names, values)) for values in self.to_tuples(batch)]
+
+    @property
+    def pointer_sources(self) -> Tuple[Union[int, None], ...]:
+        """
+        :returns tuple[int | None, ...]: Index of the field each field takes
+            its offset from, or `None` if it is not a pointer field.
+        """
+        return self._pointer_sources
+
+    @property
+    def switch_sources(self) -> Tuple[Union[int, None], ...]:
+        """
+        :returns tuple[int | None, ...]: Index of the field each field
+            switches on, or `None` if it is not a switch field.
+        """
+        return self._switch_sources
+
+    @property
+    def has_pointers(self) -> bool:
+        """
+        :returns bool: If any field is a pointer field.
+        """
+        return any(s is not None for s in self._pointer_sources)
+
+    @property
+    def hooks(self) -> Tuple[Tuple[Union[Callable, None], Union[Callable, None]], ...]:
+        """
+        Compiled execution hooks of each field, as tuples of (pre, post).
+        Hooks are called with `(data, fields)`, where `fields` is a `Data`
+        of the previous fields of the record, and `data` is a `memoryview`
+        valid only during the call.
+
+        The `pre` hook is called before the field is read, with the data of
+        the record before the field. If it returns an integer,
+        it is the size of the field in bytes for the record.
+        The `post` hook is called after the field is read, with the data of
+        the field. If it returns a value other than `None`,
+        it replaces the value of the field.
+
+        :returns tuple[tuple[Callable | None, Callable | None], ...]: Hooks.
+        """
+        return self._hooks
+
+    @property
+    def has_hooks(self) -> bool:
+        """
+        :returns bool: If any field, or field of a switch layout,
+            has an execution hook.
+        """
+        return self._has_hooks
+
+    @property
+    def gaps(self) -> Tuple[Tuple[int, int], ...]:
+        """
+        :returns tuple[tuple[int, int], ...]: Tuple of (padding, alignment)
+            before each field, followed by the gap after the last field.
+            Gaps at static offsets have an alignment of 1.
+        """
+        return self._gaps
+
+    @property
+    def has_gaps(self) -> bool:
+        """
+        :returns bool: If any field is preceded by padding or aligned,
+            or the record is padded.
+        """
+        return self._has_gaps
+
+    @property
+    def check_padding(self) -> bool:
+        """
+        :returns bool: If padding must be null, set by `check_padding` in `info`.
+            [Default: False]
+        """
+        return (self.info is not None) and bool(self.info.get('check_padding', False))
+
+    def skip(self, index: int, offset: int, base: int = 0) -> int:
+        """
+        :param index: Index of a field, or the number of fields
+            for the padding after the last field.
+        :param offset: Offset after the previous field.
+        :param base: Offset the record starts at. [Default: 0]
+        :returns int: Offset of the field, after its gap.
+        """
+        padding, align = self._gaps[index]
+        offset += padding
+        if align > 1:
+            offset += (base - offset) % align
+
+        return offset
+
+    @property
+    def struct_format(self) -> Union[str, None]:
+        """
+        Format of a single `struct` decoding the values of all fields
+        of a fixed layout at once, skipping padding.
+
+        :returns str | None: Format, or `None` if a field can not be decoded
+            by the format as by `field.value_decoder`. e.g. Fields that are strings,
+            arrays, validated, switched, pointers, checksums, or have hooks,
+            or the format checks its padding.
+        """
+        if self.has_pointers or self._checksums or self._has_hooks or (not self.size):
+            return None
+
+        if self.check_padding and self._has_gaps:
+            # padding is checked while parsing
+            return None
+
+        orders = set()
+        codes = []
+        for f, (padding, _) in zip(self.fields, self._gaps):
+            if padding:
+                codes.append(f'{padding}x')
+
+            try:
+                order, code = struct_code(f)
+
+            except ValueError:
+                return None
+
+            if order is not None:
+                orders.add(order)
+
+            codes.append(code)
+
+        if len(orders) > 1:
+            return None
+
+        if self._gaps[-1][0]:
+            codes.append(f'{self._gaps[-1][0]}x')
+
+        # native byte order, without native alignment
+        order = orders.pop() if orders else '@'
+        fmt = ('=' if order == '@' else order) + ''.join(codes)
+        if struct.calcsize(fmt) != self.size:
+            return None
+
+        return fmt
+
+    def explain(self) -> ParsePlan:
+        """
+        Resolve how records are parsed, including static offsets and sizes,
+        how each field is located and decoded, and which fields prevent
+        records from being decoded by a single struct.
+        Print the plan to show it as a table.
+
+        :returns ParsePlan: Plan of the format.
+        """
+        return explain_format(self)
+
+    @property
+    def bit_fields(self) -> Tuple[Tuple[int, BitField], ...]:
+        """
+        :returns tuple[tuple[int, BitField], ...]: Tuple of
+            (index of the integer field, bit field) for each bit field.
+        """
+        return self._bit_fields
+
+    @property
+    def checksums(self) -> Tuple[ResolvedChecksum, ...]:
+        """
+        :returns tuple[ResolvedChecksum, ...]: Checksums of the format.
+        """
+        return self._checksums
+
+    @property
+    def checksum_cover(self) -> Tuple[Tuple[ResolvedChecksum, ...], ...]:
+        """
+        :returns tuple[tuple[ResolvedChecksum, ...], ...]: Checksums covering
+            each field, by index.
+        """
+        return self._checksum_cover
+
     def __getitem__(
         self,
         name: Union[int, str]
@@ -87,7 +678,20 @@ class FileFormat():
 
         fields = []
         for f in desc:
-            kind: str = f['type'] if ('type' in f) else 'bytes'
+            # options are added to a copy, the description is not modified
+            f = dict(f)
+            if isinstance(f.get('switch'), dict):
+                f = {**f, 'switch': FileFormat._switch_from_dict(f['switch'], desc, info, defaults)}
+
+            if 'type' in f:
+                kind: str = f['type']
+
+            elif 'checksum' in f:
+                kind = 'u_int'
+
+            else:
+                kind = 'bytes'
+
             if (defaults is not None) and (kind in defaults):
                 d_opts = defaults[kind]
 
@@ -124,7 +728,7 @@ class FileFormat():
                 f = {**d_opts, **f}
 
             # set format
-            if 'format' not in f:
+            if ('format' not in f) and (get_codec(kind) is None):
                 if kind in ['bytes', 'str']:
                     if (info is not None) and ('encoding' in info):
                         f['format'] = info['encoding']
@@ -155,11 +759,15 @@ class FileFormat():
 
                     b_fmt = EndianFormat[byte_order.name]
                     d_fmt = DataFormat[d_type.name]
-                    fmt = f'{b_fmt}{d_fmt}'
+                    fmt = f'{b_fmt.value}{d_fmt.value}'
 
                     f['format'] = fmt
 
             for tf in ['terminator', 'value']:
+                if (tf in f) and (f[tf] is not None) and (get_codec(kind) is not None):
+                    # codecs only decode, so values can not be encoded or compared
+                    raise ValueError(f'Fields with codec type `{kind}` can not have a `{tf}`')
+
                 if (tf in f) and (type(f[tf]) is not bytes):
                     if kind in ['bytes', 'str']:
                         f[tf] = bytes(f[tf], f['format'])
@@ -172,6 +780,131 @@ class FileFormat():
 
         return FileFormat(fields, info=info)
 
+    @staticmethod
+    def _switch_from_dict(
+        switch: Dict[str, Any],
+        desc: Tuple[dict],
+        info: Union[Dict[str, Any], None] = None,
+        defaults: Union[Dict[str, Any], None] = None
+    ) -> Switch:
+        """
+        Create a `Switch` from a dictionary whose layouts are lists of
+        dictionaries describing fields.
+        Keys of cases switching on an integer field are converted to integers,
+        as keys of JSON objects are strings.
+
+        :param switch: Dictionary describing the switch.
+        :param desc: Dictionaries describing the fields of the format.
+        :param info: Dictionary of file info.
+        :param defaults: Dictionary of default options to use.
+        :returns Switch: Switch described.
+        """
+        def layout(case: Any) -> FileFormat:
+            if isinstance(case, FileFormat):
+                return case
+
+            return FileFormat.from_dicts(case, info=info, defaults=defaults)
+
+        on = switch['on']
+        source = desc[on] if isinstance(on, int) else next(
+            (f for f in desc if f.get('name') == on),
+            {}
+        )
+
+        is_integer = source.get('type') in INTEGER_TYPES
+        cases = {
+            (int(k) if is_integer and isinstance(k, str) else k): layout(case)
+            for k, case in switch['cases'].items()
+        }
+
+        default = switch.get('default')
+        return Switch(on, cases, None if default is None else layout(default))
+
+    @property
+    def size(self) -> Union[int, None]:
+        """
+        :returns int | None: Size of the format in bytes, including padding,
+            if all fields have a known, positive size, otherwise `None`.
+            Pointer fields are not included.
+        """
+        size = 0
+        for f, (padding, _) in zip(self.fields, self._gaps):
+            if f.offset_from is not None:
+                # data is outside of the record
+                continue
+
+            if (f.size is None) or (f.size < 0) or f.is_hook_sized:
+                return None
+
+            size += padding + f.size
+
+        return size + self._gaps[-1][0]
+
+    def fingerprint(self) -> str:
+        """
+        :returns str: Hash identifying the format.
+            Equal formats have equal fingerprints across processes.
+            Functions, such as hooks, are identified by their code,
+            defaults, and closure, but not the global names they use.
+        """
+        desc = f'{_stable_repr(self.fields)}{_stable_repr(self.info)}'
+        return hashlib.sha256(desc.encode('utf-8')).hexdigest()
+
+    @property
+    def offsets(self) -> Tuple[Union[int, None], ...]:
+        """
+        :returns tuple[int | None, ...]: Offset of each field from the start
+            of the record if it is known before parsing, otherwise `None`.
+            Offsets are unknown after a field without a static size,
+            and for pointer fields.
+        """
+        offsets = []
+        offset = 0
+        for f, (padding, _) in zip(self.fields, self._gaps):
+            if f.offset_from is not None:
+                offsets.append(None)
+                continue
+
+            if offset is not None:
+                # gaps at static offsets are resolved
+                offset += padding
+
+            offsets.append(offset)
+            if (
+                (offset is None)
+                or (f.size is None)
+                or (f.size < 0)
+                or f.is_self_terminated
+                or f.is_hook_sized
+            ):
+                offset = None
+
+            else:
+                offset += f.size
+
+        return tuple(offsets)
+
+    @property
+    def prefix(self) -> bytes:
+        """
+        :returns bytes: Expected values of the leading fields
+            that have an expected value.
+            Padding between the fields is included if it is checked to be null,
+            otherwise the prefix ends before the first padded field.
+        """
+        prefix = b''
+        for f, (padding, align) in zip(self.fields, self._gaps):
+            if (not isinstance(f.value, bytes)) or (f.offset_from is not None):
+                break
+
+            if (align != 1) or (padding and not self.check_padding):
+                # padding bytes are not known
+                break
+
+            prefix += bytes(padding) + f.value
+
+        return prefix
+
     def keys(self) -> frozenset[str]:
         """
         :returns frozenset[str]: Keys of named fields.
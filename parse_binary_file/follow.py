@@ -0,0 +1,163 @@
+"""
+Follow files that records are appended to.
+"""
+from __future__ import annotations
+import os
+import json
+import time
+from typing import Union, Iterator, TYPE_CHECKING
+from dataclasses import dataclass, asdict
+
+from .errors import IncompleteRecord
+from .metrics import ParseMetrics
+
+if TYPE_CHECKING:
+    from .parser import Parser, ErrorPolicy
+    from .data import Data
+
+
+@dataclass
+class Checkpoint():
+    """
+    Position of a consumer following a file.
+
+    Properties:
+    + **offset:** Offset of the next record to parse.
+    + **records:** Number of records consumed.
+    + **fingerprint:** Fingerprint of the file format.
+    """
+    offset: int = 0
+    records: int = 0
+    fingerprint: str = ''
+
+    @staticmethod
+    def load(path: Union[str, os.PathLike]) -> Checkpoint:
+        """
+        :param path: Path to the checkpoint file.
+        :returns Checkpoint: Loaded checkpoint.
+        """
+        with open(path, 'r') as f:
+            return Checkpoint(**json.load(f))
+
+    def save(self, path: Union[str, os.PathLike]):
+        """
+        Save the checkpoint atomically,
+        so an interrupted save leaves the previous checkpoint intact.
+
+        :param path: Path to the checkpoint file.
+        """
+        tmp_path = f'{os.fspath(path)}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(asdict(self), f)
+
+        os.replace(tmp_path, path)
+
+
+def follow_file(
+    parser: Parser,
+    path: Union[str, os.PathLike],
+    checkpoint: Union[str, os.PathLike, None] = None,
+    poll_interval: float = 0.01,
+    timeout: Union[float, None] = None,
+    errors: Union[ErrorPolicy, str] = 'raise',
+    sync: Union[bytes, None] = None,
+    metrics: Union[ParseMetrics, None] = None
+) -> Iterator[Data]:
+    """
+    Iterate over records as they are appended to a file.
+    See `Parser.follow`.
+    """
+    from .parser import ErrorPolicy, RECORD_ERRORS
+
+    errors = ErrorPolicy(errors)
+    if errors is ErrorPolicy.RESYNC:
+        sync = parser._sync_marker(sync)
+
+    fingerprint = parser.format.fingerprint()
+    state = Checkpoint(fingerprint=fingerprint)
+    if (checkpoint is not None) and os.path.exists(checkpoint):
+        state = Checkpoint.load(checkpoint)
+        if state.fingerprint != fingerprint:
+            raise ValueError('Checkpoint was created with a different file format')
+
+    saved = state.offset
+    with open(path, 'rb', buffering=0) as f:
+        if os.fstat(f.fileno()).st_size < state.offset:
+            raise ValueError('File is smaller than the checkpoint offset')
+
+        f.seek(state.offset)
+        base = state.offset  # offset of the start of pending data
+        pending = b''
+        last_read = time.monotonic()
+        try:
+            while True:
+                chunk = f.read(parser.buffer_size)
+                if chunk:
+                    pending += chunk
+                    last_read = time.monotonic()
+
+                pos = 0
+                while pos < len(pending):
+                    try:
+                        data, stop = parser._parse_buffer(pending, pos, len(pending), strict=True)
+
+                    except IncompleteRecord:
+                        # wait for the rest of the record
+                        break
+
+                    except RECORD_ERRORS as err:
+                        if errors is ErrorPolicy.RAISE:
+                            raise err
+
+                        if errors is ErrorPolicy.SKIP:
+                            stop = parser._record_end(pending, pos, len(pending))
+                            if stop == len(pending):
+                                # end of record not yet written
+                                break
+
+                        else:
+                            stop = pending.find(sync, pos + 1)
+                            if stop < 0:
+                                # keep a possibly partial marker
+                                stop = max(pos + 1, len(pending) - len(sync) + 1)
+
+                        if metrics is not None:
+                            metrics.errors += 1
+                            metrics.skipped.append((base + pos, base + stop))
+
+                        pos = stop
+                        state.offset = base + pos
+                        continue
+
+                    if stop == pos:
+                        raise ValueError(f'Record at offset {base + pos} is empty')
+
+                    if metrics is not None:
+                        metrics.records += 1
+                        metrics.bytes += stop - pos
+
+                    pos = stop
+                    # records are consumed once the next is requested,
+                    # or the iterator is closed
+                    state.offset = base + pos
+                    state.records += 1
+                    yield data
+
+                pending = pending[pos:]
+                base += pos
+                if (checkpoint is not None) and (state.offset != saved):
+                    state.save(checkpoint)
+                    saved = state.offset
+
+                if len(chunk) == parser.buffer_size:
+                    # more data is likely available
+                    continue
+
+                if (timeout is not None) and (time.monotonic() - last_read >= timeout):
+                    return
+
+                time.sleep(poll_interval)
+
+        finally:
+            if (checkpoint is not None) and (state.offset != saved):
+                state.save(checkpoint)
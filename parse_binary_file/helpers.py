@@ -18,7 +18,7 @@ def read_until(
     word = b''
     while True:
         c = stream.read(1)
-        if c is None:
+        if not c:
             # end of file
             break
 
@@ -30,3 +30,73 @@ def read_until(
             break
 
     return word
+
+
+def at_eof(stream: io.IOBase) -> bool:
+    """
+    Check if a stream is exhausted without consuming any data.
+
+    :param stream: Stream to check. Must be peekable or seekable.
+    :returns bool: Whether the end of the stream was reached.
+    :raises TypeError: If the stream can neither be peeked nor seeked.
+    """
+    if hasattr(stream, 'peek'):
+        return (len(stream.peek(1)) == 0)
+
+    if stream.seekable():
+        pos = stream.tell()
+        c = stream.read(1)
+        stream.seek(pos)
+        return (len(c) == 0)
+
+    raise TypeError('Can not check end of stream for unpeekable and unseekable streams')
+
+
+class PushbackReader(io.BufferedIOBase):
+    """
+    Wraps a stream, tracking the position and allowing data to be unread.
+
+    :param stream: Stream to wrap.
+    :param position: Position of the stream. [Default: 0]
+    """
+    def __init__(self, stream: io.IOBase, position: int = 0):
+        super().__init__()
+        self.stream = stream
+        self.position = position
+        self._pending = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        if (size is None) or (size < 0):
+            data = self._pending + self.stream.read()
+            self._pending = b''
+
+        elif len(self._pending) >= size:
+            data = self._pending[:size]
+            self._pending = self._pending[size:]
+
+        else:
+            data = self._pending + self.stream.read(size - len(self._pending))
+            self._pending = b''
+
+        self.position += len(data)
+        return data
+
+    def read1(self, size: int = -1) -> bytes:
+        return self.read(size)
+
+    def peek(self, size: int = 0) -> bytes:
+        data = self.read(max(size, 1))
+        self.unread(data)
+        return data
+
+    def unread(self, data: bytes):
+        """
+        Push data back to the front of the stream.
+
+        :param data: Data to push back.
+        """
+        self._pending = data + self._pending
+        self.position -= len(data)
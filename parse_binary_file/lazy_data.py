@@ -0,0 +1,224 @@
+"""
+Data backed by an open file, read as fields are accessed.
+"""
+from __future__ import annotations
+import io
+from typing import Union, Tuple, List, Dict, Any, TYPE_CHECKING
+
+from .field import Field
+from .data import Data
+from .errors import ChecksumMismatch
+
+if TYPE_CHECKING:
+    from .parser import Parser, Buffer
+
+
+class LazyData(Data):
+    """
+    Data whose fields are read and decoded when first accessed.
+    Offsets of fields with static offsets are known in advance.
+    Fields following a variable length field are located by scanning
+    only up to the accessed field.
+    Hooks of a field are called when it is located or parsed,
+    parsing the fields before it.
+
+    Keeps the underlying file open until closed.
+
+    :param parser: Parser used to parse fields.
+    :param buffer: Buffer containing the data.
+    :param file: File the buffer is mapped from, closed with the data.
+    """
+    def __init__(
+        self,
+        parser: Parser,
+        buffer: Buffer,
+        file: Union[io.IOBase, None] = None
+    ):
+        super().__init__(None)
+        self._parser = parser
+        self._buffer = buffer
+        self._file = file
+        self._offsets = list(parser.format.offsets)
+        self._stops: Dict[int, int] = {}
+        self._parsed: Dict[int, Tuple[Field, bytes]] = {}
+
+    def __enter__(self) -> LazyData:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._parser.format.fields)
+
+    def close(self):
+        """
+        Close the underlying file.
+        Fields that have already been accessed remain available.
+        """
+        if hasattr(self._buffer, 'close'):
+            self._buffer.close()
+
+        if self._file is not None:
+            self._file.close()
+
+    def _span(self, index: int) -> Tuple[int, int]:
+        """
+        Locate a field in the buffer, locating previous fields as needed.
+
+        :param index: Index of a non-pointer field.
+        :returns tuple[int, int]: Tuple of (start, stop) offsets.
+        """
+        fmt = self._parser.format
+        if self._offsets[index] is None:
+            # start is the stop of the previous non-pointer field
+            prev = index - 1
+            while (prev >= 0) and (fmt.fields[prev].offset_from is not None):
+                prev -= 1
+
+            self._offsets[index] = fmt.skip(index, 0 if (prev < 0) else self._span(prev)[1])
+
+        start = self._offsets[index]
+        if index not in self._stops:
+            source = fmt.switch_sources[index]
+            if source is None:
+                size = None
+                if fmt.fields[index].is_hook_sized:
+                    size = self._parser._pre_size(index, self._buffer, 0, start, self._previous(index))
+
+                self._stops[index] = self._parser._locate(
+                    self._buffer,
+                    start,
+                    len(self._buffer),
+                    fmt.fields[index],
+                    size=size
+                )
+
+            else:
+                parser = self._parser._case_parser(fmt.fields[index], self._parse(source)[0].value)
+                self._stops[index] = parser._record_stop(self._buffer, start, len(self._buffer))
+
+        return (start, self._stops[index])
+
+    def _parse(self, index: int) -> Tuple[Field, bytes]:
+        """
+        Parse a field, if not already parsed.
+
+        :param index: Index of the field.
+        :returns tuple[Field, bytes]: Tuple of (field, data).
+        """
+        if index in self._parsed:
+            return self._parsed[index]
+
+        fmt = self._parser.format
+        fd = fmt.fields[index]
+        source = fmt.pointer_sources[index]
+        if source is not None:
+            buffer = self._buffer
+
+            def read_block(offset: int) -> bytes:
+                stop = self._parser._locate(buffer, offset, len(buffer), fd, strict=True)
+                return buffer[offset:stop]
+
+            parsed = self._parser._pointer_field(
+                fd,
+                self._parse(source)[0].value,
+                read_block,
+                {}
+            )
+
+        elif fmt.switch_sources[index] is not None:
+            start, stop = self._span(index)
+            f, _ = self._parser._switch_field(
+                fd,
+                self._parse(fmt.switch_sources[index])[0].value,
+                self._buffer,
+                start,
+                stop
+            )
+
+            parsed = (f, self._buffer[start:stop])
+
+        else:
+            start, stop = self._span(index)
+            f_data = self._buffer[start:stop]
+            parsed = (self._parser._field(f_data, fd), f_data)
+
+        if fd.checksum is not None:
+            self._verify_checksum(index, parsed[0])
+
+        if fmt.hooks[index][1] is not None:
+            self._parser._post_value(index, parsed[0], parsed[1], self._previous(index))
+
+        self._parsed[index] = parsed
+        return parsed
+
+    def _previous(self, index: int) -> Tuple[Field, ...]:
+        """
+        :param index: Index of a field.
+        :returns tuple[Field, ...]: Fields before the field, parsing them as needed.
+        """
+        return tuple(self._parse(i)[0] for i in range(index))
+
+    def _verify_checksum(self, index: int, f: Field):
+        """
+        Verify a checksum field against the data of the fields it covers.
+
+        :raises ChecksumMismatch: If the checksum does not match.
+        """
+        c = next(c for c in self._parser.format.checksums if c.index == index)
+        value = c.checksum.initial
+        for i in range(c.start, c.end + 1):
+            if self._parser.format.pointer_sources[i] is None:
+                start, stop = self._span(i)
+                value = c.checksum.function(self._buffer[start:stop], value)
+
+            else:
+                value = c.checksum.function(self._parse(i)[1], value)
+
+        if f.value != value:
+            raise ChecksumMismatch(f'Checksum {value:#x} does not match {f}', f)
+
+    def __getitem__(
+        self,
+        name: Union[int, str]
+    ) -> Union[Field, Tuple[Field, ...]]:
+        """
+        Gets a field by index or name, reading it if needed.
+        If by name and multiple fields with the same name exist,
+        returns a tuple with them in order.
+
+        :raises KeyError: If given an invalid field name.
+        """
+        if isinstance(name, int):
+            if not (-len(self) <= name < len(self)):
+                raise IndexError('Field index out of range')
+
+            return self._parse(name % len(self))[0]
+
+        if isinstance(name, str):
+            indices = [
+                i for i, fd in enumerate(self._parser.format.fields)
+                if fd.name == name
+            ]
+
+            if len(indices) == 0:
+                raise KeyError(f'No field with name `{name}`')
+
+            if len(indices) == 1:
+                return self._parse(indices[0])[0]
+
+            return tuple(self._parse(i)[0] for i in indices)
+
+        else:
+            raise TypeError('Invalid index type')
+
+    @property
+    def fields(self) -> Tuple[Field]:
+        """
+        :returns tuple[Field]: Tuple of fields. Reads all fields.
+        """
+        if self._fields is None:
+            self._fields = tuple(self._parse(i)[0] for i in range(len(self)))
+
+        return self._fields
@@ -0,0 +1,44 @@
+"""
+Metrics collected while parsing.
+"""
+from __future__ import annotations
+from typing import Tuple, List
+from dataclasses import dataclass, field
+
+
+@dataclass
+class ParseMetrics():
+    """
+    Counters for parsing records.
+
+    Properties:
+    + **records:** Number of records parsed.
+    + **filtered:** Number of records skipped because they did not match predicates.
+    + **bytes:** Number of bytes in parsed records.
+    + **errors:** Number of errors recovered from.
+    + **skipped:** List of (start, end) offset ranges skipped due to errors.
+    """
+    records: int = 0
+    filtered: int = 0
+    bytes: int = 0
+    errors: int = 0
+    skipped: List[Tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def skipped_bytes(self) -> int:
+        """
+        :returns int: Total number of bytes skipped.
+        """
+        return sum(end - start for start, end in self.skipped)
+
+    def merge(self, other: ParseMetrics):
+        """
+        Add the counts of other metrics to these.
+
+        :param other: Metrics to add.
+        """
+        self.records += other.records
+        self.filtered += other.filtered
+        self.bytes += other.bytes
+        self.errors += other.errors
+        self.skipped.extend(other.skipped)
@@ -1,29 +1,201 @@
 import io
+import os
+import mmap
+import struct
 import logging
-from typing import Union, Tuple, List
+from enum import Enum
+from typing import Union, Tuple, List, Dict, Any, Callable, Iterable, Iterator, Sequence
 
-from .helpers import read_until
+from .helpers import read_until, at_eof, PushbackReader
 from .file_format import FileFormat
 from .field_description import FieldDescription
-from .field import Field
-from .data import Data
+from .field import Field, value_decoder
+from .data import Data, OffsetMap
+from .lazy_data import LazyData
+from .errors import IncompleteRecord, ValuesDoNotMatch, ChecksumMismatch
+from .prefetch import PrefetchReader, DEFAULT_BUFFER_SIZE
+from .cache import ParseCache
+from .compression import COMPRESSIONS, file_compression, open_decompressed
+from .metrics import ParseMetrics
+from .columns import Columns
+from .plan import ParsePlan
+from .aggregate import Summary
+from .pool import BufferPool, DEFAULT_POOL_SIZE
+from .editor import Editor
+
+
+Buffer = Union[bytes, bytearray, mmap.mmap]
+BUFFER_TYPES = (bytes, bytearray, mmap.mmap)
+
+
+class RetainRaw(Enum):
+    """
+    Policies for retaining the original bytes of parsed fields.
+    """
+    ALWAYS = 'always'
+    NEVER = 'never'
+    INVALID = 'invalid'  # only for fields whose validation failed
+
+
+class ErrorPolicy(Enum):
+    """
+    Policies for handling invalid records while iterating over records.
+    """
+    RAISE = 'raise'
+    SKIP = 'skip'  # skip to the end of the invalid record
+    RESYNC = 'resync'  # scan forward to the next sync marker
+
+
+# errors caused by invalid data
+RECORD_ERRORS = (ValueError, struct.error)
+
+SCAN_SIZE = 1 << 16  # bytes read at a time when scanning streams
+
+
+def _reads_to_end(format: FileFormat) -> bool:
+    """
+    :returns bool: If a field of the format, or of its switch layouts,
+        is read until the end of the data.
+    """
+    for f in format.fields:
+        if (f.size is not None) and (f.size < 0):
+            return True
+
+        if f.switch is not None:
+            cases = [*f.switch.cases.values(), f.switch.default]
+            if any(_reads_to_end(c) for c in cases if c is not None):
+                return True
+
+    return False
+
+
+def _call_hook(
+    hook: Callable[[memoryview, Data], Any],
+    data: Buffer,
+    start: int,
+    stop: int,
+    fields: Sequence[Field]
+) -> Any:
+    """
+    Call an execution hook with a view of data, released after the call.
+
+    :param hook: Hook to call.
+    :param data: Buffer containing the data.
+    :param start: Offset the data starts at.
+    :param stop: Offset the data stops at.
+    :param fields: Previous fields of the record.
+    :returns Any: Result of the hook.
+    """
+    view = memoryview(data)[start:stop]
+    try:
+        return hook(view, Data(tuple(fields)))
+
+    finally:
+        view.release()
 
 
 class Parser():
     """
     Parses a file given a certain format.
+    Parsing does not modify the parser or its format,
+    so a parser can be used from many threads at once.
+    Its read buffer pool and cache are safe to share.
+    `ParseMetrics` are not, use one per thread.
 
+    :param format: Format of the files.
+    :param read_ahead: Number of buffers to read ahead in a background thread
+        when parsing files by path. See `prefetch.PrefetchReader`.
+        [Default: 0, no read ahead]
+    :param buffer_size: Size of read buffers in bytes. [Default: 1 MiB]
+    :param retain_raw: When to retain the original bytes of fields.
+        Values are from `RetainRaw`.
+        With `'invalid'` the original bytes are only retained by the field
+        attached to the `ValuesDoNotMatch` error raised on failed validation.
+        [Default: 'always']
+    :param cache: Cache for `parse_file`. [Default: None, no caching]
+    :param pool_size: Number of read buffers kept for reuse when iterating
+        over records of streams. See `pool.BufferPool`. [Default: 2]
+    :param compression: Compression of files opened by path.
+        With `'auto'` compression is detected by the file's magic number.
+        With `None` files are read as they are.
+        Otherwise one of ['gzip', 'bz2', 'xz']. [Default: 'auto']
     :raises TypeError: If the type of the stream is unknown.
+    :raises ValueError: If the compression is unknown.
     """
-    def __init__(self, format: FileFormat):
+    def __init__(
+        self,
+        format: FileFormat,
+        read_ahead: int = 0,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        retain_raw: Union[RetainRaw, str] = RetainRaw.ALWAYS,
+        cache: Union[ParseCache, None] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        compression: Union[str, None] = 'auto'
+    ):
+        if (compression != 'auto') and (compression is not None) and (compression not in COMPRESSIONS):
+            raise ValueError(f'Unknown compression `{compression}`, must be one of {COMPRESSIONS}')
+
         # set field options
         self.format = format
+        self.read_ahead = read_ahead
+        self.buffer_size = buffer_size
+        self.retain_raw = RetainRaw(retain_raw)
+        self.cache = cache
+        self.pool = BufferPool(pool_size)
+        self.compression = compression
+        self._compile()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # decoders can not be pickled
+        state = dict(self.__dict__)
+        state['_value_decoders'] = None
+        state['_case_parsers'] = {}
+        state['_record_struct'] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._compile()
 
-    def parse(self, stream: Union[io.IOBase, bytes]) -> Data:
+    def _compile(self):
+        """
+        Create the decoders of the format, and the parsers of its switch layouts.
+        They are only created here, so parsing does not modify the parser.
+        """
+        self._value_decoders: Tuple[Callable[[bytes], Any], ...] = tuple(
+            map(value_decoder, self.format.fields)
+        )
+
+        fmt = self.format.struct_format
+        self._record_struct: Union[struct.Struct, None] = None if fmt is None else struct.Struct(fmt)
+        # size of records decoded by the record struct
+        self._record_size: Union[int, None] = None if fmt is None else self.format.size
+
+        self._case_parsers: Dict[int, Parser] = {}
+        for fd in self.format.fields:
+            if fd.switch is None:
+                continue
+
+            cases = [*fd.switch.cases.values(), fd.switch.default]
+            for case in cases:
+                if (case is not None) and (id(case) not in self._case_parsers):
+                    self._case_parsers[id(case)] = Parser(case, retain_raw=self.retain_raw)
+
+    def explain(self) -> ParsePlan:
+        """
+        Resolve how records are parsed. See `FileFormat.explain`.
+        Fields are only decoded as planned when parsing with `as_records`,
+        otherwise each field is created with `Field.from_data`.
+
+        :returns ParsePlan: Plan of the format.
+        """
+        return self.format.explain()
+
+    def parse(self, stream: Union[io.IOBase, Buffer]) -> Data:
         """
         Parse data into fields from the provided stream.
         """
-        if isinstance(stream, bytes):
+        if isinstance(stream, BUFFER_TYPES):
             return self._parse_bytes(stream)
 
         elif isinstance(stream, io.IOBase):
@@ -32,65 +204,1878 @@ class Parser():
         else:
             raise TypeError('Can not parse stream of given type')
 
-    def _parse_io(self, stream: io.IOBase) -> Data:
-        fields: List[Field] = []
-        for fd in self.format.fields:
-            if fd.size is not None:
-                if fd.size > 0:
-                    f = Field.from_data(stream.read(fd.size), fd)
+    def reparse(
+        self,
+        data: Data,
+        buffer: Buffer,
+        changed: Sequence[Tuple[int, int]]
+    ) -> Data:
+        """
+        Parse a buffer again after parts of it changed, using the offsets of
+        the fields recorded when `data` was parsed with `parse`.
+        Fields whose data did not change and did not move are kept,
+        others are decoded again. See `reparse.reparse_buffer`.
+
+        :param data: Data previously parsed from a buffer with `parse`.
+        :param buffer: Buffer containing the changed data.
+        :param changed: Ranges of offsets, as (start, stop), whose bytes
+            may differ from the previous buffer at the same offsets.
+        :returns Data: Parsed data.
+        """
+        from .reparse import reparse_buffer
+        return reparse_buffer(self, data, buffer, changed)
+
+    def parse_file(
+        self,
+        path: Union[str, os.PathLike],
+        lazy: bool = False
+    ) -> Data:
+        """
+        Parse a file.
+        If the parser has a cache, cached data is returned if available.
+
+        :param path: Path to the file.
+        :param lazy: Return a `LazyData` which reads and decodes fields
+            when they are first accessed. The file remains open until
+            the data is closed. [Default: False]
+        :returns Data: Parsed data.
+        """
+        if lazy:
+            return self._parse_lazy(path)
+
+        if self.cache is not None:
+            # data differs when raw bytes are not retained
+            tag = '' if (self.retain_raw is RetainRaw.ALWAYS) else self.retain_raw.value
+            if self.compression != 'auto':
+                # data differs when compressed files are read as they are
+                tag += f':{self.compression}'
+
+            data = self.cache.get(path, self.format, tag=tag)
+            if data is None:
+                data = self._parse_path(path)
+                self.cache.put(path, self.format, data, tag=tag)
+
+            return data
+
+        return self._parse_path(path)
+
+    def parse_files(
+        self,
+        paths: Iterable[Union[str, os.PathLike]],
+        executor: Union[str, None] = 'thread',
+        max_workers: Union[int, None] = None,
+        max_in_flight: Union[int, None] = None
+    ) -> Iterator[Data]:
+        """
+        Parse many files concurrently, sharing this parser between threads.
+        The number of files being read at once is bounded by `max_in_flight`.
+        See `threads.parse_files`.
+
+        :param paths: Paths to the files.
+        :param executor: `'thread'` to parse in a thread pool,
+            or `None` to parse in the current thread. [Default: 'thread']
+        :param max_workers: Number of worker threads.
+        :param max_in_flight: Maximum number of files submitted
+            but not yet yielded. [Default: Twice the number of workers]
+        :returns Iterator[Data]: Iterator over the parsed data, in order of `paths`.
+        """
+        from .threads import parse_files
+        return parse_files(
+            self,
+            paths,
+            executor=executor,
+            max_workers=max_workers,
+            max_in_flight=max_in_flight
+        )
+
+    def _parse_lazy(self, path: Union[str, os.PathLike]) -> LazyData:
+        """
+        Open a file for lazy parsing.
+        Uncompressed files are memory mapped.
+        Compressed files are decompressed into memory.
+
+        :param path: Path to the file.
+        :returns LazyData: Lazily parsed data.
+        """
+        if self._compression(path) is not None:
+            with self._open(path) as f:
+                return LazyData(self, f.read())
+
+        f = open(path, 'rb')
+        if os.fstat(f.fileno()).st_size == 0:
+            f.close()
+            return LazyData(self, b'')
+
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        except BaseException:
+            f.close()
+            raise
+
+        return LazyData(self, buffer, f)
+
+    def edit(self, path: Union[str, os.PathLike]) -> Editor:
+        """
+        Open a file to edit fields in place.
+        The file is memory mapped for writing, and only edited fields are written.
+
+        :param path: Path to the file.
+        :returns Editor: Editor of the file, to be closed when done.
+        :raises ValueError: If the file is compressed or empty.
+        """
+        return Editor(self, path)
+
+    def _parse_path(self, path: Union[str, os.PathLike]) -> Data:
+        """
+        Parse a file.
+        Uncompressed files of formats with pointer fields are memory mapped,
+        so only the referenced blocks are read.
+
+        :param path: Path to the file.
+        :returns Data: Parsed data.
+        """
+        if (
+            self.format.has_pointers
+            and (self._compression(path) is None)
+            and (os.path.getsize(path) > 0)
+        ):
+            with open(path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    return self._parse_bytes(buffer)
+
+        with self._open(path) as f:
+            return self._parse_io(f)
+
+    def iter_records(
+        self,
+        stream: Union[io.IOBase, Buffer, str, os.PathLike],
+        errors: Union[ErrorPolicy, str] = ErrorPolicy.RAISE,
+        sync: Union[bytes, None] = None,
+        metrics: Union[ParseMetrics, None] = None,
+        as_records: bool = False,
+        where: Union[Dict[Union[str, int], Callable[[Any], bool]], None] = None
+    ) -> Iterator[Data]:
+        """
+        Iterate over consecutive records in the stream,
+        each described by the parser's format.
+
+        :param stream: Stream, buffer, or path to a file of records.
+            Files opened from a path are read in chunks, see `_iter_chunks`.
+            Streams are read one record at a time, so are not read past
+            the last record yielded.
+        :param errors: How to handle invalid records.
+            Values are from `ErrorPolicy`.
+            With `'skip'` the invalid record is skipped.
+            With `'resync'` the data is scanned forward for the next
+            occurrence of `sync`.
+            [Default: 'raise']
+        :param sync: Marker that each record begins with.
+            [Default: Values of the leading fields with an expected value]
+        :param metrics: Metrics to update while parsing,
+            including the offset ranges skipped due to errors.
+        :param as_records: Yield instances of the format's `record_type`
+            instead of `Data`. Records of buffers are decoded without
+            creating `Field`s. [Default: False]
+        :param where: Dictionary of {field name or index: predicate}.
+            Only records whose field values satisfy every predicate are parsed.
+            The fields of predicates are decoded first, and the rest of
+            rejected records is skipped without being decoded or validated.
+            [Default: None, all records]
+        :returns Iterator[Data]: Iterator over the parsed records.
+        :raises IncompleteRecord: If the stream ends within a record.
+        """
+        errors = ErrorPolicy(errors)
+        if errors is ErrorPolicy.RESYNC:
+            sync = self._sync_marker(sync)
+
+        match = None if not where else self._matcher(where)
+        if isinstance(stream, BUFFER_TYPES):
+            yield from self._iter_buffer(
+                stream,
+                errors=errors,
+                sync=sync,
+                metrics=metrics,
+                as_records=as_records,
+                match=match
+            )
+            return
+
+        if isinstance(stream, (str, os.PathLike)):
+            with self._open(stream) as f:
+                yield from self._iter_io(f, errors, sync, metrics, as_records=as_records, match=match, chunked=True)
+
+        elif isinstance(stream, io.IOBase):
+            yield from self._iter_io(stream, errors, sync, metrics, as_records=as_records, match=match)
+
+        else:
+            raise TypeError('Can not parse stream of given type')
+
+    def aggregate(
+        self,
+        stream: Union[io.IOBase, Buffer, str, os.PathLike],
+        fields: Sequence[Union[str, int]],
+        by: Union[str, int, None] = None,
+        where: Union[Dict[Union[str, int], Callable[[Any], bool]], None] = None,
+        errors: Union[ErrorPolicy, str] = ErrorPolicy.RAISE,
+        sync: Union[bytes, None] = None,
+        metrics: Union[ParseMetrics, None] = None
+    ) -> Union[Dict[str, Summary], Dict[Any, Dict[str, Summary]]]:
+        """
+        Compute the count, sum, minimum, maximum and mean of fields
+        over the records in the stream, in a single pass.
+        Only the fields aggregated, grouped by, and filtered on are decoded,
+        and no `Field` or `Data` objects are created.
+        Other fields are located but not validated.
+
+        :param stream: Stream, buffer, or path to a file of records.
+        :param fields: Names or indices of the fields to aggregate.
+        :param by: Name or index of a field to group records by.
+            [Default: None, no grouping]
+        :param where: Predicates records must satisfy. See `iter_records`.
+        :param errors: How to handle invalid records. See `iter_records`.
+        :param sync: Marker that each record begins with. See `iter_records`.
+        :param metrics: Metrics to update while parsing.
+        :returns dict[str, Summary] | dict[Any, dict[str, Summary]]:
+            Dictionary of {field: Summary}, or if grouped
+            of {value of `by`: {field: Summary}}.
+        """
+        errors = ErrorPolicy(errors)
+        if errors is ErrorPolicy.RESYNC:
+            sync = self._sync_marker(sync)
+
+        names = list(fields)
+        columns = names if by is None else [by, *names]
+        values = self._reader(columns)
+        match = None if not where else self._matcher(where)
+        if isinstance(stream, BUFFER_TYPES):
+            rows = self._iter_buffer(
+                stream,
+                errors=errors,
+                sync=sync,
+                metrics=metrics,
+                match=match,
+                values=values
+            )
+            return self._summarize(rows, names, by is not None)
+
+        if isinstance(stream, (str, os.PathLike)):
+            with self._open(stream) as f:
+                rows = self._iter_io(f, errors, sync, metrics, match=match, values=values, chunked=True)
+                return self._summarize(rows, names, by is not None)
+
+        elif isinstance(stream, io.IOBase):
+            rows = self._iter_io(stream, errors, sync, metrics, match=match, values=values)
+            return self._summarize(rows, names, by is not None)
+
+        else:
+            raise TypeError('Can not parse stream of given type')
+
+    @staticmethod
+    def _summarize(
+        rows: Iterator[Tuple[Any, ...]],
+        names: List[Union[str, int]],
+        grouped: bool
+    ) -> Union[Dict[str, Summary], Dict[Any, Dict[str, Summary]]]:
+        """
+        :param rows: Values of the fields of each record,
+            preceded by the value grouped by if grouped.
+        :param names: Names of the fields aggregated.
+        :param grouped: If rows begin with the value grouped by.
+        :returns dict: Aggregates. See `aggregate`.
+        """
+        if not grouped:
+            summaries = [Summary() for _ in names]
+            for row in rows:
+                for summary, value in zip(summaries, row):
+                    summary.add(value)
+
+            return dict(zip(names, summaries))
+
+        groups: Dict[Any, List[Summary]] = {}
+        for key, *row in rows:
+            summaries = groups.get(key)
+            if summaries is None:
+                summaries = groups[key] = [Summary() for _ in names]
+
+            for summary, value in zip(summaries, row):
+                summary.add(value)
+
+        return {key: dict(zip(names, summaries)) for key, summaries in groups.items()}
+
+    def follow(
+        self,
+        path: Union[str, os.PathLike],
+        checkpoint: Union[str, os.PathLike, None] = None,
+        poll_interval: float = 0.01,
+        timeout: Union[float, None] = None,
+        errors: Union[ErrorPolicy, str] = ErrorPolicy.RAISE,
+        sync: Union[bytes, None] = None,
+        metrics: Union[ParseMetrics, None] = None
+    ) -> Iterator[Data]:
+        """
+        Iterate over records as they are appended to a file.
+        Only newly appended data is read, and a partial record at the end of
+        the file is held back until the rest of it is written.
+
+        If a `checkpoint` path is given, the offset of the next record is saved
+        to it while following, and following resumes from it when restarted.
+        Records are considered consumed once the next record is requested,
+        or the iterator is closed.
+
+        :param path: Path to the file.
+        :param checkpoint: Path to a checkpoint file.
+            See `follow.Checkpoint`. [Default: None, start at the beginning]
+        :param poll_interval: Seconds to wait between checks for new data.
+            [Default: 0.01]
+        :param timeout: Seconds to wait for new data before stopping.
+            [Default: None, wait indefinitely]
+        :param errors: How to handle invalid records. See `iter_records`.
+        :param sync: Marker that each record begins with.
+        :param metrics: Metrics to update while parsing.
+        :returns Iterator[Data]: Iterator over the parsed records.
+        :raises ValueError: If the checkpoint was created with a different
+            format, or the file is smaller than the checkpoint's offset.
+        """
+        from .follow import follow_file
+        return follow_file(
+            self,
+            path,
+            checkpoint=checkpoint,
+            poll_interval=poll_interval,
+            timeout=timeout,
+            errors=errors,
+            sync=sync,
+            metrics=metrics
+        )
+
+    def parse_records(
+        self,
+        stream: Union[io.IOBase, Buffer, str, os.PathLike],
+        processes: Union[int, None] = None,
+        record_size: Union[int, None] = None,
+        sync: Union[bytes, None] = None,
+        index: Union[str, os.PathLike, Sequence[int], None] = None,
+        errors: Union[ErrorPolicy, str] = ErrorPolicy.RAISE,
+        metrics: Union[ParseMetrics, None] = None,
+        as_records: bool = False
+    ) -> List[Data]:
+        """
+        Parse all records in the stream.
+
+        If `processes` is given and `stream` is a path, the file is split into
+        chunks which are parsed in worker processes over a shared memory map.
+        Chunk boundaries are resolved, in order of precedence, from
+        `index`, `record_size`, `sync`, or the static size of the format.
+        Compressed files are parsed in the current process.
+
+        :param stream: Stream, buffer, or path to a file of records.
+        :param processes: Number of worker processes.
+            [Default: None, parse in the current process]
+        :param record_size: Size of each record in bytes.
+        :param sync: Marker that each record begins with.
+        :param index: Offsets of records, or path to a sidecar index file.
+            See `chunking.read_index`.
+        :param errors: How to handle invalid records. See `iter_records`.
+        :param metrics: Metrics to update while parsing.
+        :param as_records: Return instances of the format's `record_type`
+            instead of `Data`. See `iter_records`. [Default: False]
+        :returns list[Data]: Records in order.
+        """
+        parallel = (processes is not None) and (processes > 1)
+        if parallel and (not isinstance(stream, (str, os.PathLike))):
+            raise TypeError('Parallel parsing requires a path')
+
+        if (
+            (not parallel)
+            or (self._compression(stream) is not None)  # can not split compressed data
+        ):
+            return list(self.iter_records(
+                stream,
+                errors=errors,
+                sync=sync,
+                metrics=metrics,
+                as_records=as_records
+            ))
+
+        from .chunking import parse_file_chunks
+        return parse_file_chunks(
+            self,
+            stream,
+            processes,
+            record_size=record_size,
+            sync=sync,
+            index=index,
+            errors=errors,
+            metrics=metrics,
+            as_records=as_records
+        )
+
+    def validate_records(
+        self,
+        stream: Union[Buffer, str, os.PathLike],
+        start: int = 0,
+        end: Union[int, None] = None,
+        mask: bool = False
+    ) -> Any:
+        """
+        Check the constant fields, with a `value` or `is_null`,
+        of all records in a buffer or file in a single pass over their raw bytes,
+        without decoding the records.
+        The format must have a fixed size.
+        See `validation.invalid_records`.
+
+        :param stream: Buffer or path to an uncompressed file of records.
+        :param start: Offset of the first record. [Default: 0]
+        :param end: Offset the records end at. [Default: End of data]
+        :param mask: Return a boolean mask of invalid records
+            instead of their indices. [Default: False]
+        :returns numpy.ndarray | list: Indices of invalid records,
+            or a mask if `mask` is `True`.
+        :raises ValueError: If the format does not have a fixed size.
+        """
+        from .validation import invalid_records
+
+        if isinstance(stream, BUFFER_TYPES):
+            return invalid_records(stream, self.format, start, end, mask=mask)
+
+        if os.path.getsize(stream) == 0:
+            return invalid_records(b'', self.format, start, end, mask=mask)
+
+        with open(stream, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                return invalid_records(buffer, self.format, start, end, mask=mask)
+
+    def parse_columns(
+        self,
+        stream: Union[io.IOBase, Buffer, str, os.PathLike],
+        processes: Union[int, None] = None,
+        record_size: Union[int, None] = None,
+        sync: Union[bytes, None] = None,
+        index: Union[str, os.PathLike, Sequence[int], None] = None,
+        errors: Union[ErrorPolicy, str] = ErrorPolicy.RAISE,
+        metrics: Union[ParseMetrics, None] = None
+    ) -> Columns:
+        """
+        Parse all records in the stream into columns, one per named field.
+        Numeric columns are NumPy arrays if NumPy is installed.
+
+        When parsed in parallel, workers write numeric columns to
+        shared memory and the columns are views of it,
+        avoiding pickling records between processes.
+        Close the columns to release the shared memory.
+        See `parse_records` for parameters.
+
+        :returns Columns: Columns of the records.
+        """
+        parallel = (processes is not None) and (processes > 1)
+        if parallel and (not isinstance(stream, (str, os.PathLike))):
+            raise TypeError('Parallel parsing requires a path')
+
+        if (
+            (not parallel)
+            or (self._compression(stream) is not None)  # can not split compressed data
+        ):
+            return Columns.from_records(
+                self.iter_records(stream, errors=errors, sync=sync, metrics=metrics),
+                self.format
+            )
+
+        from .chunking import export_file_chunks
+        return export_file_chunks(
+            self,
+            stream,
+            processes,
+            record_size=record_size,
+            sync=sync,
+            index=index,
+            errors=errors,
+            metrics=metrics
+        )
+
+    def _compression(self, path: Union[str, os.PathLike]) -> Union[str, None]:
+        """
+        :param path: Path to the file.
+        :returns str | None: Compression of the file, detected by its
+            magic number if `compression` is `'auto'`,
+            or `None` if it is read as it is.
+        """
+        if self.compression == 'auto':
+            return file_compression(path)
+
+        return self.compression
+
+    def _open(self, path: Union[str, os.PathLike]) -> io.BufferedIOBase:
+        """
+        Open a file for parsing.
+        Compressed files, as set by `compression`, are decompressed while reading.
+
+        :param path: Path to the file.
+        :returns io.BufferedIOBase: Readable stream.
+        """
+        compression = self._compression(path)
+        if compression is None:
+            raw = open(path, 'rb', buffering=0)
+
+        else:
+            raw = open_decompressed(path, compression)
+
+        if self.read_ahead > 0:
+            return PrefetchReader(
+                raw,
+                buffer_size=self.buffer_size,
+                depth=self.read_ahead
+            )
+
+        # read in large blocks
+        return io.BufferedReader(raw, buffer_size=self.buffer_size)
+
+    def _locate(
+        self,
+        buffer: Buffer,
+        offset: int,
+        end: int,
+        fd: FieldDescription,
+        strict: bool = False,
+        size: Union[int, None] = None
+    ) -> int:
+        """
+        Find where a field ends in a buffer.
+
+        :param buffer: Buffer being parsed.
+        :param offset: Offset the field starts at.
+        :param end: Offset the data ends at.
+        :param fd: Description of the field.
+        :param strict: Raise an error if the field does not terminate
+            before `end`, rather than truncating it.
+        :param size: Size of the field, set by its `pre` hook.
+            [Default: None, as described]
+        :returns int: Offset the field stops at.
+        :raises IncompleteRecord: If `strict` and the field does not terminate.
+        :raises ValueError: If the field is a switch field,
+            whose layout depends on a previous field.
+        """
+        if fd.switch is not None:
+            raise ValueError(f'Switch fields can only be located while parsing. {fd}')
+
+        if (size is None) and fd.is_self_terminated:
+            try:
+                stop = offset + fd.codec.size(buffer, offset)
+
+            except IndexError:
+                stop = end + 1
+
+            if stop > end:
+                if strict:
+                    raise IncompleteRecord(
+                        f'Data ended before field terminated. {fd}',
+                        offset
+                    )
+
+                stop = end
+
+            return stop
+
+        if size is None:
+            size = fd.size
+
+        if size is not None:
+            if size < 0:
+                # read till end of stream
+                return end
+
+            stop = offset + size
+            if stop > end:
+                if strict:
+                    raise IncompleteRecord(
+                        f'Data ended before field terminated. {fd}',
+                        offset
+                    )
+
+                stop = end
+
+            return stop
+
+        elif fd.terminator is not None:
+            t_index = buffer.find(fd.terminator, offset, end)
+            if t_index < 0:
+                # terminator not found
+                if strict:
+                    raise IncompleteRecord(
+                        f'Terminator not found. {fd}',
+                        offset
+                    )
+
+                # exhaust stream
+                return end
+
+            return t_index + len(fd.terminator)
+
+        else:
+            raise ValueError(f'Could not determine how to read field. {fd}')
+
+    def _field(self, data: bytes, fd: FieldDescription) -> Field:
+        """
+        Create a field from its data,
+        retaining the data according to the raw retention policy.
+
+        :param data: Data of the field.
+        :param fd: Description of the field.
+        :returns Field: Parsed field.
+        :raises ValuesDoNotMatch: If the parsed value does not match
+            the expected value.
+        """
+        try:
+            f = Field.from_data(data, fd)
+
+        except ValuesDoNotMatch as err:
+            if (err.field is not None) and (self.retain_raw is RetainRaw.NEVER):
+                err.field._data = None
+
+            raise err
+
+        if self.retain_raw is not RetainRaw.ALWAYS:
+            f._data = None
+
+        return f
+
+    def _pre_size(
+        self,
+        index: int,
+        data: Buffer,
+        start: int,
+        stop: int,
+        fields: Sequence[Field]
+    ) -> Union[int, None]:
+        """
+        Call the `pre` hook of a field, if it has one.
+
+        :param index: Index of the field.
+        :param data: Buffer containing the record.
+        :param start: Offset the record starts at.
+        :param stop: Offset the field starts at.
+        :param fields: Previous fields of the record.
+        :returns int | None: Size of the field set by the hook, if any.
+        :raises ValueError: If the hook returns an invalid size.
+        """
+        pre = self.format.hooks[index][0]
+        if pre is None:
+            return None
+
+        size = _call_hook(pre, data, start, stop, fields)
+        if (size is not None) and (isinstance(size, bool) or (not isinstance(size, int)) or (size < 0)):
+            raise ValueError(
+                f'Invalid size `{size!r}` set by the `pre` hook of {self.format.fields[index]}'
+            )
+
+        return size
+
+    def _post_value(
+        self,
+        index: int,
+        f: Field,
+        f_data: Buffer,
+        fields: Sequence[Field]
+    ):
+        """
+        Call the `post` hook of a field, if it has one,
+        replacing the field's value with its result unless it is `None`.
+
+        :param index: Index of the field.
+        :param f: Parsed field.
+        :param f_data: Data of the field.
+        :param fields: Previous fields of the record.
+        """
+        post = self.format.hooks[index][1]
+        if post is None:
+            return
+
+        value = _call_hook(post, f_data, 0, len(f_data), fields)
+        if value is not None:
+            f.value = value
+
+    def _read(
+        self,
+        stream: io.IOBase,
+        fd: FieldDescription,
+        strict: bool = False,
+        size: Union[int, None] = None
+    ) -> bytes:
+        """
+        Read a field from a stream.
+
+        :param stream: Stream to read.
+        :param fd: Description of the field.
+        :param strict: Raise an error if the stream ends
+            before the field terminates.
+        :param size: Size of the field, set by its `pre` hook.
+            [Default: None, as described]
+        :returns bytes: Data of the field.
+        :raises IncompleteRecord: If `strict` and the field does not terminate.
+        """
+        if (size is None) and fd.is_self_terminated:
+            # read only until the size can be determined,
+            # then the rest of the value at once
+            peek_size = fd.codec.peek_size or fd.codec.size
+            f_data = bytearray()
+            while True:
+                try:
+                    size = peek_size(f_data, 0)
+
+                except IndexError:
+                    c = stream.read(1)
+                    if not c:
+                        if strict:
+                            raise IncompleteRecord(f'Data ended before field terminated. {fd}')
+
+                        return bytes(f_data)
+
+                    f_data += c
 
                 else:
-                    # read till end of stream
-                    f = Field.from_data(stream.read(), fd)
+                    break
 
-            elif fd.terminator is not None:
-                f = Field.from_data(
-                    read_until(stream, terminator=fd.terminator),
-                    fd
-                )
+            if size > len(f_data):
+                f_data += stream.read(size - len(f_data))
+
+            if strict and (len(f_data) < size):
+                raise IncompleteRecord(f'Data ended before field terminated. {fd}')
+
+            return bytes(f_data)
+
+        if size is None:
+            size = fd.size
+
+        if size is not None:
+            if size < 0:
+                # read till end of stream
+                return stream.read()
+
+            f_data = stream.read(size)
+            if strict and (len(f_data) < size):
+                raise IncompleteRecord(f'Data ended before field terminated. {fd}')
+
+            return f_data
+
+        elif fd.terminator is not None:
+            f_data = read_until(stream, terminator=fd.terminator)
+            if strict and (not f_data.endswith(fd.terminator)):
+                raise IncompleteRecord(f'Terminator not found. {fd}')
+
+            return f_data
+
+        else:
+            raise ValueError(f'Could not determine how to read field. {fd}')
+
+    def _skip(
+        self,
+        buffer: Buffer,
+        index: int,
+        offset: int,
+        base: int,
+        end: int,
+        strict: bool = False
+    ) -> int:
+        """
+        Skip the gap before a field, or after the last field.
+
+        :param buffer: Buffer being parsed.
+        :param index: Index of the field, or the number of fields.
+        :param offset: Offset after the previous field.
+        :param base: Offset the record starts at.
+        :param end: Offset the data ends at.
+        :param strict: Raise an error if the data ends in the gap.
+        :returns int: Offset after the gap.
+        :raises IncompleteRecord: If `strict` and the data ends in the gap.
+        :raises ValueError: If padding is checked and is not null.
+        """
+        stop = self.format.skip(index, offset, base)
+        if stop > end:
+            if strict:
+                raise IncompleteRecord('Data ended in padding', offset)
+
+            stop = end
+
+        if self.format.check_padding:
+            self._check_padding(buffer[offset:stop], offset)
+
+        return stop
+
+    def _check_padding(self, padding: bytes, offset: int):
+        """
+        :param padding: Data of a gap.
+        :param offset: Offset of the gap.
+        :raises ValueError: If the padding is not null.
+        """
+        if padding.strip(b'\x00'):
+            raise ValueError(f'Padding at offset {offset} is not null')
+
+    def _read_padding(
+        self,
+        stream: io.IOBase,
+        index: int,
+        offset: int,
+        strict: bool = False
+    ) -> bytes:
+        """
+        Read the gap before a field, or after the last field, from a stream.
+        The padding is not checked.
+
+        :param stream: Stream to read.
+        :param index: Index of the field, or the number of fields.
+        :param offset: Offset after the previous field from the start of the record.
+        :param strict: Raise an error if the stream ends in the gap.
+        :returns bytes: Padding read.
+        :raises IncompleteRecord: If `strict` and the stream ends in the gap.
+        """
+        size = self.format.skip(index, offset) - offset
+        if size == 0:
+            return b''
+
+        padding = stream.read(size)
+        if strict and (len(padding) < size):
+            raise IncompleteRecord('Data ended in padding')
+
+        return padding
+
+    def _read_record(self, stream: io.IOBase, strict: bool = False) -> bytes:
+        """
+        Read the data of a record from a stream without parsing it,
+        decoding only the fields switched on.
+        Records of formats with hooks are parsed.
+        Pointer fields are not read.
+
+        :param stream: Stream to read.
+        :param strict: Raise an error if the stream ends
+            before the record terminates.
+        :returns bytes: Data of the record.
+        """
+        if self.format.has_hooks:
+            # sizes may be set by hooks, so fields are parsed
+            parts = []
+            self._parse_io(stream, strict=strict, parts=parts)
+            return b''.join(parts)
+
+        switches = self.format.switch_sources
+        switched = set(switches)
+        padded = self.format.has_gaps
+        keys = {}
+        parts = []
+        pos = 0
+        for i, fd in enumerate(self.format.fields):
+            if fd.offset_from is not None:
+                continue
+
+            if padded:
+                parts.append(self._read_padding(stream, i, pos, strict=strict))
+                if self.format.check_padding:
+                    self._check_padding(parts[-1], pos)
+
+                pos += len(parts[-1])
+
+            if switches[i] is not None:
+                f_data = self._case_parser(fd, keys[switches[i]])._read_record(stream, strict=strict)
 
             else:
-                raise ValueError(f'Could not determine how to read field. {fd}')
+                f_data = self._read(stream, fd, strict=strict)
+                if i in switched:
+                    keys[i] = self._decoders[i](f_data)
+
+            parts.append(f_data)
+            pos += len(f_data)
+
+        if padded:
+            parts.append(self._read_padding(stream, len(self.format.fields), pos, strict=strict))
+            if self.format.check_padding:
+                self._check_padding(parts[-1], pos)
+
+        return b''.join(parts)
+
+    def _update_checksums(
+        self,
+        running: Dict[int, int],
+        index: int,
+        data: bytes,
+        f: Field
+    ):
+        """
+        Update the running checksums covering a field,
+        and verify the field if it is a checksum.
+
+        :param running: Dictionary of {checksum field index: running checksum}.
+        :param index: Index of the field.
+        :param data: Data of the field.
+        :param f: Parsed field.
+        :raises ChecksumMismatch: If the field is a checksum that does not match.
+        """
+        for c in self.format.checksum_cover[index]:
+            running[c.index] = c.checksum.function(data, running[c.index])
+
+        if (index in running) and (f.value != running[index]):
+            raise ChecksumMismatch(
+                f'Checksum {running[index]:#x} does not match {f}',
+                f
+            )
+
+    def _pointer_field(
+        self,
+        fd: FieldDescription,
+        pointer: Any,
+        read_block: Callable[[int], bytes],
+        blocks: Dict[Tuple[int, int], Tuple[Field, bytes]]
+    ) -> Tuple[Field, bytes]:
+        """
+        Parse the blocks referenced by a pointer field.
+        If the pointer is a sequence of offsets, the field's value is a list
+        with the value of each block, and its subfields are the blocks.
+
+        :param fd: Description of the field.
+        :param pointer: Offset, or sequence of offsets, of the field's data
+            from the start of the record.
+        :param read_block: Function returning the data of the field
+            at an offset from the start of the record.
+        :param blocks: Cache of parsed blocks for the record.
+        :returns tuple[Field, bytes]: Tuple of (field, data).
+        :raises ValueError: If the pointer is not an integer or
+            a sequence of integers.
+        """
+        def block(offset: Any) -> Tuple[Field, bytes]:
+            if isinstance(offset, bool) or (not isinstance(offset, int)):
+                raise ValueError(f'Invalid offset `{offset}` for {fd}')
+
+            key = (id(fd), offset)
+            if key not in blocks:
+                f_data = read_block(offset)
+                blocks[key] = (self._field(f_data, fd), f_data)
+
+            return blocks[key]
+
+        if isinstance(pointer, (list, tuple)):
+            parsed = [block(o) for o in pointer]
+            f = Field(fd, tuple(b[0] for b in parsed))
+            f.value = [c.value for c in f.fields]
+            return (f, b''.join(b[1] for b in parsed))
+
+        return block(pointer)
+
+    def _parse_io(
+        self,
+        stream: io.IOBase,
+        strict: bool = False,
+        complete: bool = False,
+        parts: Union[List[bytes], None] = None
+    ) -> Data:
+        """
+        Parse a single record from a stream.
+
+        :param stream: Stream to parse.
+        :param strict: Raise an error if the record does not terminate.
+        :param complete: If a field is invalid, read the remaining fields
+            of the record before raising the error.
+        :param parts: List to append the data read to.
+            Data of pointer fields is not included.
+        :returns Data: Parsed record.
+        """
+        fields: List[Field] = []
+        running = {c.index: c.checksum.initial for c in self.format.checksums}
+        sources = self.format.pointer_sources
+        switches = self.format.switch_sources
+        padded = self.format.has_gaps
+        hooked = self.format.has_hooks
+        hooks = self.format.hooks
+        if hooked and (parts is None):
+            # `pre` hooks are passed the data of the record
+            parts = []
+
+        pos = 0  # offset from the start of the record
+        if self.format.has_pointers:
+            if not stream.seekable():
+                raise TypeError('Pointer fields require a seekable stream')
+
+            base = stream.tell()
+            blocks = {}
+
+        for i, fd in enumerate(self.format.fields):
+            if sources[i] is not None:
+                def read_block(offset: int) -> bytes:
+                    pos = stream.tell()
+                    stream.seek(base + offset)
+                    f_data = self._read(stream, fd, strict=True)
+                    stream.seek(pos)
+                    return f_data
+
+                f, f_data = self._pointer_field(
+                    fd,
+                    fields[sources[i]].value,
+                    read_block,
+                    blocks
+                )
+
+                if running:
+                    self._update_checksums(running, i, f_data, f)
+
+                if hooked:
+                    self._post_value(i, f, f_data, fields)
+
+                fields.append(f)
+                continue
+
+            try:
+                if padded:
+                    padding = self._read_padding(stream, i, pos, strict=strict)
+                    pos += len(padding)
+                    if parts is not None:
+                        parts.append(padding)
+
+                    if self.format.check_padding:
+                        self._check_padding(padding, pos - len(padding))
+
+                if switches[i] is not None:
+                    parser = self._case_parser(fd, fields[switches[i]].value)
+                    f_data = parser._read_record(stream, strict=strict)
+                    pos += len(f_data)
+                    f, _ = self._switch_field(
+                        fd,
+                        fields[switches[i]].value,
+                        f_data,
+                        0,
+                        len(f_data),
+                        strict=strict
+                    )
+
+                else:
+                    size = None
+                    if hooked and (hooks[i][0] is not None):
+                        # only joined for fields with a `pre` hook
+                        record = b''.join(parts)
+                        size = self._pre_size(i, record, 0, len(record), fields)
+
+                    f_data = self._read(stream, fd, strict=strict, size=size)
+                    pos += len(f_data)
+                    f = self._field(f_data, fd)
+
+                if parts is not None:
+                    parts.append(f_data)
+
+                if running:
+                    self._update_checksums(running, i, f_data, f)
+
+                if hooked:
+                    self._post_value(i, f, f_data, fields)
+
+            except RECORD_ERRORS as err:
+                if complete:
+                    self._read_rest(stream, i + 1, pos, strict=strict)
+
+                raise err
 
             fields.append(f)
 
+        if padded:
+            padding = self._read_padding(stream, len(fields), pos, strict=strict)
+            if parts is not None:
+                parts.append(padding)
+
+            if self.format.check_padding:
+                self._check_padding(padding, pos)
+
         data = Data(tuple(fields))
         return data
 
-    def _parse_bytes(self, stream: bytes) -> Data:
+    def _read_rest(self, stream: io.IOBase, index: int, pos: int, strict: bool = False):
+        """
+        Read the remaining fields of a record from a stream without parsing them.
+        Reading stops at a switch field, or a field sized by its `pre` hook,
+        as their layout depends on previous fields.
+
+        :param stream: Stream to read.
+        :param index: Index of the first field to read.
+        :param pos: Offset of the stream from the start of the record.
+        :param strict: Raise an error if the stream ends
+            before the record terminates.
+        """
+        padded = self.format.has_gaps
+        for i in range(index, len(self.format.fields)):
+            fd = self.format.fields[i]
+            if (fd.switch is not None) or fd.is_hook_sized:
+                # layout depends on the invalid data
+                return
+
+            if fd.offset_from is None:
+                if padded:
+                    pos += len(self._read_padding(stream, i, pos, strict=strict))
+
+                pos += len(self._read(stream, fd, strict=strict))
+
+        if padded:
+            self._read_padding(stream, len(self.format.fields), pos, strict=strict)
+
+    def _parse_bytes(self, stream: Buffer) -> Data:
+        spans = []
+        data, _ = self._parse_buffer(stream, spans=spans)
+        data._offset_map = OffsetMap(tuple(spans), len(stream))
+        return data
+
+    def _parse_buffer(
+        self,
+        buffer: Buffer,
+        offset: int = 0,
+        end: Union[int, None] = None,
+        strict: bool = False,
+        spans: Union[List[Union[Tuple[int, int], None]], None] = None
+    ) -> Tuple[Data, int]:
+        """
+        Parse a single record from a buffer.
+
+        :param buffer: Buffer to parse.
+        :param offset: Offset to begin parsing at. [Default: 0]
+        :param end: Offset to stop parsing at. [Default: End of buffer]
+        :param strict: Raise an error if the record does not terminate.
+        :param spans: List to append the (start, stop) offsets of each field to,
+            or `None` for pointer fields. See `OffsetMap`.
+        :returns tuple[Data, int]: Tuple of (data, offset after the record).
+        """
+        if end is None:
+            end = len(buffer)
+
         fields: List[Field] = []
-        for fd in self.format.fields:
-            if fd.size is not None:
-                if fd.size > 0:
-                    f_data = stream[:fd.size]
-                    stream = stream[fd.size:]
-                    f = Field.from_data(f_data, fd)
+        running = {c.index: c.checksum.initial for c in self.format.checksums}
+        sources = self.format.pointer_sources
+        switches = self.format.switch_sources
+        padded = self.format.has_gaps
+        hooked = self.format.has_hooks
+        base = offset
+        blocks = {}
+        for i, fd in enumerate(self.format.fields):
+            if padded and (sources[i] is None):
+                offset = self._skip(buffer, i, offset, base, end, strict=strict)
 
-                else:
-                    # read till end of stream
-                    f = Field.from_data(stream, fd)
+            if sources[i] is not None:
+                def read_block(b_offset: int) -> bytes:
+                    b_start = base + b_offset
+                    if not (0 <= b_start <= len(buffer)):
+                        raise IncompleteRecord(
+                            f'Offset {b_offset} is out of bounds for {fd}',
+                            base
+                        )
 
-            elif fd.terminator is not None:
-                try:
-                    t_index = stream.index(fd.terminator)
+                    stop = self._locate(buffer, b_start, len(buffer), fd, strict=True)
+                    return buffer[b_start:stop]
+
+                f, f_data = self._pointer_field(
+                    fd,
+                    fields[sources[i]].value,
+                    read_block,
+                    blocks
+                )
 
-                except ValueError:
-                    # terminator not found
-                    # exhaust stream
-                    f_data = stream
-                    stream = b''
+                if spans is not None:
+                    spans.append(None)
 
-                else:
-                    split = t_index + len(fd.terminator)
-                    f_data = stream[:split]
-                    stream = stream[split:]
+            elif switches[i] is not None:
+                f, stop = self._switch_field(
+                    fd,
+                    fields[switches[i]].value,
+                    buffer,
+                    offset,
+                    end,
+                    strict=strict
+                )
+
+                f_data = buffer[offset:stop]
+                if spans is not None:
+                    spans.append((offset, stop))
 
-                f = Field.from_data(f_data, fd)
+                offset = stop
 
             else:
-                raise ValueError(f'Could not determine how to read field. {fd}')
+                size = self._pre_size(i, buffer, base, offset, fields) if hooked else None
+                stop = self._locate(buffer, offset, end, fd, strict=strict, size=size)
+                f_data = buffer[offset:stop]
+                f = self._field(f_data, fd)
+                if spans is not None:
+                    spans.append((offset, stop))
+
+                offset = stop
+
+            if running:
+                self._update_checksums(running, i, f_data, f)
+
+            if hooked:
+                self._post_value(i, f, f_data, fields)
 
             fields.append(f)
 
+        if padded:
+            offset = self._skip(buffer, len(fields), offset, base, end, strict=strict)
+
         data = Data(tuple(fields))
-        return data
+        return (data, offset)
+
+    def _case_parser(self, fd: FieldDescription, key: Any) -> 'Parser':
+        """
+        :param fd: Description of a switch field.
+        :param key: Value of the field switched on.
+        :returns Parser: Parser of the layout selected by the value.
+        :raises ValueError: If the value has no case.
+        """
+        return self._case_parsers[id(fd.switch.case(key))]
+
+    def _switch_field(
+        self,
+        fd: FieldDescription,
+        key: Any,
+        buffer: Buffer,
+        offset: int,
+        end: int,
+        strict: bool = False
+    ) -> Tuple[Field, int]:
+        """
+        Parse a switch field in place, using the layout selected by `key`.
+
+        :param fd: Description of the field.
+        :param key: Value of the field switched on.
+        :param buffer: Buffer being parsed.
+        :param offset: Offset the field starts at.
+        :param end: Offset the data ends at.
+        :param strict: Raise an error if the field does not terminate.
+        :returns tuple[Field, int]: Tuple of (field, offset after the field).
+            The field's value is the `Data` of the layout,
+            and its subfields are the layout's fields.
+        """
+        data, stop = self._case_parser(fd, key)._parse_buffer(buffer, offset, end, strict=strict)
+        f = Field(fd, data.fields)
+        f.value = data
+        if self.retain_raw is RetainRaw.ALWAYS:
+            f._data = buffer[offset:stop]
+
+        return (f, stop)
+
+    @property
+    def _decoders(self) -> Tuple[Callable[[bytes], Any], ...]:
+        """
+        :returns tuple[Callable[[bytes], Any], ...]: Function decoding
+            the value of each field of the format. See `field.value_decoder`.
+        """
+        return self._value_decoders
+
+    @property
+    def _unpack_record(self) -> Union[Callable[[Buffer, int], Tuple[Any, ...]], None]:
+        """
+        :returns Callable[[Buffer, int], tuple[Any, ...]] | None: Function
+            unpacking the values of all fields of a record at an offset,
+            if the format has a `struct_format`.
+        """
+        return None if self._record_struct is None else self._record_struct.unpack_from
+
+    def _parse_values(
+        self,
+        buffer: Buffer,
+        offset: int = 0,
+        end: Union[int, None] = None,
+        strict: bool = False
+    ) -> Tuple[Tuple[Any, ...], int]:
+        """
+        Parse the values of a single record from a buffer,
+        without creating `Field`s.
+        Formats with pointer fields or hooks are not supported.
+
+        :param buffer: Buffer to parse.
+        :param offset: Offset to begin parsing at. [Default: 0]
+        :param end: Offset to stop parsing at. [Default: End of buffer]
+        :param strict: Raise an error if the record does not terminate.
+        :returns tuple[tuple[Any, ...], int]: Tuple of
+            (values of each field, offset after the record).
+        """
+        if end is None:
+            end = len(buffer)
+
+        unpack = self._unpack_record
+        if unpack is not None:
+            stop = offset + self._record_size
+            if stop <= end:
+                # fixed layout decoded at once
+                return (unpack(buffer, offset), stop)
+
+        values = []
+        running = {c.index: c.checksum.initial for c in self.format.checksums}
+        switches = self.format.switch_sources
+        padded = self.format.has_gaps
+        base = offset
+        locate = self._locate
+        for i, (fd, decode) in enumerate(zip(self.format.fields, self._decoders)):
+            if padded:
+                offset = self._skip(buffer, i, offset, base, end, strict=strict)
+
+            if switches[i] is not None:
+                parser = self._case_parser(fd, values[switches[i]])
+                case_values, stop = parser._parse_values(buffer, offset, end, strict=strict)
+                value = parser.format.to_record(case_values)
+
+            else:
+                stop = locate(buffer, offset, end, fd, strict=strict)
+                value = decode(buffer[offset:stop])
+
+            f_data = buffer[offset:stop]
+            if running:
+                for c in self.format.checksum_cover[i]:
+                    running[c.index] = c.checksum.function(f_data, running[c.index])
+
+                if (i in running) and (value != running[i]):
+                    f = self._field(f_data, fd)
+                    raise ChecksumMismatch(
+                        f'Checksum {running[i]:#x} does not match {f}',
+                        f
+                    )
+
+            values.append(value)
+            offset = stop
+
+        if padded:
+            offset = self._skip(buffer, len(values), offset, base, end, strict=strict)
+
+        return (tuple(values), offset)
+
+    def _sync_marker(self, sync: Union[bytes, None] = None) -> bytes:
+        """
+        :param sync: Sync marker, if provided.
+        :returns bytes: Marker to resynchronize on.
+        :raises ValueError: If no marker is provided and the format
+            does not begin with a field with an expected value.
+        """
+        if sync is None:
+            sync = self.format.prefix
+
+        if not sync:
+            raise ValueError(
+                'Resynchronization requires a sync marker or a format beginning with a field with an expected value'
+            )
+
+        return sync
+
+    def _record_end(self, buffer: Buffer, offset: int, end: int) -> int:
+        """
+        Find where a record ends without decoding it.
+
+        :param buffer: Buffer being parsed.
+        :param offset: Offset the record starts at.
+        :param end: Offset the data ends at.
+        :returns int: Offset the record ends at,
+            or `end` if it does not terminate.
+        """
+        try:
+            stop = self._record_stop(buffer, offset, end)
+
+        except RECORD_ERRORS:
+            return end
+
+        return max(stop, offset + 1)
+
+    def _record_stop(self, buffer: Buffer, offset: int, end: int) -> int:
+        """
+        Find where a record ends, decoding only the fields switched on.
+        Records of formats with hooks are parsed.
+
+        :param buffer: Buffer being parsed.
+        :param offset: Offset the record starts at.
+        :param end: Offset the data ends at.
+        :returns int: Offset the record ends at.
+        :raises IncompleteRecord: If the record does not terminate.
+        """
+        if self.format.has_hooks:
+            # sizes may be set by hooks, so fields are parsed
+            return self._parse_buffer(buffer, offset, end, strict=True)[1]
+
+        switches = self.format.switch_sources
+        switched = set(switches)
+        padded = self.format.has_gaps
+        keys = {}
+        stop = offset
+        for i, fd in enumerate(self.format.fields):
+            if fd.offset_from is not None:
+                continue
+
+            if padded:
+                stop = self.format.skip(i, stop, offset)
+
+            if switches[i] is not None:
+                stop = self._case_parser(fd, keys[switches[i]])._record_stop(buffer, stop, end)
+                continue
+
+            f_stop = self._locate(buffer, stop, end, fd, strict=True)
+            if i in switched:
+                keys[i] = self._decoders[i](buffer[stop:f_stop])
+
+            stop = f_stop
+
+        if padded:
+            stop = self.format.skip(len(self.format.fields), stop, offset)
+            if stop > end:
+                raise IncompleteRecord('Data ended in padding', offset)
+
+        return stop
+
+    def _reader(
+        self,
+        names: Sequence[Union[str, int]]
+    ) -> Callable[[Buffer, int, int], Tuple[Any, ...]]:
+        """
+        Create a function decoding the values of some fields of a record,
+        without decoding other fields.
+        Fields with static offsets are read directly,
+        others are located by scanning the fields before them.
+        Records of formats with hooks are parsed.
+
+        :param names: Names or indices of the fields.
+        :returns Callable[[Buffer, int, int], tuple[Any, ...]]: Function
+            taking (buffer, offset of the record, end of the data),
+            and returning the values of the fields.
+        :raises KeyError: If a field does not exist or its name is ambiguous.
+        :raises ValueError: If a field is a pointer or switch field.
+        """
+        fmt = self.format
+        indices = [fmt._field_index(n) for n in names]
+        for i in indices:
+            fd = fmt.fields[i]
+            if (fd.offset_from is not None) or (fd.switch is not None):
+                raise ValueError(f'Pointer and switch fields can only be read by parsing the record. {fd}')
+
+        if fmt.has_hooks:
+            # sizes and values may be set by hooks
+            def read(buffer: Buffer, offset: int, end: int) -> Tuple[Any, ...]:
+                data, _ = self._parse_buffer(buffer, offset, end, strict=True)
+                return tuple(data.fields[i].value for i in indices)
+
+            return read
+
+        decoders = self._decoders
+        offsets = fmt.offsets
+        static = all(
+            (offsets[i] is not None)
+            and (fmt.fields[i].size is not None)
+            and (fmt.fields[i].size > 0)
+            and (not fmt.fields[i].is_self_terminated)
+            for i in indices
+        )
+
+        if static:
+            spans = [(offsets[i], offsets[i] + fmt.fields[i].size, decoders[i]) for i in indices]
+            last = max((stop for _, stop, _ in spans), default=0)
+
+            def read(buffer: Buffer, offset: int, end: int) -> Tuple[Any, ...]:
+                if offset + last > end:
+                    raise IncompleteRecord('Data ended before field terminated', offset)
+
+                return tuple(
+                    decode(buffer[offset + start:offset + stop])
+                    for start, stop, decode in spans
+                )
+
+            return read
+
+        switches = fmt.switch_sources
+        decoded = set(indices) | set(switches)
+        padded = fmt.has_gaps
+        count = max(indices, default=-1) + 1
+
+        def read(buffer: Buffer, offset: int, end: int) -> Tuple[Any, ...]:
+            values = {}
+            stop = offset
+            for i in range(count):
+                fd = fmt.fields[i]
+                if fd.offset_from is not None:
+                    continue
+
+                if padded:
+                    stop = fmt.skip(i, stop, offset)
+
+                if switches[i] is not None:
+                    parser = self._case_parser(fd, values[switches[i]])
+                    stop = parser._record_stop(buffer, stop, end)
+                    continue
+
+                f_stop = self._locate(buffer, stop, end, fd, strict=True)
+                if i in decoded:
+                    values[i] = decoders[i](buffer[stop:f_stop])
+
+                stop = f_stop
+
+            return tuple(values[i] for i in indices)
+
+        return read
+
+    def _matcher(
+        self,
+        where: Dict[Union[str, int], Callable[[Any], bool]]
+    ) -> Callable[[Buffer, int, int], bool]:
+        """
+        :param where: Dictionary of {field name or index: predicate}.
+        :returns Callable[[Buffer, int, int], bool]: Function taking
+            (buffer, offset of the record, end of the data), and returning
+            if the record satisfies all predicates.
+        """
+        read = self._reader(list(where))
+        predicates = tuple(where.values())
+
+        def match(buffer: Buffer, offset: int, end: int) -> bool:
+            return all(p(v) for p, v in zip(predicates, read(buffer, offset, end)))
+
+        return match
+
+    def _record_stop_function(self) -> Callable[[Buffer, int, int], int]:
+        """
+        :returns Callable[[Buffer, int, int], int]: Function taking
+            (buffer, offset of the record, end of the data), and returning
+            the offset the record ends at. See `_record_stop`.
+        """
+        size = self.format.size
+        if not size:
+            return self._record_stop
+
+        def stop(buffer: Buffer, offset: int, end: int) -> int:
+            if offset + size > end:
+                raise IncompleteRecord('Data ended before record terminated', offset)
+
+            return offset + size
+
+        return stop
+
+    def _iter_buffer(
+        self,
+        buffer: Buffer,
+        start: int = 0,
+        end: Union[int, None] = None,
+        errors: ErrorPolicy = ErrorPolicy.RAISE,
+        sync: Union[bytes, None] = None,
+        metrics: Union[ParseMetrics, None] = None,
+        as_records: bool = False,
+        match: Union[Callable[[Buffer, int, int], bool], None] = None,
+        values: Union[Callable[[Buffer, int, int], Tuple[Any, ...]], None] = None
+    ) -> Iterator[Data]:
+        """
+        Iterate over records in a buffer.
+
+        :param buffer: Buffer to parse.
+        :param start: Offset of the first record. [Default: 0]
+        :param end: Offset to stop parsing at. [Default: End of buffer]
+        :param errors: How to handle invalid records.
+        :param sync: Marker to resynchronize on.
+        :param metrics: Metrics to update.
+        :param as_records: Yield records of the format's `record_type`.
+        :param match: Function selecting records to parse. See `_matcher`.
+        :param values: Function reading the values to yield for each record,
+            instead of parsing it. See `_reader`.
+        :returns Iterator[Data]: Iterator over the parsed records.
+        """
+        if end is None:
+            end = len(buffer)
+
+        parse = self._parse_buffer
+        if as_records:
+            make = self.format.to_record
+            if not (self.format.has_pointers or self.format.has_hooks):
+                parse = self._parse_values
+
+        if (match is not None) or (values is not None):
+            record_stop = self._record_stop_function()
+
+        if values is not None:
+            def parse(buffer: Buffer, offset: int, end: int, strict: bool) -> Tuple[Tuple[Any, ...], int]:
+                return (values(buffer, offset, end), record_stop(buffer, offset, end))
+
+        offset = start
+        while offset < end:
+            try:
+                if (match is not None) and (not match(buffer, offset, end)):
+                    stop = record_stop(buffer, offset, end)
+                    if metrics is not None:
+                        metrics.filtered += 1
+
+                    offset = stop
+                    continue
+
+                data, stop = parse(buffer, offset, end, strict=True)
+
+            except RECORD_ERRORS as err:
+                if errors is ErrorPolicy.RAISE:
+                    if isinstance(err, IncompleteRecord):
+                        err.offset = offset
+
+                    raise err
+
+                if errors is ErrorPolicy.SKIP:
+                    stop = self._record_end(buffer, offset, end)
+
+                else:
+                    stop = buffer.find(sync, offset + 1, end)
+                    if stop < 0:
+                        stop = end
+
+                if metrics is not None:
+                    metrics.errors += 1
+                    metrics.skipped.append((offset, stop))
+
+                offset = stop
+                continue
+
+            if stop == offset:
+                raise ValueError(f'Record at offset {offset} is empty')
+
+            if metrics is not None:
+                metrics.records += 1
+                metrics.bytes += stop - offset
+
+            offset = stop
+            yield make(data) if (as_records and (values is None)) else data
+
+    def _scan_io(self, stream: PushbackReader, sync: bytes):
+        """
+        Advance a stream to the next occurrence of a sync marker,
+        or its end if not found.
+
+        :param stream: Stream to scan.
+        :param sync: Marker to scan for.
+        """
+        carry = b''
+        while True:
+            chunk = stream.read(SCAN_SIZE)
+            if not chunk:
+                return
+
+            data = carry + chunk
+            s_index = data.find(sync)
+            if s_index >= 0:
+                stream.unread(data[s_index:])
+                return
+
+            carry = data[len(data) - len(sync) + 1:]
+
+    def _iter_chunks(
+        self,
+        stream: io.IOBase,
+        errors: ErrorPolicy = ErrorPolicy.RAISE,
+        sync: Union[bytes, None] = None,
+        metrics: Union[ParseMetrics, None] = None,
+        as_records: bool = False,
+        match: Union[Callable[[Buffer, int, int], bool], None] = None,
+        values: Union[Callable[[Buffer, int, int], Tuple[Any, ...]], None] = None
+    ) -> Iterator[Data]:
+        """
+        Iterate over records in a stream, reading it in chunks into
+        a pooled buffer with `readinto` and parsing records from the buffer.
+        Only the data of fields is copied out of the buffer.
+        A record that does not fit in the buffer is read into a larger one.
+        Formats with pointer fields, or fields read until the end of the data,
+        are not supported.
+
+        Takes the same parameters as `_iter_buffer`.
+        """
+        parse = self._parse_buffer
+        if as_records:
+            make = self.format.to_record
+            if not self.format.has_hooks:
+                parse = self._parse_values
+
+        if (match is not None) or (values is not None):
+            record_stop = self._record_stop_function()
+
+        if values is not None:
+            def parse(buffer: Buffer, offset: int, end: int, strict: bool) -> Tuple[Tuple[Any, ...], int]:
+                return (values(buffer, offset, end), record_stop(buffer, offset, end))
+
+        buffer = self.pool.acquire(self.buffer_size)
+        filled = 0  # bytes of data in the buffer
+        pos = 0  # offset of the next record in the buffer
+        base = 0  # offset of the buffer in the stream
+        eof = False
+        try:
+            while True:
+                while pos < filled:
+                    try:
+                        if (match is not None) and (not match(buffer, pos, filled)):
+                            stop = record_stop(buffer, pos, filled)
+                            if metrics is not None:
+                                metrics.filtered += 1
+
+                            pos = stop
+                            continue
+
+                        data, stop = parse(buffer, pos, filled, strict=True)
+
+                    except RECORD_ERRORS as err:
+                        if isinstance(err, IncompleteRecord) and (not eof):
+                            # wait for the rest of the record
+                            break
+
+                        if errors is ErrorPolicy.RAISE:
+                            if isinstance(err, IncompleteRecord):
+                                err.offset = base + pos
+
+                            raise err
+
+                        if errors is ErrorPolicy.SKIP:
+                            stop = self._record_end(buffer, pos, filled)
+                            if (stop == filled) and (not eof):
+                                # end of record not yet read
+                                break
+
+                        else:
+                            stop = buffer.find(sync, pos + 1, filled)
+                            if stop < 0:
+                                # keep a possibly partial marker
+                                stop = filled if eof else max(pos + 1, filled - len(sync) + 1)
+
+                        if metrics is not None:
+                            metrics.errors += 1
+                            metrics.skipped.append((base + pos, base + stop))
+
+                        pos = stop
+                        continue
+
+                    if stop == pos:
+                        raise ValueError(f'Record at offset {base + pos} is empty')
+
+                    if metrics is not None:
+                        metrics.records += 1
+                        metrics.bytes += stop - pos
+
+                    pos = stop
+                    yield make(data) if (as_records and (values is None)) else data
+
+                if eof:
+                    return
+
+                # keep the pending data of a partial record
+                pending = filled - pos
+                if (pos == 0) and (filled == len(buffer)):
+                    larger = self.pool.acquire(2 * len(buffer))
+                    larger[:filled] = buffer[:filled]
+                    self.pool.release(buffer)
+                    buffer = larger
+
+                elif pending > 0:
+                    buffer.move(0, pos, pending)
+
+                base += pos
+                pos = 0
+                filled = pending
+                with memoryview(buffer) as view, view[filled:] as free:
+                    n = stream.readinto(free)
+
+                if not n:
+                    eof = True
+
+                else:
+                    filled += n
+
+        finally:
+            self.pool.release(buffer)
+
+    def _iter_io(
+        self,
+        stream: io.IOBase,
+        errors: ErrorPolicy = ErrorPolicy.RAISE,
+        sync: Union[bytes, None] = None,
+        metrics: Union[ParseMetrics, None] = None,
+        as_records: bool = False,
+        match: Union[Callable[[Buffer, int, int], bool], None] = None,
+        values: Union[Callable[[Buffer, int, int], Tuple[Any, ...]], None] = None,
+        chunked: bool = False
+    ) -> Iterator[Data]:
+        """
+        Iterate over records in a stream.
+        If `chunked`, the stream is read in chunks into pooled buffers,
+        see `_iter_chunks`, unless the format has pointer fields or fields
+        read until the end of the data. Otherwise fields are read one at a time,
+        so the stream is not read past the last record yielded, and if records
+        are filtered or only some values are read, the data of each record is
+        read before it is parsed.
+
+        :param stream: Stream to parse.
+        :param errors: How to handle invalid records.
+        :param sync: Marker to resynchronize on.
+        :param metrics: Metrics to update.
+        :param as_records: Yield records of the format's `record_type`.
+        :param match: Function selecting records to parse. See `_matcher`.
+        :param values: Function reading the values to yield for each record,
+            instead of parsing it. See `_reader`.
+        :param chunked: Read the stream in chunks, ahead of the records yielded.
+            Only for streams opened by the parser. [Default: False]
+        :returns Iterator[Data]: Iterator over the parsed records.
+        :raises TypeError: If the stream is neither peekable nor seekable.
+        :raises ValueError: If records are filtered or values are read
+            and the format has pointer fields.
+        """
+        if chunked and (not self.format.has_pointers) and (not _reads_to_end(self.format)):
+            yield from self._iter_chunks(stream, errors, sync, metrics, as_records, match, values)
+            return
+
+        if as_records and (values is None):
+            records = self._iter_io(stream, errors, sync, metrics, match=match)
+            yield from map(self.format.to_record, records)
+            return
+
+        if (match is not None) or (values is not None):
+            if self.format.has_pointers:
+                raise ValueError('Records with pointer fields can only be filtered in buffers')
+
+            def parse(stream: io.IOBase, strict: bool, complete: bool) -> Union[Data, Tuple, None]:
+                data = self._read_record(stream, strict=strict)
+                if (match is not None) and (not match(data, 0, len(data))):
+                    if metrics is not None:
+                        metrics.filtered += 1
+
+                    return None
+
+                if values is not None:
+                    return values(data, 0, len(data))
+
+                return self._parse_buffer(data, 0, len(data), strict=strict)[0]
+
+        else:
+            parse = self._parse_io
+
+        if (errors is ErrorPolicy.RAISE) and (metrics is None):
+            while not at_eof(stream):
+                data = parse(stream, strict=True, complete=False)
+                if data is not None:
+                    yield data
+
+            return
+
+        # track position
+        stream = PushbackReader(stream)
+        while not at_eof(stream):
+            start = stream.position
+            try:
+                data = parse(
+                    stream,
+                    strict=True,
+                    complete=(errors is ErrorPolicy.SKIP)
+                )
+
+            except RECORD_ERRORS as err:
+                if errors is ErrorPolicy.RAISE:
+                    if isinstance(err, IncompleteRecord):
+                        err.offset = start
+
+                    raise err
+
+                if errors is ErrorPolicy.RESYNC:
+                    self._scan_io(stream, sync)
+
+                if metrics is not None:
+                    metrics.errors += 1
+                    metrics.skipped.append((start, stream.position))
+
+                continue
+
+            if data is None:
+                # filtered
+                continue
+
+            if metrics is not None:
+                metrics.records += 1
+                metrics.bytes += stream.position - start
+
+            yield data
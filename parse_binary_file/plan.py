@@ -0,0 +1,268 @@
+"""
+Describe how a format is parsed.
+"""
+from __future__ import annotations
+from typing import Union, Tuple, Dict, Any, TYPE_CHECKING
+from dataclasses import dataclass, field
+
+from .field import struct_code
+
+if TYPE_CHECKING:
+    from .file_format import FileFormat
+    from .field_description import FieldDescription
+
+
+@dataclass(frozen=True)
+class FieldPlan():
+    """
+    How a field is parsed.
+
+    Properties:
+    + **index:** Index of the field.
+    + **name:** Name of the field.
+    + **type:** Type of the field.
+    + **offset:** Offset from the start of the record, if static.
+    + **size:** Size in bytes, if static.
+    + **gap:** Tuple of (padding, alignment) before the field.
+    + **locate:** How the end of the field is found.
+        One of 'size', 'remaining', 'terminator', 'codec', 'switch', 'pointer',
+        or 'hook' (set by the field's `pre` hook).
+    + **decode:** How the value is decoded when parsing records
+        without creating fields.
+        One of 'struct' (part of the record struct), 'unpack', 'bytes', 'str',
+        'codec', 'layout', or 'field' (the generic `Field` path).
+    + **note:** Why the field is not part of the record struct, if it is not.
+    + **cases:** Plans of the layouts of a switch field, by value.
+        The default layout has the key `None`.
+    """
+    index: int
+    name: Union[str, None]
+    type: str
+    offset: Union[int, None]
+    size: Union[int, None]
+    gap: Tuple[int, int]
+    locate: str
+    decode: str
+    note: Union[str, None] = None
+    cases: Dict[Any, ParsePlan] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ParsePlan():
+    """
+    How the records of a format are parsed.
+    Printing the plan shows a table of its fields.
+
+    Properties:
+    + **fields:** Plans of the fields.
+    + **size:** Size of records in bytes, if static.
+    + **min_size:** Minimum size of records in bytes.
+    + **struct_format:** Format of the record struct decoding all fields at once,
+        if the format has a static layout. See `FileFormat.struct_format`.
+    + **notes:** Notes on the format as a whole,
+        such as why records are not decoded by a single struct.
+    """
+    fields: Tuple[FieldPlan, ...]
+    size: Union[int, None]
+    min_size: int
+    struct_format: Union[str, None]
+    notes: Tuple[str, ...] = ()
+
+    def lines(self, indent: str = '') -> Tuple[str, ...]:
+        """
+        :param indent: Indent of each line.
+        :returns tuple[str, ...]: Lines describing the plan.
+        """
+        header = ('#', 'name', 'type', 'offset', 'size', 'gap', 'locate', 'decode', 'note')
+        rows = [header]
+        for f in self.fields:
+            padding, align = f.gap
+            gap = f'+{padding}' if padding else ''
+            if align > 1:
+                gap += f'@{align}'
+
+            rows.append((
+                str(f.index),
+                '' if f.name is None else f.name,
+                f.type,
+                '?' if f.offset is None else str(f.offset),
+                '?' if f.size is None else str(f.size),
+                gap or '-',
+                f.locate,
+                f.decode,
+                f.note or ''
+            ))
+
+        widths = [max(len(r[i]) for r in rows) for i in range(len(header))]
+        lines = [
+            indent + '  '.join(c.ljust(w) for c, w in zip(r, widths)).rstrip()
+            for r in rows
+        ]
+
+        for f in self.fields:
+            for key, case in f.cases.items():
+                label = 'default' if key is None else repr(key)
+                lines.append(f'{indent}case {label} of `{f.name}`:')
+                lines.extend(case.lines(indent + '    '))
+
+        if self.size is not None:
+            lines.append(f'{indent}bytes per record: {self.size}')
+
+        else:
+            lines.append(f'{indent}bytes per record: variable, at least {self.min_size}')
+
+        if self.struct_format is not None:
+            lines.append(f'{indent}record struct: {self.struct_format!r}')
+
+        lines.extend(f'{indent}note: {n}' for n in self.notes)
+        return tuple(lines)
+
+    def __str__(self) -> str:
+        return '\n'.join(self.lines())
+
+
+def _locate(fd: FieldDescription) -> str:
+    """
+    :returns str: How the end of the field is found. See `FieldPlan.locate`.
+    """
+    if fd.offset_from is not None:
+        return 'pointer'
+
+    if fd.switch is not None:
+        return 'switch'
+
+    if fd.is_hook_sized:
+        return 'hook'
+
+    if fd.is_self_terminated:
+        return 'codec'
+
+    if fd.size is not None:
+        return 'remaining' if fd.size < 0 else 'size'
+
+    return 'terminator'
+
+
+def _decode(fd: FieldDescription) -> Tuple[str, Union[str, None]]:
+    """
+    Mirrors the decoders of `field.value_decoder`.
+
+    :returns tuple[str, str | None]: Tuple of (decoder, reason for the
+        generic path). See `FieldPlan.decode`.
+    """
+    if fd.switch is not None:
+        return ('layout', None)
+
+    if fd.type == 'bytes':
+        return ('bytes', None)
+
+    if fd.type == 'str':
+        return ('str', None)
+
+    if fd.codec is not None:
+        return ('codec', None)
+
+    if (fd.format is not None) and (fd.data_type is not None) and (not fd.is_array):
+        return ('unpack', None)
+
+    return ('field', 'array type')
+
+
+def _min_size(fd: FieldDescription) -> int:
+    """
+    :returns int: Minimum size of the field in bytes.
+    """
+    if (fd.offset_from is not None) or fd.is_hook_sized:
+        return 0
+
+    if fd.switch is not None:
+        cases = [*fd.switch.cases.values(), fd.switch.default]
+        return min(explain_format(c).min_size for c in cases if c is not None)
+
+    if fd.is_self_terminated:
+        return 1
+
+    if fd.size is not None:
+        return max(fd.size, 0)
+
+    return len(fd.terminator)
+
+
+def explain_format(format: FileFormat) -> ParsePlan:
+    """
+    Resolve how the records of a format are parsed.
+    See `FileFormat.explain`.
+
+    :param format: Format to explain.
+    :returns ParsePlan: Plan of the format.
+    """
+    record_struct = format.struct_format
+    notes = []
+    if format.has_pointers:
+        notes.append('pointer fields: records are always parsed as fields')
+
+    if format.checksums:
+        notes.append('checksum fields: checksums are computed for each field')
+
+    if format.has_hooks:
+        notes.append('execution hooks: records are always parsed as fields')
+
+    if format.check_padding and format.has_gaps:
+        notes.append('checked padding: padding is checked for each record')
+
+    fields = []
+    min_size = 0
+    for i, (fd, offset, gap) in enumerate(zip(format.fields, format.offsets, format.gaps)):
+        decode, note = _decode(fd)
+        if record_struct is not None:
+            decode = 'struct'
+
+        elif note is None:
+            try:
+                struct_code(fd)
+
+            except ValueError as err:
+                note = str(err)
+
+        size = fd.size
+        if (size is not None) and ((size < 0) or fd.is_self_terminated or fd.is_hook_sized):
+            size = None
+
+        cases = {}
+        if fd.switch is not None:
+            cases = {k: explain_format(c) for k, c in fd.switch.cases.items()}
+            if fd.switch.default is not None:
+                cases[None] = explain_format(fd.switch.default)
+
+        if fd.offset_from is None:
+            min_size += gap[0] + _min_size(fd)
+
+        fields.append(FieldPlan(
+            i,
+            fd.name,
+            fd.type,
+            offset,
+            size,
+            gap,
+            _locate(fd),
+            decode,
+            note,
+            cases
+        ))
+
+    min_size += format.gaps[-1][0]
+    if (
+        (record_struct is None)
+        and (format.size is not None)
+        and (not notes)
+        and all(f.note is None for f in fields)
+    ):
+        notes.append('fields have different byte orders')
+
+    return ParsePlan(
+        tuple(fields),
+        format.size,
+        min_size,
+        record_struct,
+        tuple(notes)
+    )
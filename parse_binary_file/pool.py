@@ -0,0 +1,99 @@
+"""
+Pool of reusable read buffers.
+"""
+from __future__ import annotations
+import mmap
+import threading
+from typing import Dict, Any, List
+from dataclasses import dataclass
+
+
+DEFAULT_POOL_SIZE = 2
+
+
+@dataclass
+class PoolStats():
+    """
+    Counters for a `BufferPool`.
+
+    Properties:
+    + **allocations:** Number of buffers allocated.
+    + **bytes_allocated:** Number of bytes allocated.
+    + **reuses:** Number of times a pooled buffer was reused.
+    """
+    allocations: int = 0
+    bytes_allocated: int = 0
+    reuses: int = 0
+
+
+class BufferPool():
+    """
+    Keeps released buffers to be reused instead of allocating new ones.
+    Buffers are anonymous memory maps, which can be filled with `readinto`,
+    searched, and sliced to `bytes` like memory mapped files.
+    Thread safe.
+
+    :param size: Maximum number of released buffers kept.
+        `0` disables pooling. [Default: 2]
+    """
+    def __init__(self, size: int = DEFAULT_POOL_SIZE):
+        if size < 0:
+            raise ValueError('`size` can not be negative')
+
+        self.size = size
+        self.stats = PoolStats()
+        self._free: List[mmap.mmap] = []
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # buffers and locks can not be pickled
+        return {'size': self.size}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__init__(state['size'])
+
+    def acquire(self, size: int) -> mmap.mmap:
+        """
+        :param size: Minimum size of the buffer in bytes.
+        :returns mmap.mmap: Buffer of at least `size` bytes.
+        """
+        with self._lock:
+            for i, buf in enumerate(self._free):
+                if len(buf) >= size:
+                    self.stats.reuses += 1
+                    return self._free.pop(i)
+
+            self.stats.allocations += 1
+            self.stats.bytes_allocated += size
+
+        return mmap.mmap(-1, size)
+
+    def release(self, buffer: mmap.mmap):
+        """
+        Return a buffer to the pool, or close it if the pool is full.
+        The buffer must not be used after being released.
+
+        :param buffer: Buffer to release.
+        """
+        with self._lock:
+            if len(self._free) < self.size:
+                self._free.append(buffer)
+                return
+
+            if self._free:
+                # keep the largest buffers
+                smallest = min(range(len(self._free)), key=lambda i: len(self._free[i]))
+                if len(self._free[smallest]) < len(buffer):
+                    self._free[smallest], buffer = buffer, self._free[smallest]
+
+        buffer.close()
+
+    def clear(self):
+        """
+        Close all pooled buffers.
+        """
+        with self._lock:
+            free, self._free = self._free, []
+
+        for buf in free:
+            buf.close()
@@ -0,0 +1,217 @@
+"""
+Read-ahead stream that overlaps reading with parsing.
+"""
+from __future__ import annotations
+import io
+import time
+import queue
+import threading
+from typing import Union
+from dataclasses import dataclass
+
+
+DEFAULT_BUFFER_SIZE = 1 << 20  # 1 MiB
+DEFAULT_DEPTH = 4
+
+
+@dataclass
+class PrefetchStats():
+    """
+    Counters for a `PrefetchReader`.
+
+    Properties:
+    + **stall_time:** Seconds the consumer spent waiting for data.
+    + **fill_stall_time:** Seconds the background reader spent waiting
+        for a free buffer.
+    + **buffers:** Number of buffers filled.
+    + **bytes_read:** Number of bytes read from the underlying stream.
+    """
+    stall_time: float = 0
+    fill_stall_time: float = 0
+    buffers: int = 0
+    bytes_read: int = 0
+
+
+class PrefetchReader(io.BufferedIOBase):
+    """
+    Reads a stream ahead in a background thread.
+    The background thread fills a bounded ring of buffers while the
+    consumer reads from the previously filled buffer.
+    Closing the reader closes the underlying stream.
+
+    :param raw: Stream to read from.
+    :param buffer_size: Size of each buffer in bytes. [Default: 1 MiB]
+    :param depth: Number of buffers in the ring. [Default: 4]
+    """
+    def __init__(
+        self,
+        raw: io.IOBase,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        depth: int = DEFAULT_DEPTH
+    ):
+        if buffer_size < 1:
+            raise ValueError('`buffer_size` must be positive')
+
+        if depth < 1:
+            raise ValueError('`depth` must be positive')
+
+        super().__init__()
+        self.raw = raw
+        self.stats = PrefetchStats()
+
+        self._free: queue.Queue = queue.Queue()
+        self._filled: queue.Queue = queue.Queue()
+        for _ in range(depth):
+            self._free.put(bytearray(buffer_size))
+
+        self._current: Union[bytearray, None] = None
+        self._view: memoryview = memoryview(b'')
+        self._pos = 0
+        self._eof = False
+        self._stop = threading.Event()
+
+        self._thread = threading.Thread(target=self._fill, daemon=True)
+        self._thread.start()
+
+    def _fill(self):
+        """
+        Fill free buffers from the underlying stream.
+        Runs in the background thread.
+        """
+        while not self._stop.is_set():
+            t_start = time.perf_counter()
+            buf = self._free.get()
+            self.stats.fill_stall_time += time.perf_counter() - t_start
+            if buf is None:
+                # closed
+                return
+
+            try:
+                n = self.raw.readinto(buf)
+
+            except BaseException as err:
+                self._filled.put(err)
+                return
+
+            n = n or 0
+            self.stats.bytes_read += n
+            self._filled.put((buf, n))
+            if n == 0:
+                # end of stream
+                return
+
+            self.stats.buffers += 1
+
+    def _next_buffer(self) -> bool:
+        """
+        Release the current buffer and wait for the next one.
+
+        :returns bool: Whether a new buffer is available.
+        """
+        if self._current is not None:
+            self._view.release()
+            self._free.put(self._current)
+            self._current = None
+            self._view = memoryview(b'')
+            self._pos = 0
+
+        if self._eof:
+            return False
+
+        t_start = time.perf_counter()
+        item = self._filled.get()
+        self.stats.stall_time += time.perf_counter() - t_start
+
+        if isinstance(item, BaseException):
+            self._eof = True
+            raise item
+
+        buf, n = item
+        if n == 0:
+            self._eof = True
+            self._free.put(buf)
+            return False
+
+        self._current = buf
+        self._view = memoryview(buf)[:n]
+        self._pos = 0
+        return True
+
+    def _available(self) -> int:
+        """
+        :returns int: Number of bytes available, loading the next
+            buffer if needed. 0 at end of stream.
+        """
+        remaining = len(self._view) - self._pos
+        if (remaining == 0) and self._next_buffer():
+            remaining = len(self._view)
+
+        return remaining
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Union[int, None] = -1) -> bytes:
+        if (size is None) or (size < 0):
+            chunks = []
+            while self._available():
+                chunks.append(bytes(self._view[self._pos:]))
+                self._pos = len(self._view)
+
+            return b''.join(chunks)
+
+        chunks = []
+        while size > 0:
+            available = self._available()
+            if available == 0:
+                break
+
+            n = min(size, available)
+            chunks.append(bytes(self._view[self._pos:self._pos + n]))
+            self._pos += n
+            size -= n
+
+        return b''.join(chunks)
+
+    def read1(self, size: int = -1) -> bytes:
+        available = self._available()
+        if (size < 0) or (size > available):
+            size = available
+
+        data = bytes(self._view[self._pos:self._pos + size])
+        self._pos += size
+        return data
+
+    def readinto(self, b) -> int:
+        out = memoryview(b).cast('B')
+        n_read = 0
+        while n_read < len(out):
+            available = self._available()
+            if available == 0:
+                break
+
+            n = min(len(out) - n_read, available)
+            out[n_read:n_read + n] = self._view[self._pos:self._pos + n]
+            self._pos += n
+            n_read += n
+
+        return n_read
+
+    def peek(self, size: int = 0) -> bytes:
+        """
+        Return buffered bytes without advancing the position.
+        At least one byte is returned unless at end of stream.
+        """
+        self._available()
+        return bytes(self._view[self._pos:self._pos + max(size, 1)])
+
+    def close(self):
+        if self.closed:
+            return
+
+        self._stop.set()
+        self._free.put(None)
+        self._thread.join()
+        self._view.release()
+        self.raw.close()
+        super().close()
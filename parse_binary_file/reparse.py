@@ -0,0 +1,151 @@
+"""
+Parse records again after localized edits.
+"""
+from __future__ import annotations
+from typing import Union, Tuple, List, Dict, Sequence, TYPE_CHECKING
+
+from .data import Data, OffsetMap
+from .errors import IncompleteRecord
+
+if TYPE_CHECKING:
+    from .parser import Parser, Buffer
+    from .field import Field
+
+
+Span = Tuple[int, int]
+
+
+def _ranges(changed: Sequence[Span]) -> Tuple[Span, ...]:
+    """
+    :param changed: Ranges of changed offsets, as (start, stop).
+    :returns tuple[tuple[int, int], ...]: Sorted ranges.
+    :raises ValueError: If a range is invalid.
+    """
+    for start, stop in changed:
+        if not (0 <= start <= stop):
+            raise ValueError(f'Invalid changed range ({start}, {stop})')
+
+    return tuple(sorted(changed))
+
+
+def _overlaps(ranges: Sequence[Span], span: Span) -> bool:
+    """
+    :param ranges: Ranges of changed offsets.
+    :param span: Span of a field. Empty spans overlap ranges containing their start.
+    :returns bool: If the span overlaps a range.
+    """
+    start, stop = span
+    stop = max(stop, start + 1)
+    return any((s < stop) and (start < e) for s, e in ranges)
+
+
+def reparse_buffer(
+    parser: Parser,
+    data: Data,
+    buffer: Buffer,
+    changed: Sequence[Span]
+) -> Data:
+    """
+    Parse a record again after parts of its buffer changed,
+    reusing the fields of the previous parse whose data did not change.
+
+    A field is kept if it starts at the same offset as before,
+    its data does not overlap a changed range, and, for a switch field,
+    the field it switches on was kept.
+    Other fields are decoded again. Fields after bytes that were inserted
+    or removed are shifted, so are decoded again.
+    Pointer fields are always decoded again,
+    as are all fields after the first decoded field of a format with hooks.
+    Checksums are verified over the data of all fields.
+
+    :param parser: Parser of the record.
+    :param data: Data previously parsed from a buffer with `Parser.parse`.
+    :param buffer: Buffer containing the changed data.
+    :param changed: Ranges of offsets, as (start, stop), whose bytes
+        may differ from the previous buffer at the same offsets.
+        Bytes inserted or removed at an offset change all offsets after it,
+        up to where the data realigns.
+    :returns Data: Parsed record.
+    :raises ValueError: If the data was not parsed from a buffer by the
+        parser's format, or a range is invalid.
+    """
+    fmt = parser.format
+    offset_map = data.offset_map
+    if offset_map is None:
+        raise ValueError('Only data parsed from a buffer with `Parser.parse` can be parsed again')
+
+    if len(offset_map.spans) != len(fmt.fields):
+        raise ValueError('Data was not parsed with the format of the parser')
+
+    ranges = _ranges(changed)
+    end = len(buffer)
+    # fields ending at the end of the data may grow or shrink with it
+    limit = end + 1 if (end == offset_map.size) else min(end, offset_map.size)
+
+    fields: List[Field] = []
+    spans: List[Union[Span, None]] = []
+    running = {c.index: c.checksum.initial for c in fmt.checksums}
+    sources = fmt.pointer_sources
+    switches = fmt.switch_sources
+    padded = fmt.has_gaps
+    hooked = fmt.has_hooks
+    decoded = False  # if a field was decoded again
+    offset = 0
+    blocks: Dict = {}
+    for i, fd in enumerate(fmt.fields):
+        if sources[i] is not None:
+            def read_block(b_offset: int) -> bytes:
+                if not (0 <= b_offset <= end):
+                    raise IncompleteRecord(f'Offset {b_offset} is out of bounds for {fd}', 0)
+
+                stop = parser._locate(buffer, b_offset, end, fd, strict=True)
+                return buffer[b_offset:stop]
+
+            f, f_data = parser._pointer_field(fd, fields[sources[i]].value, read_block, blocks)
+            spans.append(None)
+
+        else:
+            if padded:
+                offset = parser._skip(buffer, i, offset, 0, end)
+
+            span = offset_map.spans[i]
+            keep = (
+                (span is not None)
+                and (span[0] == offset)
+                and (span[1] < limit)
+                and (not _overlaps(ranges, span))
+                and ((switches[i] is None) or (fields[switches[i]] is data.fields[switches[i]]))
+                and not (hooked and decoded)
+            )
+
+            if keep:
+                f = data.fields[i]
+                stop = span[1]
+
+            elif switches[i] is not None:
+                f, stop = parser._switch_field(fd, fields[switches[i]].value, buffer, offset, end)
+
+            else:
+                size = parser._pre_size(i, buffer, 0, offset, fields) if hooked else None
+                stop = parser._locate(buffer, offset, end, fd, size=size)
+                f = parser._field(buffer[offset:stop], fd)
+
+            decoded = decoded or (not keep)
+            f_data = buffer[offset:stop] if (running or (hooked and not keep)) else None
+            spans.append((offset, stop))
+            offset = stop
+
+        if running:
+            parser._update_checksums(running, i, f_data, f)
+
+        if hooked and (f is not data.fields[i]):
+            parser._post_value(i, f, f_data, fields)
+
+        fields.append(f)
+
+    if padded:
+        parser._skip(buffer, len(fields), offset, 0, end)
+
+    new = Data(tuple(fields))
+    new._offset_map = OffsetMap(tuple(spans), end)
+    return new
@@ -0,0 +1,42 @@
+"""
+Tagged unions, whose layout is selected by the value of a previous field.
+"""
+from __future__ import annotations
+from typing import Union, Any, Dict, TYPE_CHECKING
+from dataclasses import dataclass
+
+if TYPE_CHECKING:
+    from .file_format import FileFormat
+
+
+@dataclass(frozen=True)
+class Switch():
+    """
+    Describes the layouts a field may take.
+
+    Properties:
+    + **on:** Name or index of the previous field whose value selects the layout.
+    + **cases:** Dictionary of {value: FileFormat}.
+    + **default:** Layout used if the value has no case.
+        [Default: None, raise an error]
+    """
+    on: Union[str, int]
+    cases: Dict[Any, FileFormat]
+    default: Union[FileFormat, None] = None
+
+    def __post_init__(self):
+        for case in (*self.cases.values(), self.default):
+            if (case is not None) and case.has_pointers:
+                raise ValueError('Layouts of switch fields can not contain pointer fields')
+
+    def case(self, value: Any) -> FileFormat:
+        """
+        :param value: Value of the field switched on.
+        :returns FileFormat: Layout for the value.
+        :raises ValueError: If the value has no case and there is no default.
+        """
+        case = self.cases.get(value, self.default)
+        if case is None:
+            raise ValueError(f'No case for value {value!r} of `{self.on}`')
+
+        return case
@@ -0,0 +1,86 @@
+"""
+Test filtering and aggregating records.
+"""
+import io
+import struct
+import pytest
+
+from .parser import Parser
+from .file_format import FileFormat
+from .metrics import ParseMetrics
+
+
+@pytest.fixture
+def sample_format():
+    return FileFormat.from_dicts([
+        {'name': 'channel', 'type': 'u_short'},
+        {'name': 'timestamp', 'type': 'u_int'},
+        {'name': 'value', 'type': 'double'},
+    ], info={'byte_order': 'little'})
+
+
+@pytest.fixture
+def samples():
+    return b''.join(
+        struct.pack('<HId', i % 3, i, float(i))
+        for i in range(12)
+    )
+
+
+def test_where(sample_format, samples):
+    parser = Parser(sample_format)
+    metrics = ParseMetrics()
+    records = list(parser.iter_records(
+        samples,
+        where={'channel': lambda c: c == 1, 'timestamp': lambda t: t < 8},
+        metrics=metrics
+    ))
+
+    assert [r['timestamp'].value for r in records] == [1, 4, 7]
+    assert (metrics.records, metrics.filtered) == (3, 9)
+
+    records = list(parser.iter_records(io.BytesIO(samples), where={'channel': lambda c: c == 2}))
+    assert [r['timestamp'].value for r in records] == [2, 5, 8, 11]
+
+
+def test_where_variable_layout():
+    fmt = FileFormat.from_dicts([
+        {'name': 'name', 'type': 'str', 'terminator': b'\x00'},
+        {'name': 'value', 'type': 'u_short'},
+    ], info={'byte_order': 'little'})
+
+    data = b'a\x00\x01\x00bb\x00\x02\x00c\x00\x03\x00'
+    records = Parser(fmt).parse_records(data)
+    assert len(records) == 3
+    records = list(Parser(fmt).iter_records(data, where={'value': lambda v: v != 2}, as_records=True))
+    assert [r.name for r in records] == ['a', 'c']
+
+
+def test_aggregate(sample_format, samples):
+    parser = Parser(sample_format)
+    summary = parser.aggregate(samples, ['value'])['value']
+    assert (summary.count, summary.sum, summary.min, summary.max) == (12, 66.0, 0.0, 11.0)
+    assert summary.mean == 5.5
+
+    groups = parser.aggregate(
+        io.BytesIO(samples),
+        ['value', 'timestamp'],
+        by='channel',
+        where={'timestamp': lambda t: t >= 3}
+    )
+
+    assert sorted(groups) == [0, 1, 2]
+    assert groups[0]['value'].count == 3
+    assert groups[1]['timestamp'].min == 4
+    assert groups[2]['value'].sum == 5 + 8 + 11
+
+
+def test_aggregate_errors(sample_format, samples):
+    parser = Parser(sample_format)
+    with pytest.raises(KeyError):
+        parser.aggregate(samples, ['missing'])
+
+    metrics = ParseMetrics()
+    summary = parser.aggregate(samples[:-4], ['timestamp'], errors='skip', metrics=metrics)
+    assert summary['timestamp'].count == 11
+    assert metrics.errors == 1
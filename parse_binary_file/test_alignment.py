@@ -0,0 +1,109 @@
+"""
+Test alignment and padding.
+"""
+import io
+import struct
+import pytest
+
+from .parser import Parser
+from .file_format import FileFormat
+from .metrics import ParseMetrics
+
+
+@pytest.fixture
+def c_format():
+    # struct { char tag; int value; short flags; }
+    return FileFormat.from_dicts([
+        {'name': 'tag', 'type': 'char'},
+        {'name': 'value', 'type': 'int'},
+        {'name': 'flags', 'type': 'short'},
+    ], info={'byte_order': 'little', 'align': 8})
+
+
+@pytest.fixture
+def c_records():
+    return b''.join(
+        struct.pack('<c3xih2x', bytes([65 + i]), i * 100, -i)
+        for i in range(3)
+    )
+
+
+def test_static_layout(c_format):
+    assert c_format.offsets == (0, 4, 8)
+    assert c_format.size == 12
+    assert c_format.gaps == ((0, 1), (3, 1), (0, 1), (2, 1))
+    assert c_format.struct_format == '<c3xih2x'
+
+
+def test_parse(c_format, c_records):
+    parser = Parser(c_format)
+    records = parser.parse_records(c_records)
+    assert [len(r.fields) for r in records] == [3, 3, 3]
+    assert [r['value'].value for r in records] == [0, 100, 200]
+    assert [r['flags'].value for r in records] == [0, -1, -2]
+
+    records = parser.parse_records(io.BytesIO(c_records))
+    assert [r['tag'].value for r in records] == [b'A', b'B', b'C']
+
+    records = parser.parse_records(c_records, as_records=True)
+    assert records[2] == c_format.record_type(b'C', 200, -2)
+
+
+def test_dynamic_alignment(tmp_path):
+    fmt = FileFormat.from_dicts([
+        {'name': 'name', 'type': 'str', 'terminator': b'\x00'},
+        {'name': 'value', 'type': 'u_int', 'align': 4},
+        {'name': 'tail', 'size': 1, 'padding': 2},
+    ], info={'byte_order': 'little'})
+
+    assert fmt.offsets == (0, None, None)
+    data = b'ab\x00\x00' + (7).to_bytes(4, 'little') + b'\x00\x00x\x00'
+    records = Parser(fmt).parse_records(data + data)
+    assert [r['value'].value for r in records] == [7, 7]
+    assert records[1]['tail'].value == b'x'
+
+    records = Parser(fmt).parse_records(io.BytesIO(data + data))
+    assert [r['tail'].value for r in records] == [b'x', b'x']
+
+    path = tmp_path / 'record.bin'
+    path.write_bytes(data)
+    with Parser(fmt).parse_file(path, lazy=True) as lazy:
+        assert lazy['tail'].value == b'x'
+
+
+def test_check_padding(c_records):
+    fmt = FileFormat.from_dicts([
+        {'name': 'tag', 'type': 'char'},
+        {'name': 'value', 'type': 'int'},
+        {'name': 'flags', 'type': 'short'},
+    ], info={'byte_order': 'little', 'align': 8, 'check_padding': True})
+
+    parser = Parser(fmt)
+    assert len(parser.parse_records(c_records)) == 3
+    with pytest.raises(ValueError):
+        parser.parse(b'A\x01\x00\x00' + bytes(8))
+
+    bad = b'A\x01\x00\x00' + bytes(8)
+    assert fmt.struct_format is None
+    with pytest.raises(ValueError):
+        parser.parse_records(bad, as_records=True)
+
+
+@pytest.mark.parametrize('check_padding', [False, True])
+def test_resync_aligned(check_padding):
+    fmt = FileFormat.from_dicts([
+        {'name': 'm', 'value': b'M'},
+        {'name': 'tag', 'value': b'TAG!', 'align': 4},
+        {'name': 'value', 'type': 'u_int'},
+    ], info={'byte_order': 'little', 'check_padding': check_padding})
+
+    assert fmt.prefix == (b'M\x00\x00\x00TAG!' if check_padding else b'M')
+
+    record = b'M\x00\x00\x00TAG!' + (7).to_bytes(4, 'little')
+    data = b'garbage' + record + record
+    parser = Parser(fmt)
+    for stream in (data, io.BytesIO(data)):
+        metrics = ParseMetrics()
+        records = parser.parse_records(stream, errors='resync', metrics=metrics)
+        assert [r['value'].value for r in records] == [7, 7]
+        assert metrics.skipped == [(0, 7)]
@@ -0,0 +1,61 @@
+"""
+Test bit fields.
+"""
+import pytest
+
+from .parser import Parser
+from .file_format import FileFormat
+from .field_description import FieldDescription
+from .bitfield import BitField
+from .errors import IncompatibleProperties
+
+
+@pytest.fixture
+def header_format():
+    return FileFormat.from_dicts([
+        {
+            'name': 'flags',
+            'type': 'u_short',
+            'bits': [
+                {'name': 'ready', 'offset': 0},
+                {'name': 'mode', 'offset': 1, 'width': 3},
+                {'name': 'level', 'offset': 12, 'width': 4, 'signed': True},
+            ]
+        },
+    ], info={'byte_order': 'little'})
+
+
+def test_extract():
+    b = BitField('level', 4, 4, signed=True)
+    assert b.mask == 0xf
+    assert b.extract(0x70) == 7
+    assert b.extract(0xf0) == -1
+    assert BitField('level', 4, 4).extract(0xf0) == 15
+    assert b.insert(0xf0f, -2) == 0xfef
+    with pytest.raises(ValueError):
+        b.insert(0, 8)
+
+
+def test_bit_values(header_format):
+    data = Parser(header_format).parse((0xe00b).to_bytes(2, 'little'))
+    assert data['flags'].bit_values == {'ready': 1, 'mode': 5, 'level': -2}
+
+
+def test_invalid_bit_fields():
+    with pytest.raises(IncompatibleProperties):
+        FieldDescription(type='str', size=2, bits=[{'name': 'a', 'offset': 0}])
+
+    with pytest.raises(ValueError):
+        FieldDescription(type='u_short', bits=[{'name': 'a', 'offset': 12, 'width': 5}])
+
+
+def test_bit_columns(header_format):
+    np = pytest.importorskip('numpy')
+    values = [0xe00b, 0x0000, 0x700e]
+    buffer = b''.join(v.to_bytes(2, 'little') for v in values)
+    columns = Parser(header_format).parse_columns(buffer)
+
+    assert isinstance(columns['flags.mode'], np.ndarray)
+    assert columns['flags.ready'].tolist() == [1, 0, 0]
+    assert columns['flags.mode'].tolist() == [5, 0, 7]
+    assert columns['flags.level'].tolist() == [-2, 0, 7]
@@ -0,0 +1,69 @@
+"""
+Test ParseCache functionality.
+"""
+import os
+import pytest
+
+from .cache import ParseCache
+from .parser import Parser
+from .file_format import FileFormat
+from .field_description import FieldDescription
+
+
+@pytest.fixture
+def msg_format():
+    return FileFormat.from_dicts([
+        {'name': 'head', 'value': b'\xff\x00'},
+        {'name': 'file_size', 'type': 'int'},
+        {'size': 4, 'is_null': True},
+        {'name': 'greeting', 'type': 'str', 'terminator': b'\x00'},
+        {'name': 'message', 'type': 'str', 'size': -1}
+    ], info={'byte_order': 'little'})
+
+
+@pytest.fixture
+def msg_file(tmp_path):
+    path = tmp_path / 'my_message.msg'
+    path.write_bytes(b'\xff\x00\x12\x00\x00\x00\x00\x00\x00\x00hi\x00hello')
+    return path
+
+
+@pytest.mark.parametrize('key', ['content', 'stat'])
+def test_cache_hit_returns_equal_data(tmp_path, msg_format, msg_file, key):
+    cache = ParseCache(tmp_path / 'cache', key=key)
+    parser = Parser(msg_format, cache=cache)
+
+    assert cache.get(msg_file, msg_format) is None
+    data = parser.parse_file(msg_file)
+    cached = cache.get(msg_file, msg_format)
+    assert cached is not None
+    assert cached.value == data.value
+    assert cached['greeting'].data == b'hi\x00'
+    assert parser.parse_file(msg_file).named_field_values == data.named_field_values
+
+
+def test_changed_format_misses(tmp_path, msg_format, msg_file):
+    cache = ParseCache(tmp_path / 'cache')
+    Parser(msg_format, cache=cache).parse_file(msg_file)
+
+    other = FileFormat.from_dicts([{'name': 'all', 'size': -1}])
+    assert cache.get(msg_file, other) is None
+
+
+def test_function_fingerprints():
+    def hooked(hook):
+        return FileFormat([FieldDescription('u_short', exec={'post': hook})])
+
+    def scaled(n):
+        return lambda data, fields: data * n
+
+    # functions with the same name are told apart by their code and closure
+    assert hooked(lambda data, fields: 1).fingerprint() != hooked(lambda data, fields: 2).fingerprint()
+    assert hooked(scaled(2)).fingerprint() != hooked(scaled(3)).fingerprint()
+    assert hooked(scaled(2)).fingerprint() == hooked(scaled(2)).fingerprint()
+
+
+def test_eviction(tmp_path, msg_format, msg_file):
+    cache = ParseCache(tmp_path / 'cache', max_size=0)
+    Parser(msg_format, cache=cache).parse_file(msg_file)
+    assert len(os.listdir(cache.directory)) == 0
@@ -0,0 +1,64 @@
+"""
+Test checksum functionality.
+"""
+import io
+import zlib
+import pytest
+
+from .checksum import Checksum
+from .parser import Parser
+from .file_format import FileFormat
+from .field_description import FieldDescription
+from .errors import ChecksumMismatch
+
+
+@pytest.fixture
+def crc_format():
+    return FileFormat.from_dicts([
+        {'name': 'head', 'value': b'\xaa'},
+        {'name': 'body', 'type': 'str', 'terminator': b'\x00'},
+        {'name': 'crc', 'checksum': {'algorithm': 'crc32', 'start': 'body'}},
+        {'name': 'adler', 'checksum': {'algorithm': 'adler32'}}
+    ], info={'byte_order': 'big'})
+
+
+def make_record(body: bytes) -> bytes:
+    record = b'\xaa' + body + b'\x00'
+    record += zlib.crc32(body + b'\x00').to_bytes(4, 'big')
+    return record + zlib.adler32(record).to_bytes(4, 'big')
+
+
+def test_checksum_defaults_to_unsigned_int():
+    fd = FieldDescription(checksum=Checksum('crc32'))
+    assert fd.type == 'u_int'
+    assert fd.size == 4
+
+
+def test_invalid_algorithm_raises_value_error():
+    with pytest.raises(ValueError):
+        Checksum('md5')
+
+
+def test_checksum_must_follow_covered_fields():
+    with pytest.raises(ValueError):
+        FileFormat([
+            FieldDescription(name='crc', checksum={'algorithm': 'crc32', 'end': 'body'}),
+            FieldDescription(name='body', size=4)
+        ])
+
+
+def test_valid_checksums(crc_format):
+    in_data = make_record(b'hello') + make_record(b'there')
+    parser = Parser(crc_format)
+    assert len(list(parser.iter_records(in_data))) == 2
+    assert len(list(parser.iter_records(io.BytesIO(in_data)))) == 2
+
+
+def test_invalid_checksum_raises_checksum_mismatch(crc_format):
+    in_data = bytearray(make_record(b'hello'))
+    in_data[2] = ord('j')
+
+    with pytest.raises(ChecksumMismatch) as err:
+        Parser(crc_format).parse(bytes(in_data))
+
+    assert err.value.field.name == 'crc'
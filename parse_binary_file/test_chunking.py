@@ -0,0 +1,54 @@
+"""
+Test chunking functionality.
+"""
+import pytest
+
+from .chunking import chunk_boundaries, read_index, write_index
+from .parser import Parser
+from .file_format import FileFormat
+
+
+def test_chunk_boundaries_from_record_size():
+    buffer = bytes(40)
+    chunks = chunk_boundaries(buffer, 3, record_size=4)
+    assert chunks[0][0] == 0
+    assert chunks[-1][1] == 40
+    assert all(s % 4 == 0 for s, _ in chunks)
+
+
+def test_chunk_boundaries_from_sync():
+    buffer = b'\xaa\x01\x02\x03' * 4 + b'\xaa\x04'
+    chunks = chunk_boundaries(buffer, 3, sync=b'\xaa')
+    assert chunks[0][0] == 0
+    assert chunks[-1][1] == len(buffer)
+    assert all(buffer[s:s + 1] == b'\xaa' for s, _ in chunks)
+
+
+def test_chunk_boundaries_without_method_raises_value_error():
+    with pytest.raises(ValueError):
+        chunk_boundaries(bytes(8), 2)
+
+
+def test_index_round_trip(tmp_path):
+    path = tmp_path / 'records.idx'
+    write_index(path, [0, 4, 10])
+    assert read_index(path) == (0, 4, 10)
+
+
+def test_parse_records_in_parallel(tmp_path):
+    ff = FileFormat.from_dicts([
+        {'name': 'head', 'value': b'\xaa'},
+        {'name': 'number', 'type': 'int'}
+    ], info={'byte_order': 'little'})
+
+    path = tmp_path / 'records.bin'
+    path.write_bytes(b''.join(
+        b'\xaa' + i.to_bytes(4, 'little') for i in range(100)
+    ))
+
+    parser = Parser(ff)
+    records = parser.parse_records(path, processes=2)
+    assert [r['number'].value for r in records] == list(range(100))
+
+    records = parser.parse_records(path, processes=2, sync=b'\xaa')
+    assert len(records) == 100
@@ -0,0 +1,113 @@
+"""
+Test command line interface.
+"""
+import json
+import pytest
+
+from .cli import main, expand_paths
+
+
+@pytest.fixture
+def description(tmp_path):
+    path = tmp_path / 'format.json'
+    path.write_text(json.dumps({
+        'info': {'byte_order': 'little'},
+        'fields': [
+            {'name': 'head', 'value': 'RC'},
+            {'name': 'id', 'type': 'u_int'},
+            {'name': 'tag', 'type': 'str', 'size': 2},
+        ]
+    }))
+
+    return path
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    path = tmp_path / 'data'
+    (path / 'sub').mkdir(parents=True)
+    for i, name in enumerate(['a.bin', 'b.bin', 'sub/c.bin']):
+        (path / name).write_bytes(b'RC' + i.to_bytes(4, 'little') + b'ab')
+
+    return path
+
+
+def test_expand_paths(data_dir):
+    assert len(expand_paths([str(data_dir)])) == 3
+    assert len(expand_paths([str(data_dir / '*.bin')])) == 2
+    with pytest.raises(FileNotFoundError):
+        expand_paths([str(data_dir / '*.txt')])
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_jsonl_output_with_projection(description, data_dir, tmp_path, processes, capsys):
+    out = tmp_path / 'out.jsonl'
+    status = main([
+        str(description), str(data_dir),
+        '-p', str(processes), '--fields', 'id', '-o', str(out)
+    ])
+
+    assert status == 0
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [r['id'] for r in rows] == [0, 1, 2]
+    assert set(rows[0]) == {'file', 'id'}
+    assert '3 files, 3 records' in capsys.readouterr().err
+
+
+def test_failed_files_are_reported(description, data_dir, capsys):
+    (data_dir / 'bad.bin').write_bytes(b'XX')
+    assert main([str(description), str(data_dir), '-q']) == 1
+    assert 'bad.bin' in capsys.readouterr().err
+
+
+def test_unknown_field(description, data_dir):
+    assert main([str(description), str(data_dir), '--fields', 'nope']) == 2
+
+
+def test_fields_conflicting_with_columns(tmp_path, data_dir, capsys):
+    path = tmp_path / 'conflict.json'
+    path.write_text(json.dumps({
+        'info': {'byte_order': 'little'},
+        'fields': [
+            {'name': 'head', 'value': 'RC'},
+            {'name': 'record', 'type': 'u_int'},
+            {'name': 'tag', 'type': 'str', 'size': 2},
+        ]
+    }))
+
+    assert main([str(path), str(data_dir), '--records']) == 2
+    assert 'record' in capsys.readouterr().err
+    assert main([str(path), str(data_dir), '--fields', 'tag', '--records', '-q']) == 0
+
+
+def test_npz_output(description, data_dir, tmp_path):
+    np = pytest.importorskip('numpy')
+    out = tmp_path / 'out.npz'
+    assert main([str(description), str(data_dir), '-f', 'npz', '-o', str(out), '-q']) == 0
+
+    with np.load(out) as columns:
+        assert columns['id'].tolist() == [0, 1, 2]
+        assert columns['tag'].tolist() == ['ab'] * 3
+
+
+def test_switch_output(tmp_path, capsys):
+    path = tmp_path / 'switch.json'
+    path.write_text(json.dumps({
+        'info': {'byte_order': 'little'},
+        'fields': [
+            {'name': 'kind', 'type': 'u_short'},
+            {'name': 'body', 'switch': {
+                'on': 'kind',
+                'cases': {
+                    '1': [{'name': 'value', 'type': 'u_short'}],
+                    '2': [{'name': 'raw', 'size': 2}],
+                }
+            }},
+        ]
+    }))
+
+    data = tmp_path / 'records.bin'
+    data.write_bytes(b'\x01\x00\x09\x00\x02\x00ab')
+    assert main([str(path), str(data), '--records', '-q']) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r['body'] for r in rows] == [{'value': 9}, {'raw': '6162'}]
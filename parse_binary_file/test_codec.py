@@ -0,0 +1,108 @@
+"""
+Test codec functionality.
+"""
+import io
+import pytest
+
+from .codec import Codec, register_codec, get_codec, _registry
+from .parser import Parser
+from .file_format import FileFormat
+from .field_description import FieldDescription
+
+
+def test_varint():
+    codec = get_codec('varint')
+    buffer = b'\x01\xac\x02\x80\x80\x01'
+    assert codec.size(buffer, 1) == 2
+    assert codec.decode(buffer, 1) == 300
+    assert codec.decode_all(buffer, 0, len(buffer)) == [1, 300, 16384]
+
+
+def test_unterminated_varint_size_raises_index_error():
+    with pytest.raises(IndexError):
+        get_codec('varint').size(b'\x80\x80', 0)
+
+
+def test_zigzag():
+    codec = get_codec('zigzag')
+    assert codec.decode_all(b'\x00\x01\x02\x03', 0, 4) == [0, -1, 1, -2]
+
+
+def test_length_prefixed_str():
+    codec = get_codec('lp_str')
+    assert codec.size(b'\x05hello', 0) == 6
+    assert codec.decode(b'\x05hello', 0) == 'hello'
+
+    with pytest.raises(IndexError):
+        codec.size(b'\x05hell', 0)
+
+    # the size is known from the prefix alone
+    assert codec.peek_size(b'\x05', 0) == 6
+    with pytest.raises(IndexError):
+        codec.peek_size(b'\x80', 0)
+
+
+def test_codec_types_do_not_need_termination():
+    fd = FieldDescription(type='varint')
+    assert fd.codec is get_codec('varint')
+    assert fd.data_type is None
+
+    with pytest.raises(ValueError):
+        FieldDescription(type='[varint]')
+
+
+def test_parse_codec_fields():
+    ff = FileFormat.from_dicts([
+        {'name': 'id', 'type': 'varint'},
+        {'name': 'delta', 'type': 'zigzag'},
+        {'name': 'label', 'type': 'lp_str'},
+        {'name': 'values', 'type': '[varint]', 'size': 3}
+    ])
+
+    in_data = b'\xac\x02\x03\x02hi\x01\xac\x02' * 2
+    parser = Parser(ff)
+    for records in (
+        list(parser.iter_records(in_data)),
+        list(parser.iter_records(io.BytesIO(in_data)))
+    ):
+        assert len(records) == 2
+        assert records[0].value == (300, -2, 'hi', [1, 300])
+
+
+def test_codec_types_reject_expected_values():
+    for value in (5, b'\x05'):
+        with pytest.raises(ValueError, match='codec type'):
+            FileFormat.from_dicts([{'name': 'n', 'type': 'varint', 'value': value}])
+
+    with pytest.raises(ValueError, match='codec type'):
+        FileFormat.from_dicts([{'name': 's', 'type': 'lp_str', 'terminator': '\x00'}])
+
+
+def test_read_length_prefixed_from_stream():
+    class CountingStream(io.BytesIO):
+        reads = 0
+
+        def read(self, size=-1):
+            self.reads += 1
+            return super().read(size)
+
+    ff = FileFormat.from_dicts([{'name': 'label', 'type': 'lp_bytes'}])
+    value = bytes(range(200)) * 5
+    stream = CountingStream(b'\xe8\x07' + value)
+    assert Parser(ff).parse(stream)['label'].value == value
+    # one read per prefix byte, and one for the rest of the value
+    assert stream.reads == 3
+
+
+def test_register_codec():
+    codec = Codec('test_byte', lambda b, o: 1, lambda b, o: b[o] * 2)
+    register_codec(codec)
+    try:
+        with pytest.raises(ValueError):
+            register_codec(codec)
+
+        ff = FileFormat.from_dicts([{'name': 'b', 'type': 'test_byte'}])
+        assert Parser(ff).parse(b'\x02')['b'].value == 4
+
+    finally:
+        _registry.pop('test_byte', None)
@@ -0,0 +1,126 @@
+"""
+Test Columns functionality.
+"""
+import array
+import pytest
+
+from .parser import Parser
+from .file_format import FileFormat
+from .metrics import ParseMetrics
+from .columns import Columns, ArrayColumn, export_columns, column_names
+
+
+@pytest.fixture
+def record_format():
+    return FileFormat.from_dicts([
+        {'value': b'RC'},
+        {'name': 'id', 'type': 'u_int'},
+        {'name': 'temp', 'type': 'double'},
+        {'name': 'tag', 'type': 'str', 'size': 2},
+    ], info={'byte_order': 'little'})
+
+
+def make_records(n):
+    return b''.join(
+        b'RC'
+        + i.to_bytes(4, 'little')
+        + array.array('d', [i / 2]).tobytes()
+        + b'ab'
+        for i in range(n)
+    )
+
+
+def test_column_names_are_unique():
+    ff = FileFormat.from_dicts([
+        {'name': 'x', 'type': 'bool'},
+        {'type': 'bool'},
+        {'name': 'x', 'type': 'bool'},
+    ])
+
+    assert column_names(ff) == ((0, 'x'), (2, 'x[1]'))
+
+
+def test_columns_from_records(record_format):
+    np = pytest.importorskip('numpy')
+    columns = Parser(record_format).parse_columns(make_records(5))
+
+    assert columns.keys() == ('id', 'temp', 'tag')
+    assert len(columns) == 5
+    assert isinstance(columns['id'], np.ndarray)
+    assert columns['id'].tolist() == [0, 1, 2, 3, 4]
+    assert columns['temp'].tolist() == [0, 0.5, 1, 1.5, 2]
+    assert columns['tag'] == ['ab'] * 5
+
+
+def test_export_columns_round_trip(record_format):
+    records = Parser(record_format).parse_records(make_records(3))
+    descriptors = [export_columns(records[:2], record_format), export_columns(records[2:], record_format)]
+
+    assert set(descriptors[0].shared) == {'id', 'temp'}
+    with Columns.from_descriptors(descriptors, record_format) as columns:
+        assert len(columns.chunks) == 2
+        assert list(columns['id']) == [0, 1, 2]
+        assert list(columns['tag']) == ['ab'] * 3
+
+
+def test_parallel_columns(record_format, tmp_path):
+    path = tmp_path / 'records.bin'
+    path.write_bytes(make_records(100))
+    metrics = ParseMetrics()
+    parser = Parser(record_format)
+
+    with parser.parse_columns(path, processes=2, metrics=metrics) as columns:
+        assert list(columns['id']) == list(range(100))
+        assert list(columns['temp']) == [i / 2 for i in range(100)]
+
+    assert metrics.records == 100
+
+
+@pytest.fixture
+def array_format():
+    return FileFormat.from_dicts([
+        {'value': b'A'},
+        {'name': 'count', 'type': 'u_short'},
+        # values of a single byte each
+        {'name': 'values', 'type': '[zigzag]', 'exec': {'pre': 'lambda data, fields: fields["count"].value'}},
+    ], info={'byte_order': 'little'})
+
+
+def make_array_records(n):
+    # zigzag encoded values `0` to `i % 4`
+    return b''.join(
+        b'A' + (i % 4).to_bytes(2, 'little') + bytes(2 * v for v in range(i % 4))
+        for i in range(n)
+    )
+
+
+def test_array_columns_are_shared(array_format):
+    records = Parser(array_format).parse_records(make_array_records(6))
+    expected = [r['values'].value for r in records]
+    assert expected[3] == [0, 1, 2]
+
+    descriptor = export_columns(records, array_format)
+    # numeric arrays are not pickled
+    assert set(descriptor.arrays) == {'values'}
+    assert 'values' not in descriptor.objects
+
+    descriptors = [descriptor, export_columns([], array_format)]
+    with Columns.from_descriptors(descriptors, array_format) as columns:
+        assert isinstance(columns['values'], ArrayColumn)
+        assert columns['values'].tolist() == expected
+        assert list(columns.chunks[0]['values'][3]) == [0, 1, 2]
+        assert len(columns.chunks[1]['values']) == 0
+
+    columns = Parser(array_format).parse_columns(make_array_records(6))
+    assert columns['values'].tolist() == expected
+
+
+def test_parallel_array_columns(array_format, tmp_path):
+    path = tmp_path / 'records.bin'
+    path.write_bytes(make_array_records(100))
+    parser = Parser(array_format)
+    expected = [r['values'].value for r in parser.parse_records(path)]
+
+    with parser.parse_columns(path, processes=2, sync=b'A') as columns:
+        assert len(columns.chunks) > 1
+        assert columns['values'].tolist() == expected
@@ -0,0 +1,66 @@
+"""
+Test compression functionality.
+"""
+import gzip
+import bz2
+import lzma
+import pytest
+
+from .compression import detect_compression
+from .parser import Parser
+from .file_format import FileFormat
+
+
+@pytest.mark.parametrize('compression, module', [
+    ('gzip', gzip), ('bz2', bz2), ('xz', lzma)
+])
+def test_detect_compression(compression, module):
+    assert detect_compression(module.compress(b'data')) == compression
+
+
+def test_detect_uncompressed():
+    assert detect_compression(b'\x00\x01\x02\x03') is None
+
+
+@pytest.mark.parametrize('module', [gzip, bz2, lzma])
+@pytest.mark.parametrize('read_ahead', [0, 2])
+def test_parse_compressed_records(tmp_path, module, read_ahead):
+    ff = FileFormat.from_dicts([{'name': 'number', 'type': 'int'}])
+    in_data = b''.join(i.to_bytes(4, 'little') for i in range(1000))
+    path = tmp_path / 'records.bin'
+    path.write_bytes(module.compress(in_data))
+
+    parser = Parser(ff, read_ahead=read_ahead, buffer_size=256)
+    records = list(parser.iter_records(path))
+    assert [r['number'].value for r in records] == list(range(1000))
+
+    records = parser.parse_records(path, processes=2)
+    assert len(records) == 1000
+
+
+def test_compression_option(tmp_path):
+    ff = FileFormat.from_dicts([{'name': 'number', 'type': 'u_short'}], info={'byte_order': 'little'})
+    # uncompressed data beginning with the gzip magic number
+    in_data = (35615).to_bytes(2, 'little') + (1).to_bytes(2, 'little')
+    path = tmp_path / 'records.bin'
+    path.write_bytes(in_data)
+
+    parser = Parser(ff, compression=None)
+    assert parser.parse_file(path)['number'].value == 35615
+    assert [r.number for r in parser.iter_records(path, as_records=True)] == [35615, 1]
+    assert len(parser.parse_records(path, processes=2)) == 2
+    with parser.parse_file(path, lazy=True) as data:
+        assert data['number'].value == 35615
+
+    with parser.edit(path) as editor:
+        editor.set('number', 2, record=1)
+
+    assert path.read_bytes()[2:] == b'\x02\x00'
+
+    # compression is not detected when set
+    path.write_bytes(gzip.compress(in_data))
+    parser = Parser(ff, compression='gzip')
+    assert [r.number for r in parser.iter_records(path, as_records=True)] == [35615, 1]
+
+    with pytest.raises(ValueError):
+        Parser(ff, compression='zip')
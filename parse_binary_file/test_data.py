@@ -0,0 +1,24 @@
+"""
+Test Data functionality.
+"""
+import pytest
+
+from .data import Data
+from .field import Field
+from .field_description import FieldDescription
+
+
+def test_memory_usage_does_not_count_shared_data():
+    f_bytes = Field.from_data(b'\x00' * 100, FieldDescription(name='bytes', size=100))
+    f_str = Field.from_data(b'a' * 100, FieldDescription(name='str', type='str', size=100))
+    data = Data((f_bytes, f_str))
+
+    usage = data.memory_usage()
+    assert [u.name for u in usage] == ['bytes', 'str']
+    assert usage[0].data == 0
+    assert usage[0].value >= 100
+    assert usage[1].data >= 100
+
+    f_str._data = None
+    assert data.memory_usage()[1].data == 0
+    assert usage[1].total == usage[1].value + usage[1].data + usage[1].overhead
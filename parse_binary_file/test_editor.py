@@ -0,0 +1,94 @@
+"""
+Test editing files in place.
+"""
+import zlib
+import pytest
+
+from .parser import Parser
+from .file_format import FileFormat
+
+
+@pytest.fixture
+def header_format():
+    return FileFormat.from_dicts([
+        {'name': 'magic', 'value': 'HD'},
+        {'name': 'name', 'type': 'str', 'terminator': b'\x00'},
+        {
+            'name': 'flags',
+            'type': 'u_short',
+            'bits': [{'name': 'ready', 'offset': 0}, {'name': 'level', 'offset': 4, 'width': 4}]
+        },
+        {'name': 'timestamp', 'type': 'u_long_long'},
+        {'name': 'crc', 'checksum': {'algorithm': 'crc32'}},
+    ], info={'byte_order': 'little'})
+
+
+@pytest.fixture
+def header_file(tmp_path):
+    body = b'HDabc\x00' + (0x10).to_bytes(2, 'little') + (5).to_bytes(8, 'little')
+    path = tmp_path / 'header.bin'
+    path.write_bytes(body + zlib.crc32(body).to_bytes(4, 'little') + b'payload')
+    return path
+
+
+def test_set(header_format, header_file):
+    parser = Parser(header_format)
+    with parser.edit(header_file) as editor:
+        assert editor.get('timestamp') == 5
+        editor.set('timestamp', 1700000000)
+        editor.set('flags.ready', 1)
+        editor.set('name', 'xyz')
+        assert editor.get('flags.level') == 1
+
+    with parser.parse_file(header_file, lazy=True) as data:
+        assert data['timestamp'].value == 1700000000
+        assert data['flags'].bit_values == {'ready': 1, 'level': 1}
+        assert data['name'].value == 'xyz'
+        # checksum was updated
+        assert data['crc'].value == zlib.crc32(bytes(header_file.read_bytes()[:16]))
+
+    assert header_file.read_bytes().endswith(b'payload')
+
+
+def test_invalid_edits(header_format, header_file):
+    with Parser(header_format).edit(header_file) as editor:
+        with pytest.raises(ValueError):
+            editor.set('name', 'longer')
+
+        with pytest.raises(ValueError):
+            editor.set('magic', b'XX')
+
+        with pytest.raises(ValueError):
+            editor.set('flags.level', 16)
+
+        with pytest.raises(KeyError):
+            editor.set('missing', 1)
+
+        # the terminator would move the following fields
+        with pytest.raises(ValueError):
+            editor.set('name', 'a\x00b')
+
+    assert Parser(header_format).parse_file(header_file)['timestamp'].value == 5
+
+
+def test_records(tmp_path):
+    fmt = FileFormat.from_dicts([
+        {'name': 'id', 'type': 'u_int'},
+        {'name': 'value', 'type': 'short'},
+    ], info={'byte_order': 'big'})
+
+    path = tmp_path / 'records.bin'
+    path.write_bytes(bytes(6 * 3))
+    with Parser(fmt).edit(path) as editor:
+        assert len(editor) == 3
+        editor.set('value', -2, record=2)
+        with pytest.raises(IndexError):
+            editor.set('value', 1, record=3)
+
+        with pytest.raises(IndexError):
+            editor.get('value', record=5)
+
+        with pytest.raises(IndexError):
+            editor.set('id', 7, record=-1)
+
+    assert [r['value'].value for r in Parser(fmt).parse_records(path)] == [0, 0, -2]
@@ -0,0 +1,62 @@
+"""
+Test following files.
+"""
+import pytest
+
+from .parser import Parser
+from .file_format import FileFormat
+from .follow import Checkpoint
+
+
+@pytest.fixture
+def record_format():
+    return FileFormat.from_dicts([
+        {'value': b'RC'},
+        {'name': 'id', 'type': 'u_int'},
+    ], info={'byte_order': 'little'})
+
+
+def record(i):
+    return b'RC' + i.to_bytes(4, 'little')
+
+
+def test_partial_records_are_held_back(record_format, tmp_path):
+    path = tmp_path / 'records.bin'
+    path.write_bytes(record(0) + record(1)[:3])
+
+    records = Parser(record_format).follow(path, poll_interval=0.001, timeout=0.05)
+    assert next(records)['id'].value == 0
+
+    with open(path, 'ab') as f:
+        f.write(record(1)[3:] + record(2))
+
+    assert [r['id'].value for r in records] == [1, 2]
+
+
+def test_resume_from_checkpoint(record_format, tmp_path):
+    path = tmp_path / 'records.bin'
+    checkpoint = tmp_path / 'records.ckpt'
+    path.write_bytes(record(0) + record(1) + record(2))
+    parser = Parser(record_format)
+
+    records = parser.follow(path, checkpoint=checkpoint, timeout=0)
+    assert next(records)['id'].value == 0
+    records.close()
+    assert Checkpoint.load(checkpoint).offset == 6
+
+    with open(path, 'ab') as f:
+        f.write(record(3))
+
+    records = parser.follow(path, checkpoint=checkpoint, timeout=0)
+    assert [r['id'].value for r in records] == [1, 2, 3]
+    assert Checkpoint.load(checkpoint).records == 4
+
+
+def test_checkpoint_of_other_format(record_format, tmp_path):
+    path = tmp_path / 'records.bin'
+    checkpoint = tmp_path / 'records.ckpt'
+    path.write_bytes(record(0))
+    Checkpoint(0, 0, 'other').save(checkpoint)
+
+    with pytest.raises(ValueError):
+        next(Parser(record_format).follow(path, checkpoint=checkpoint, timeout=0))
@@ -0,0 +1,95 @@
+"""
+Test execution hooks.
+"""
+import io
+import pickle
+
+import pytest
+
+from .parser import Parser
+from .file_format import FileFormat
+from .field_description import FieldDescription
+from .errors import IncompatibleProperties
+
+
+DESC = [
+    {'name': 'count', 'type': 'u_short'},
+    {'name': 'scale', 'type': 'u_short', 'exec': {'post': 'lambda data, fields: fields["count"].value * 10'}},
+    # sized by the previous fields, without a termination condition
+    {'name': 'items', 'exec': {'pre': 'lambda data, fields: fields["count"].value * 2'}},
+    {'name': 'tail', 'type': 'u_short'},
+]
+
+INFO = {'byte_order': 'little'}
+
+
+def record(items: bytes) -> bytes:
+    return (len(items) // 2).to_bytes(2, 'little') + b'\x00\x00' + items + b'\xff\x00'
+
+
+def test_hooks():
+    fmt = FileFormat.from_dicts(DESC, info=INFO)
+    assert fmt.has_hooks
+    assert fmt.size is None
+    assert fmt.offsets == (0, 2, 4, None)
+    assert fmt.struct_format is None
+
+    parser = Parser(fmt)
+    data = record(b'abcd') + record(b'') + record(b'xyzwuv')
+    expected = [(2, 20, b'abcd', 255), (0, 0, b'', 255), (3, 30, b'xyzwuv', 255)]
+
+    records = parser.iter_records(data, as_records=True)
+    assert [tuple(r) for r in records] == expected
+
+    records = parser.iter_records(io.BytesIO(data))
+    assert [r.value for r in records] == expected
+
+    records = parser.iter_records(data, where={'scale': lambda s: s > 0})
+    assert [r.value for r in records] == [expected[0], expected[2]]
+
+    # compiled hooks are restored when unpickled
+    parser = pickle.loads(pickle.dumps(parser))
+    assert parser.parse(record(b'ab')).value == (1, 10, b'ab', 255)
+    assert parser.parse(io.BytesIO(record(b'ab'))).value == (1, 10, b'ab', 255)
+    assert 'hook' in str(parser.explain())
+
+
+def test_hook_views(tmp_path):
+    seen = []
+
+    def pre(data, fields):
+        seen.append((bytes(data), len(fields.fields)))
+        return None
+
+    fmt = FileFormat([
+        FieldDescription('u_short', name='a'),
+        FieldDescription('bytes', size=2, name='b', exec={'pre': pre, 'post': lambda data, fields: data.tobytes().upper()}),
+    ], info=INFO)
+
+    parser = Parser(fmt)
+    assert parser.parse(b'\x01\x00ab').value == (1, b'AB')
+    assert seen == [(b'\x01\x00', 1)]
+
+    # views are released after the call, so the file can be closed
+    path = tmp_path / 'records.bin'
+    path.write_bytes(b'\x01\x00ab')
+    with parser.parse_file(path, lazy=True) as data:
+        assert data['b'].value == b'AB'
+
+
+def test_invalid_hooks():
+    with pytest.raises(ValueError):
+        FieldDescription('u_short', exec={'before': lambda data, fields: None})
+
+    with pytest.raises(IncompatibleProperties):
+        FieldDescription(offset_from=0, exec={'pre': lambda data, fields: 1})
+
+    with pytest.raises(ValueError):
+        FileFormat.from_dicts([{'type': 'u_short', 'exec': {'post': '1'}}])
+
+    parser = Parser(FileFormat([
+        FieldDescription(exec={'pre': lambda data, fields: -1}),
+    ]))
+
+    with pytest.raises(ValueError):
+        parser.parse(b'abc')
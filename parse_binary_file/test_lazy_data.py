@@ -0,0 +1,58 @@
+"""
+Test LazyData functionality.
+"""
+import zlib
+import pytest
+
+from .parser import Parser
+from .file_format import FileFormat
+from .errors import ChecksumMismatch
+
+
+@pytest.fixture
+def msg_format():
+    return FileFormat.from_dicts([
+        {'name': 'head', 'value': b'\xff\x00'},
+        {'name': 'file_size', 'type': 'int'},
+        {'size': 4, 'is_null': True},
+        {'name': 'greeting', 'type': 'str', 'terminator': b'\x00'},
+        {'name': 'message', 'type': 'str', 'size': -1}
+    ], info={'byte_order': 'little'})
+
+
+@pytest.fixture
+def msg_file(tmp_path):
+    path = tmp_path / 'my_message.msg'
+    path.write_bytes(b'\xff\x00\x12\x00\x00\x00\x00\x00\x00\x00hi\x00hello')
+    return path
+
+
+def test_fields_are_parsed_on_access(msg_format, msg_file):
+    with Parser(msg_format).parse_file(msg_file, lazy=True) as data:
+        assert data['file_size'].value == 0x12
+        assert len(data._parsed) == 1
+
+        assert data[-1].value == 'hello'
+        assert 3 in data._stops
+        assert 3 not in data._parsed
+
+        eager = Parser(msg_format).parse_file(msg_file)
+        assert data.value == eager.value
+        assert data.named_field_values == eager.named_field_values
+
+
+def test_checksum_is_verified_on_access(tmp_path):
+    ff = FileFormat.from_dicts([
+        {'name': 'body', 'type': 'str', 'terminator': b'\x00'},
+        {'name': 'crc', 'checksum': {'algorithm': 'crc32'}}
+    ], info={'byte_order': 'little'})
+
+    path = tmp_path / 'crc.bin'
+    path.write_bytes(b'hello\x00' + zlib.crc32(b'hello\x00').to_bytes(4, 'little'))
+    with Parser(ff).parse_file(path, lazy=True) as data:
+        assert data['crc'].value == zlib.crc32(b'hello\x00')
+
+    path.write_bytes(b'jello\x00' + zlib.crc32(b'hello\x00').to_bytes(4, 'little'))
+    with Parser(ff).parse_file(path, lazy=True) as data:
+        with pytest.raises(ChecksumMismatch):
+            data['crc']
@@ -1,10 +1,13 @@
 """
 Test Parser functionality.
 """
+import io
 import pytest
 
-from .parser import Parser
+from .parser import Parser, RetainRaw
 from .file_format import FileFormat
+from .errors import IncompleteRecord, ValuesDoNotMatch
+from .metrics import ParseMetrics
 
 
 def test_parse_bytes():
@@ -26,3 +29,133 @@ def test_parse_bytes():
     assert data['str1'].value == 'hello'
     assert data['str2'].value == 'there'
     assert data[-1].value == 1
+
+
+def test_iter_records():
+    ff = FileFormat.from_dicts([
+        {'name': 'str', 'type': 'str', 'terminator': b'\x00'},
+        {'name': 'number', 'type': 'int'}
+    ], info={'byte_order': 'little'})
+
+    in_data = b'a\x00\x01\x00\x00\x00bc\x00\x02\x00\x00\x00'
+    parser = Parser(ff)
+    records = list(parser.iter_records(in_data))
+    assert [r['str'].value for r in records] == ['a', 'bc']
+    assert [r['number'].value for r in records] == [1, 2]
+
+    records = list(parser.iter_records(io.BytesIO(in_data)))
+    assert [r['number'].value for r in records] == [1, 2]
+
+
+def test_iter_records_raises_on_incomplete_record():
+    ff = FileFormat.from_dicts([{'name': 'number', 'type': 'int'}])
+    parser = Parser(ff)
+
+    with pytest.raises(IncompleteRecord):
+        list(parser.iter_records(b'\x01\x00\x00\x00\x02'))
+
+
+def test_retain_raw_policies():
+    ff = FileFormat.from_dicts([
+        {'name': 'head', 'value': b'\xff'},
+        {'name': 'greeting', 'type': 'str', 'terminator': b'\x00'}
+    ])
+
+    in_data = b'\xffhello\x00'
+    data = Parser(ff).parse(in_data)
+    assert data['greeting'].data == b'hello\x00'
+
+    data = Parser(ff, retain_raw='never').parse(in_data)
+    assert data['greeting'].data is None
+    assert data['greeting'].value == 'hello'
+
+    parser = Parser(ff, retain_raw=RetainRaw.INVALID)
+    data = parser.parse(in_data)
+    assert data['greeting'].data is None
+
+    with pytest.raises(ValuesDoNotMatch) as err:
+        parser.parse(b'\x00hello\x00')
+
+    assert err.value.field.data == b'\x00'
+
+
+@pytest.fixture
+def sync_format():
+    return FileFormat.from_dicts([
+        {'name': 'sync', 'value': b'\xaa\x55'},
+        {'name': 'greeting', 'type': 'str', 'terminator': b'\x00'},
+        {'name': 'number', 'type': 'u_short'}
+    ], info={'byte_order': 'little'})
+
+
+def test_iter_records_error_policies(sync_format):
+    good = b'\xaa\x55hi\x00\x01\x00'
+    bad = b'\xaa\x55\xff\xfe\x00\x02\x00'  # invalid utf-8
+    garbage = b'\x01\x02\x03'
+    in_data = good + bad + garbage + good
+    parser = Parser(sync_format)
+
+    for stream in (in_data, io.BytesIO(in_data)):
+        if isinstance(stream, io.BytesIO):
+            stream.seek(0)
+
+        with pytest.raises(ValueError):
+            list(parser.iter_records(stream))
+
+    for make_stream in (lambda: in_data, lambda: io.BytesIO(in_data)):
+        metrics = ParseMetrics()
+        records = list(parser.iter_records(make_stream(), errors='resync', metrics=metrics))
+        assert len(records) == 2
+        assert metrics.records == 2
+        assert metrics.errors == 1
+        assert metrics.skipped == [(len(good), len(good) + len(bad) + len(garbage))]
+
+    metrics = ParseMetrics()
+    records = list(parser.iter_records(good + bad + good, errors='skip', metrics=metrics))
+    assert len(records) == 2
+    assert metrics.skipped == [(len(good), len(good) + len(bad))]
+
+
+def test_resync_requires_marker():
+    ff = FileFormat.from_dicts([{'name': 'number', 'type': 'int'}])
+    with pytest.raises(ValueError):
+        list(Parser(ff).iter_records(b'', errors='resync'))
+
+
+@pytest.fixture
+def directory_format():
+    return FileFormat.from_dicts([
+        {'name': 'count', 'type': 'u_short'},
+        {'name': 'offsets', 'type': 'u_short'},
+        {'name': 'block', 'type': 'str', 'terminator': b'\x00', 'offset_from': 'offsets'},
+        {'name': 'first', 'type': 'u_int', 'offset_from': 'count'}
+    ], info={'byte_order': 'little'})
+
+
+def test_pointer_fields(tmp_path, directory_format):
+    in_data = b'\x04\x00\x08\x00\xff\xee\xdd\xcc' + b'hello\x00'
+    parser = Parser(directory_format)
+    for stream in (in_data, io.BytesIO(in_data)):
+        data = parser.parse(stream)
+        assert data['block'].value == 'hello'
+        assert data['first'].value == 0xccddeeff
+
+    path = tmp_path / 'directory.bin'
+    path.write_bytes(in_data)
+    assert parser.parse_file(path)['block'].value == 'hello'
+
+
+def test_pointer_field_out_of_bounds_raises_error(directory_format):
+    with pytest.raises(IncompleteRecord):
+        Parser(directory_format).parse(b'\x04\x00\xff\x00\xff\xee\xdd\xcc')
+
+
+def test_pointer_field_with_offset_table_caches_blocks():
+    ff = FileFormat.from_dicts([
+        {'name': 'offsets', 'type': '[varint]', 'size': 3},
+        {'name': 'blocks', 'type': 'str', 'terminator': b'\x00', 'offset_from': 'offsets'}
+    ])
+
+    data = Parser(ff).parse(b'\x03\x06\x03a\x00\x00b\x00')
+    assert data['blocks'].value == ['a', 'b', 'a']
+    assert data['blocks'].fields[0] is data['blocks'].fields[2]
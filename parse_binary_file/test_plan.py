@@ -0,0 +1,39 @@
+"""
+Test parse plans.
+"""
+from .parser import Parser
+from .file_format import FileFormat
+
+
+def test_static_plan():
+    fmt = FileFormat.from_dicts([
+        {'name': 'tag', 'type': 'char'},
+        {'name': 'value', 'type': 'int'},
+    ], info={'byte_order': 'little', 'align': 4})
+
+    plan = Parser(fmt).explain()
+    assert plan.size == 8
+    assert plan.struct_format == '<c3xi'
+    assert [(f.offset, f.gap, f.decode) for f in plan.fields] == [
+        (0, (0, 1), 'struct'),
+        (4, (3, 1), 'struct'),
+    ]
+    assert 'record struct' in str(plan)
+
+
+def test_fallbacks():
+    fmt = FileFormat.from_dicts([
+        {'name': 'magic', 'value': 'AB'},
+        {'name': 'kind', 'type': 'u_short'},
+        {'name': 'text', 'type': 'str', 'terminator': b'\x00'},
+        {'name': 'body', 'switch': {'on': 'kind', 'cases': {1: [{'name': 'x', 'type': 'u_int'}]}}},
+    ], info={'byte_order': 'little'})
+
+    plan = fmt.explain()
+    assert plan.size is None
+    assert plan.min_size == 2 + 2 + 1 + 4
+    assert plan.struct_format is None
+    assert [f.locate for f in plan.fields] == ['size', 'size', 'terminator', 'switch']
+    assert plan.fields[0].note == 'expected value is validated'
+    assert plan.fields[1].note is None
+    assert plan.fields[3].cases[1].struct_format == '<I'
@@ -0,0 +1,70 @@
+"""
+Test pooled read buffers.
+"""
+import io
+import itertools
+import pickle
+
+from .parser import Parser
+from .file_format import FileFormat
+from .metrics import ParseMetrics
+from .pool import BufferPool
+
+
+def test_pool_reuse():
+    pool = BufferPool(1)
+    a = pool.acquire(16)
+    pool.release(a)
+    assert pool.acquire(8) is a
+    assert (pool.stats.allocations, pool.stats.reuses) == (1, 1)
+
+    b = pool.acquire(32)
+    pool.release(a)
+    pool.release(b)
+    # the largest buffer is kept
+    assert pool.acquire(32) is b
+    assert pool.stats.allocations == 2
+
+    pool = pickle.loads(pickle.dumps(pool))
+    assert (pool.size, pool.stats.allocations) == (1, 0)
+
+
+def test_chunked_file(tmp_path):
+    fmt = FileFormat.from_dicts([
+        {'name': 'magic', 'value': 'R'},
+        {'name': 'text', 'type': 'str', 'terminator': b'\x00'},
+        {'name': 'value', 'type': 'u_short'},
+    ], info={'byte_order': 'little'})
+
+    records = [b'R' + b'x' * (i % 7) + b'\x00' + i.to_bytes(2, 'little') for i in range(50)]
+    data = b''.join(records)
+    path = tmp_path / 'records.bin'
+    path.write_bytes(data)
+
+    # records span chunk boundaries, and some do not fit in a chunk
+    parser = Parser(fmt, buffer_size=4)
+    parsed = parser.parse_records(path)
+    assert [r['value'].value for r in parsed] == list(range(50))
+    assert parsed[3]['text'].value == 'xxx'
+    assert parser.pool.stats.allocations == 3
+
+    parsed = parser.parse_records(path, as_records=True)
+    assert [r.value for r in parsed] == list(range(50))
+    assert parser.pool.stats.allocations == 3
+    assert parser.pool.stats.reuses > 0
+
+    # invalid record in the middle
+    metrics = ParseMetrics()
+    cut = len(b''.join(records[:5]))
+    path.write_bytes(data[:cut] + b'Q' + data[cut:])
+    parsed = parser.parse_records(path, errors='resync', metrics=metrics)
+    assert len(parsed) == 50
+    assert metrics.skipped == [(cut, cut + 1)]
+
+    # streams passed in are not read past the last record yielded
+    stream = io.BytesIO(data)
+    parser = Parser(fmt)
+    parsed = list(itertools.islice(parser.iter_records(stream, as_records=True), 2))
+    assert [r.value for r in parsed] == [0, 1]
+    assert stream.tell() == len(records[0]) + len(records[1])
+    assert parser.pool.stats.allocations == 0
@@ -0,0 +1,45 @@
+"""
+Test PrefetchReader functionality.
+"""
+import io
+import pytest
+
+from .prefetch import PrefetchReader
+from .parser import Parser
+from .file_format import FileFormat
+
+
+def test_read_across_buffers():
+    in_data = bytes(range(256)) * 10
+    with PrefetchReader(io.BytesIO(in_data), buffer_size=100, depth=2) as r:
+        assert r.read(50) == in_data[:50]
+        assert r.peek(1)[:1] == in_data[50:51]
+        assert r.read(150) == in_data[50:200]
+        assert r.read() == in_data[200:]
+        assert r.read(1) == b''
+
+    assert r.stats.bytes_read == len(in_data)
+    assert r.stats.buffers == 26
+
+
+def test_readinto():
+    in_data = b'0123456789'
+    with PrefetchReader(io.BytesIO(in_data), buffer_size=3, depth=2) as r:
+        buf = bytearray(8)
+        assert r.readinto(buf) == 8
+        assert buf == in_data[:8]
+
+
+def test_invalid_buffer_size_raises_value_error():
+    with pytest.raises(ValueError):
+        PrefetchReader(io.BytesIO(b''), buffer_size=0)
+
+
+def test_parser_reads_ahead(tmp_path):
+    ff = FileFormat.from_dicts([{'name': 'number', 'type': 'int'}])
+    path = tmp_path / 'records.bin'
+    path.write_bytes(b''.join(i.to_bytes(4, 'little') for i in range(1000)))
+
+    parser = Parser(ff, read_ahead=2, buffer_size=64)
+    records = list(parser.iter_records(path))
+    assert [r['number'].value for r in records] == list(range(1000))
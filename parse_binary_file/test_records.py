@@ -0,0 +1,65 @@
+"""
+Test generated record types.
+"""
+import pickle
+import pytest
+
+from .parser import Parser
+from .file_format import FileFormat
+from .errors import ValuesDoNotMatch
+
+
+@pytest.fixture
+def record_format():
+    return FileFormat.from_dicts([
+        {'value': b'RC'},
+        {'name': 'id', 'type': 'u_int'},
+        {'name': 'tag', 'type': 'str', 'terminator': b'\x00'},
+        {'name': 'id', 'type': 'u_short'},
+        {'name': 'class', 'type': 'varint'},
+    ], info={'byte_order': 'little'})
+
+
+def record(i):
+    return b'RC' + i.to_bytes(4, 'little') + b'ab\x00' + i.to_bytes(2, 'little') + b'\x05'
+
+
+def test_record_type(record_format):
+    Record = record_format.record_type
+    assert Record is record_format.record_type
+    assert Record._fields == ('id', 'tag', '_2')
+
+    pickled = pickle.loads(pickle.dumps(record_format))
+    assert pickled.record_type._fields == Record._fields
+
+
+def test_records_match_data(record_format):
+    parser = Parser(record_format)
+    buffer = record(1) + record(2)
+    records = parser.parse_records(buffer, as_records=True)
+    data = parser.parse_records(buffer)
+
+    assert records == record_format.to_records(data)
+    assert records[1].id == (2, 2)
+    assert records[1].tag == 'ab'
+    assert record_format.to_dicts(records) == [d.named_field_values for d in data]
+    assert record_format.to_tuples(data) == [tuple(r) for r in records]
+
+
+def test_records_validate_values(record_format):
+    with pytest.raises(ValuesDoNotMatch):
+        Parser(record_format).parse_records(b'XX' + record(1)[2:], as_records=True)
+
+
+def test_parallel_records(record_format, tmp_path):
+    path = tmp_path / 'records.bin'
+    path.write_bytes(b''.join(record(i) for i in range(20)))
+
+    records = Parser(record_format).parse_records(
+        path,
+        processes=2,
+        sync=b'RC',
+        as_records=True
+    )
+
+    assert [r.id[0] for r in records] == list(range(20))
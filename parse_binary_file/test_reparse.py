@@ -0,0 +1,91 @@
+"""
+Test parsing again after localized edits.
+"""
+import io
+
+import pytest
+
+from .parser import Parser
+from .file_format import FileFormat
+from .errors import ChecksumMismatch
+
+
+INFO = {'byte_order': 'little'}
+
+
+def test_reparse():
+    fmt = FileFormat.from_dicts([
+        {'name': 'magic', 'value': 'RP'},
+        {'name': 'id', 'type': 'u_short'},
+        {'name': 'text', 'type': 'str', 'terminator': b'\x00'},
+        {'name': 'value', 'type': 'u_int'},
+    ], info=INFO)
+
+    parser = Parser(fmt)
+    buffer = bytearray(b'RP\x01\x00abc\x00\x05\x00\x00\x00')
+    data = parser.parse(buffer)
+    assert data.offset_map.spans == ((0, 2), (2, 4), (4, 8), (8, 12))
+
+    # in place edit keeps the other fields
+    buffer[2:4] = b'\x07\x00'
+    new = parser.reparse(data, buffer, [(2, 4)])
+    assert new.value == parser.parse(buffer).value == (b'RP', 7, 'abc', 5)
+    assert new.fields[0] is data.fields[0]
+    assert new.fields[2] is data.fields[2]
+    assert new.fields[3] is data.fields[3]
+    assert new.fields[1] is not data.fields[1]
+
+    # inserted bytes shift the following fields
+    buffer[5:5] = b'XY'
+    newer = parser.reparse(new, buffer, [(5, len(buffer))])
+    assert newer.value == parser.parse(buffer).value == (b'RP', 7, 'aXYbc', 5)
+    assert newer.fields[1] is new.fields[1]
+    assert newer.offset_map.spans[3] == (10, 14)
+
+    # nothing changed
+    assert parser.reparse(newer, buffer, []).fields == newer.fields
+
+    with pytest.raises(ValueError):
+        parser.reparse(parser.parse(io.BytesIO(bytes(buffer))), buffer, [])
+
+    with pytest.raises(ValueError):
+        parser.reparse(newer, buffer, [(4, 2)])
+
+
+def test_reparse_dependencies():
+    fmt = FileFormat.from_dicts([
+        {'name': 'kind', 'type': 'u_short'},
+        {'name': 'body', 'switch': {
+            'on': 'kind',
+            'cases': {
+                '1': [{'name': 'value', 'type': 'u_short'}],
+                '2': [{'name': 'raw', 'size': 2}],
+            }
+        }},
+    ], info=INFO)
+
+    parser = Parser(fmt)
+    buffer = bytearray(b'\x01\x00\x09\x00')
+    data = parser.parse(buffer)
+
+    # switched layout is decoded again when the field switched on changes
+    buffer[0:2] = b'\x02\x00'
+    new = parser.reparse(data, buffer, [(0, 2)])
+    assert new.value[1].value == (b'\x09\x00',)
+
+    fmt = FileFormat.from_dicts([
+        {'name': 'id', 'type': 'u_short'},
+        {'name': 'value', 'type': 'u_short'},
+        {'name': 'crc', 'type': 'u_int', 'checksum': {'algorithm': 'crc32'}},
+    ], info=INFO)
+
+    parser = Parser(fmt)
+    checksum = fmt.checksums[0].checksum
+    buffer = bytearray(b'\x01\x00\x09\x00')
+    buffer += checksum.function(bytes(buffer), checksum.initial).to_bytes(4, 'little')
+    data = parser.parse(buffer)
+
+    # kept checksums are verified against the changed data
+    buffer[2:4] = b'\x0a\x00'
+    with pytest.raises(ChecksumMismatch):
+        parser.reparse(data, buffer, [(2, 4)])
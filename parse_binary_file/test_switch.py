@@ -0,0 +1,96 @@
+"""
+Test switch fields.
+"""
+import io
+import pytest
+
+from .parser import Parser
+from .file_format import FileFormat
+
+
+@pytest.fixture
+def message_format():
+    return FileFormat.from_dicts([
+        {'name': 'kind', 'type': 'u_short'},
+        {
+            'name': 'body',
+            'switch': {
+                'on': 'kind',
+                'cases': {
+                    '1': [{'name': 'x', 'type': 'u_short'}],
+                    '2': [
+                        {'name': 'n', 'type': 'u_short'},
+                        {'name': 'text', 'type': 'str', 'terminator': b'\x00'},
+                    ],
+                },
+                'default': [],
+            }
+        },
+        {'name': 'end', 'type': 'bytes', 'value': b'\xff'},
+    ], info={'byte_order': 'little'})
+
+
+@pytest.fixture
+def messages():
+    return (
+        b'\x01\x00\x07\x00\xff'
+        + b'\x02\x00\x03\x00abc\x00\xff'
+        + b'\x09\x00\xff'
+    )
+
+
+def test_parse_buffer(message_format, messages):
+    records = Parser(message_format).parse_records(messages)
+    assert len(records) == 3
+    assert records[0]['body'].value['x'].value == 7
+    assert records[1]['body'].value['text'].value == 'abc'
+    assert len(records[2]['body'].value.fields) == 0
+    assert all(r['end'].value == b'\xff' for r in records)
+
+
+def test_parse_stream(message_format, messages):
+    records = Parser(message_format).parse_records(io.BytesIO(messages))
+    assert [r['kind'].value for r in records] == [1, 2, 9]
+    assert records[1]['body'].value['n'].value == 3
+
+
+def test_as_records(message_format, messages):
+    records = Parser(message_format).parse_records(messages, as_records=True)
+    assert records[1].body.text == 'abc'
+
+
+def test_no_case():
+    fmt = FileFormat.from_dicts([
+        {'name': 'kind', 'type': 'u_short'},
+        {'name': 'body', 'switch': {'on': 'kind', 'cases': {1: [{'name': 'x', 'type': 'u_short'}]}}},
+    ], info={'byte_order': 'little'})
+
+    parser = Parser(fmt)
+    assert parser.parse(b'\x01\x00\x05\x00')['body'].value['x'].value == 5
+    with pytest.raises(ValueError):
+        parser.parse(b'\x02\x00\x05\x00')
+
+    # the end of a record without a case can not be found
+    records = parser.parse_records(b'\x01\x00\x05\x00\x02\x00\x01\x00\x05\x00', errors='skip')
+    assert [r['body'].value['x'].value for r in records] == [5]
+
+
+def test_lazy(message_format, tmp_path):
+    path = tmp_path / 'message.bin'
+    path.write_bytes(b'\x02\x00\x03\x00abc\x00\xff')
+    with Parser(message_format).parse_file(path, lazy=True) as data:
+        assert data['end'].value == b'\xff'
+        assert data['body'].value['text'].value == 'abc'
+
+
+def test_parse_records_in_parallel(message_format, messages, tmp_path):
+    path = tmp_path / 'messages.bin'
+    path.write_bytes(messages * 20)
+    index = [k * len(messages) + o for k in range(20) for o in (0, 5, 15)]
+    parser = Parser(message_format)
+
+    expected = parser.parse_records(path, as_records=True)
+    records = parser.parse_records(path, processes=2, index=index, as_records=True)
+    assert records == expected
+    assert records[1].body.text == 'abc'
+    assert type(records[1].body) is message_format.fields[1].switch.case(2).record_type
@@ -0,0 +1,109 @@
+"""
+Test sharing parsers between threads.
+"""
+import copy
+import pickle
+import threading
+
+import pytest
+
+from .parser import Parser
+from .file_format import FileFormat
+
+
+DESC = [
+    {'name': 'magic', 'value': 'R'},
+    {'name': 'kind', 'type': 'u_short'},
+    {'name': 'body', 'switch': {
+        'on': 'kind',
+        'cases': {
+            '1': [{'name': 'value', 'type': 'u_short'}],
+            '2': [{'name': 'text', 'type': 'str', 'terminator': b'\x00'}],
+        }
+    }},
+]
+
+
+def record(i: int) -> bytes:
+    if i % 2:
+        return b'R\x01\x00' + i.to_bytes(2, 'little')
+
+    return b'R\x02\x00' + str(i).encode() + b'\x00'
+
+
+def test_from_dicts_does_not_modify_desc():
+    desc = copy.deepcopy(DESC)
+    fmt = FileFormat.from_dicts(desc, info={'byte_order': 'little'})
+    assert desc == DESC
+    assert isinstance(fmt.fields, tuple)
+
+    # the same description creates equal formats
+    assert FileFormat.from_dicts(desc, info={'byte_order': 'little'}) == fmt
+
+
+def test_parse_does_not_modify_parser():
+    parser = Parser(FileFormat.from_dicts(DESC, info={'byte_order': 'little'}))
+    state = dict(parser.__dict__)
+    cases = dict(parser._case_parsers)
+    list(parser.iter_records(b''.join(map(record, range(4))), as_records=True))
+    assert parser.__dict__ == state
+    assert parser._case_parsers == cases
+
+    # compiled state is created again when unpickled
+    parser = pickle.loads(pickle.dumps(parser))
+    assert parser._unpack_record is None
+    assert len(parser._case_parsers) == 2
+    assert parser.format.record_type._fields == ('magic', 'kind', 'body')
+
+
+def test_concurrent_parsing():
+    parser = Parser(FileFormat.from_dicts(DESC, info={'byte_order': 'little'}))
+    data = b''.join(map(record, range(200)))
+    expected = list(parser.iter_records(data, as_records=True))
+
+    results = [None] * 8
+    barrier = threading.Barrier(len(results))
+
+    def work(n: int):
+        barrier.wait()
+        results[n] = list(parser.iter_records(data, as_records=True))
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(len(results))]
+    for t in threads:
+        t.start()
+
+    for t in threads:
+        t.join()
+
+    assert all(r == expected for r in results)
+    # records of all threads share the record class
+    assert all(type(r[0]) is parser.format.record_type for r in results)
+
+
+def test_parse_files(tmp_path):
+    parser = Parser(FileFormat.from_dicts(DESC, info={'byte_order': 'little'}))
+    paths = []
+    for i in range(10):
+        path = tmp_path / f'{i}.bin'
+        path.write_bytes(record(i))
+        paths.append(path)
+
+    expected = [parser.parse_file(p).value for p in paths]
+    data = parser.parse_files(paths, max_workers=3, max_in_flight=4)
+    assert [d.value for d in data] == expected
+
+    data = parser.parse_files(iter(paths), executor=None)
+    assert [d.value for d in data] == expected
+
+    # stopping early does not parse the remaining files
+    files = iter(paths)
+    data = parser.parse_files(files, max_workers=1, max_in_flight=2)
+    next(data)
+    data.close()
+    assert len(list(files)) == 7
+
+    with pytest.raises(ValueError):
+        parser.parse_files(paths, executor='process')
+
+    with pytest.raises(ValueError):
+        parser.parse_files(paths, max_in_flight=0)
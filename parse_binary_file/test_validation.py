@@ -0,0 +1,52 @@
+"""
+Test bulk validation.
+"""
+import pytest
+
+from .parser import Parser
+from .file_format import FileFormat
+from .validation import invalid_records, constant_spans, _invalid_bytes
+
+
+@pytest.fixture
+def record_format():
+    return FileFormat.from_dicts([
+        {'value': b'RC'},
+        {'name': 'id', 'type': 'u_short'},
+        {'size': 2, 'is_null': True},
+    ], info={'byte_order': 'little'})
+
+
+@pytest.fixture
+def records():
+    data = bytearray(b''.join(b'RC' + i.to_bytes(2, 'little') + b'\x00\x00' for i in range(10)))
+    data[3 * 6 + 1] = ord('X')  # magic number
+    data[7 * 6 + 5] = 1  # null field
+    return bytes(data) + b'RC'  # partial record
+
+
+def test_constant_spans(record_format):
+    assert constant_spans(record_format) == ((0, b'RC'), (4, b'\x00\x00'))
+
+    with pytest.raises(ValueError):
+        constant_spans(FileFormat.from_dicts([{'type': 'str', 'terminator': b'\x00'}]))
+
+
+def test_invalid_bytes(record_format, records):
+    spans = constant_spans(record_format)
+    assert _invalid_bytes(records, spans, 6, 0, 10) == [3, 7]
+
+
+def test_invalid_records(record_format, records):
+    pytest.importorskip('numpy')
+    assert list(invalid_records(records, record_format)) == [3, 7]
+    assert list(invalid_records(records, record_format, start=6)) == [2, 6]
+
+    mask = invalid_records(records, record_format, mask=True)
+    assert mask.tolist() == [i in (3, 7) for i in range(10)]
+
+
+def test_validate_file(record_format, records, tmp_path):
+    path = tmp_path / 'records.bin'
+    path.write_bytes(records)
+    assert list(Parser(record_format).validate_records(path)) == [3, 7]
@@ -0,0 +1,101 @@
+"""
+Parse many files concurrently with a shared parser.
+"""
+from __future__ import annotations
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Union, Iterable, Iterator, Deque, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .parser import Parser
+    from .data import Data
+
+
+EXECUTORS = ('thread', None)
+
+
+def default_workers() -> int:
+    """
+    :returns int: Number of worker threads used by default,
+        as by `concurrent.futures.ThreadPoolExecutor`.
+    """
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def parse_files(
+    parser: Parser,
+    paths: Iterable[Union[str, os.PathLike]],
+    executor: Union[str, None] = 'thread',
+    max_workers: Union[int, None] = None,
+    max_in_flight: Union[int, None] = None
+) -> Iterator[Data]:
+    """
+    Parse files with `Parser.parse_file`, in worker threads sharing the parser.
+    At most `max_in_flight` files are submitted at a time,
+    so paths are consumed, and parsed data is held,
+    only as far ahead of the consumer as the bound allows.
+
+    :param parser: Parser of the files.
+    :param paths: Paths to the files.
+    :param executor: `'thread'` to parse in a thread pool,
+        or `None` to parse in the current thread. [Default: 'thread']
+    :param max_workers: Number of worker threads.
+        [Default: As by `concurrent.futures.ThreadPoolExecutor`]
+    :param max_in_flight: Maximum number of files submitted but not yet
+        yielded. [Default: Twice the number of workers]
+    :returns Iterator[Data]: Iterator over the parsed data, in order of `paths`.
+    :raises ValueError: If the executor is unknown,
+        or a bound is less than 1.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f'Unknown executor `{executor}`, must be one of {EXECUTORS}')
+
+    if (max_workers is not None) and (max_workers < 1):
+        raise ValueError('`max_workers` must be at least 1')
+
+    if (max_in_flight is not None) and (max_in_flight < 1):
+        raise ValueError('`max_in_flight` must be at least 1')
+
+    # validate before the first item is requested
+    return _parse_files(parser, paths, executor, max_workers, max_in_flight)
+
+
+def _parse_files(
+    parser: Parser,
+    paths: Iterable[Union[str, os.PathLike]],
+    executor: Union[str, None],
+    max_workers: Union[int, None],
+    max_in_flight: Union[int, None]
+) -> Iterator[Data]:
+    """
+    See `parse_files`.
+    """
+    if executor is None:
+        for path in paths:
+            yield parser.parse_file(path)
+
+        return
+
+    if max_workers is None:
+        max_workers = default_workers()
+
+    if max_in_flight is None:
+        max_in_flight = 2 * max_workers
+
+    pending: Deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        try:
+            for path in paths:
+                if len(pending) >= max_in_flight:
+                    yield pending.popleft().result()
+
+                pending.append(pool.submit(parser.parse_file, path))
+
+            while pending:
+                yield pending.popleft().result()
+
+        finally:
+            # stopped early, do not parse files that were not started
+            for future in pending:
+                future.cancel()
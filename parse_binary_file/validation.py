@@ -0,0 +1,137 @@
+"""
+Validate the constant fields of many fixed size records at once.
+"""
+from __future__ import annotations
+from typing import Union, Tuple, List, Any
+
+from .file_format import FileFormat
+
+
+def constant_spans(format: FileFormat) -> Tuple[Tuple[int, bytes], ...]:
+    """
+    Raw spans of fields with an expected value,
+    including null fields.
+
+    :param format: Fixed size format.
+    :returns tuple[tuple[int, bytes], ...]: Tuple of
+        (offset in record, expected bytes) for each constant field.
+    :raises ValueError: If the format does not have a fixed size.
+    """
+    if (format.size is None) or (format.size == 0) or format.has_pointers:
+        raise ValueError('Bulk validation requires a format with a fixed size')
+
+    spans = []
+    for offset, fd in zip(format.offsets, format.fields):
+        if fd.value is None:
+            continue
+
+        expected = fd.value
+        if not isinstance(expected, bytes):
+            raise ValueError(f'Expected value must be bytes for bulk validation. {fd}')
+
+        spans.append((offset, expected))
+
+    return tuple(spans)
+
+
+# span widths compared as unsigned integers, others as raw bytes
+_UINT_WIDTHS = (1, 2, 4, 8)
+
+
+def _invalid_numpy(np: Any, buffer: Any, spans, size: int, start: int, count: int) -> Any:
+    """
+    :returns numpy.ndarray: Boolean mask of invalid records.
+    """
+    formats = [
+        f'<u{len(expected)}' if len(expected) in _UINT_WIDTHS else f'V{len(expected)}'
+        for _, expected in spans
+    ]
+
+    # view each constant span of every record as a column
+    dtype = np.dtype({
+        'names': [f'f{i}' for i in range(len(spans))],
+        'formats': formats,
+        'offsets': [offset for offset, _ in spans],
+        'itemsize': size
+    })
+
+    records = np.frombuffer(buffer, dtype=dtype, count=count, offset=start)
+    invalid = np.zeros(count, dtype=bool)
+    for i, (_, expected) in enumerate(spans):
+        invalid |= (records[f'f{i}'] != np.frombuffer(expected, dtype=formats[i])[0])
+
+    return invalid
+
+
+def _invalid_bytes(buffer: Any, spans, size: int, start: int, count: int) -> List[int]:
+    """
+    :returns list[int]: Sorted indices of invalid records.
+    """
+    stop = start + count * size
+    invalid = set()
+    for offset, expected in spans:
+        for j, b in enumerate(expected):
+            # the j-th byte of the field in every record
+            column = bytes(buffer[start + offset + j:stop:size])
+            if column.count(b) == count:
+                continue
+
+            # map the expected byte to 0 and others to 1
+            table = bytes(0 if i == b else 1 for i in range(256))
+            flags = column.translate(table)
+            index = flags.find(1)
+            while index >= 0:
+                invalid.add(index)
+                index = flags.find(1, index + 1)
+
+    return sorted(invalid)
+
+
+def invalid_records(
+    buffer: Any,
+    format: FileFormat,
+    start: int = 0,
+    end: Union[int, None] = None,
+    mask: bool = False
+) -> Any:
+    """
+    Find records whose constant fields do not have their expected value,
+    comparing raw bytes of all records column by column.
+    Uses NumPy if installed.
+    A partial record at the end of the data is ignored.
+
+    :param buffer: Buffer of consecutive records.
+    :param format: Fixed size format of the records.
+    :param start: Offset of the first record. [Default: 0]
+    :param end: Offset the records end at. [Default: End of buffer]
+    :param mask: Return a boolean mask of invalid records
+        instead of their indices. [Default: False]
+    :returns numpy.ndarray | list: Indices of invalid records,
+        or a mask if `mask` is `True`.
+    :raises ValueError: If the format does not have a fixed size.
+    """
+    spans = constant_spans(format)
+    size = format.size
+    if end is None:
+        end = len(buffer)
+
+    count = max(0, (end - start) // size)
+    if (count == 0) or (len(spans) == 0):
+        return [False] * count if mask else []
+
+    try:
+        import numpy as np
+
+    except ImportError:
+        indices = _invalid_bytes(buffer, spans, size, start, count)
+        if not mask:
+            return indices
+
+        flags = [False] * count
+        for i in indices:
+            flags[i] = True
+
+        return flags
+
+    invalid = _invalid_numpy(np, buffer, spans, size, start, count)
+    return invalid if mask else np.flatnonzero(invalid)
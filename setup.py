@@ -23,6 +23,11 @@ setuptools.setup(
         "Operating System :: OS Independent",
     ],
     install_requires = [],
+    entry_points = {
+        'console_scripts': [
+            'parse-binary-file=parse_binary_file.cli:main',
+        ],
+    },
     package_data = {
     },
 )